@@ -3,36 +3,53 @@
 import os
 import sys
 import subprocess
+import importlib.util
+import concurrent.futures
 from pathlib import Path
 
-def build_msi():
-    """Build MSI installer using setuptools bdist_msi."""
-    print("Building MSI installer...")
+# PyInstaller's work directory. Every EXE build uses the same one so its
+# cached analysis carries over between the exe and both targets.
+PYINSTALLER_WORKPATH = os.path.join("build", "pyinstaller")
+
+def ensure_msi_dependencies():
+    """Install pywin32 if it is missing."""
     try:
-        try:
-            import win32com.client  # type: ignore
+        # find_spec only locates the package; importing win32com would load the COM runtime.
+        if importlib.util.find_spec("win32com") is not None:
             print("pywin32 found")
-        except ImportError:
+        else:
             print("Installing pywin32...")
             subprocess.check_call([sys.executable, "-m", "pip", "install", "pywin32"])
     except Exception as e:
         print(f"Warning: {e}")
-    
-    subprocess.check_call([sys.executable, "setup.py", "bdist_msi"])
-    print("MSI installer created in dist/ directory")
-    return True
 
-def build_exe():
-    """Build EXE installer using PyInstaller."""
-    print("Building EXE installer...")
+def ensure_exe_dependencies():
+    """Install PyInstaller if it is missing."""
     try:
-        try:
-            import PyInstaller  # type: ignore
-        except ImportError:
+        if importlib.util.find_spec("PyInstaller") is None:
             print("Installing PyInstaller...")
             subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
     except Exception as e:
         print(f"Warning: {e}")
+
+def build_msi(dist_dir=None, install_dependencies=True):
+    """Build MSI installer using setuptools bdist_msi."""
+    print("Building MSI installer...")
+    if install_dependencies:
+        ensure_msi_dependencies()
+    
+    command = [sys.executable, "setup.py", "bdist_msi"]
+    if dist_dir:
+        command.extend(["--dist-dir", dist_dir])
+    subprocess.check_call(command)
+    print(f"MSI installer created in {dist_dir or 'dist'}/ directory")
+    return True
+
+def build_exe(clean=False, dist_dir=None, install_dependencies=True):
+    """Build EXE installer using PyInstaller, reusing its build cache unless clean is set."""
+    print("Building EXE installer...")
+    if install_dependencies:
+        ensure_exe_dependencies()
     
     spec_content = """# -*- mode: python ; coding: utf-8 -*-
 
@@ -79,34 +96,65 @@ exe = EXE(
 )
 """
     
-    with open("plain.spec", "w") as f:
-        f.write(spec_content)
+    # Rewriting an identical spec would still bump its mtime and invalidate
+    # PyInstaller's cached analysis.
+    spec_path = Path("plain.spec")
+    if not spec_path.exists() or spec_path.read_text() != spec_content:
+        spec_path.write_text(spec_content)
     
-    subprocess.check_call([sys.executable, "-m", "PyInstaller", "plain.spec", "--clean"])
-    print("EXE created in dist/ directory")
+    command = [sys.executable, "-m", "PyInstaller", "plain.spec", "--workpath", PYINSTALLER_WORKPATH]
+    if clean:
+        command.append("--clean")
+    if dist_dir:
+        command.extend(["--distpath", dist_dir])
+    subprocess.check_call(command)
+    print(f"EXE created in {dist_dir or 'dist'}/ directory")
+    return True
+
+def build_all(clean=False):
+    """Build the MSI and EXE installers in parallel, each into its own dist directory."""
+    # Install tools up front so the two builds never run pip at the same time.
+    ensure_msi_dependencies()
+    ensure_exe_dependencies()
+    # The builds themselves run in subprocesses, so threads are enough here.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(build_msi, os.path.join("dist", "msi"), False),
+            executor.submit(build_exe, clean, os.path.join("dist", "exe"), False),
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
     return True
 
 if __name__ == "__main__":
     print("Plain Language Installer Builder")
     print("=" * 50)
     
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "msi":
+    clean = "--clean" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--clean"]
+    
+    if args:
+        if args[0] == "msi":
             build_msi()
-        elif sys.argv[1] == "exe":
-            build_exe()
+        elif args[0] == "exe":
+            build_exe(clean=clean)
+        elif args[0] == "both":
+            build_all(clean=clean)
         else:
-            print("Usage: python build_installer.py [msi|exe]")
+            print("Usage: python build_installer.py [msi|exe|both] [--clean]")
     else:
         print("Choose installer type:")
         print("1. MSI (Windows Installer)")
         print("2. EXE (Standalone executable)")
-        choice = input("Enter choice (1 or 2): ")
+        print("3. Both (built in parallel)")
+        choice = input("Enter choice (1, 2 or 3): ")
         
         if choice == "1":
             build_msi()
         elif choice == "2":
-            build_exe()
+            build_exe(clean=clean)
+        elif choice == "3":
+            build_all(clean=clean)
         else:
             print("Invalid choice")
 
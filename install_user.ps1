@@ -11,7 +11,7 @@ Write-Host "Project directory: $projectRoot" -ForegroundColor Yellow
 
 Write-Host ""
 Write-Host "Installing Plain Language..." -ForegroundColor Cyan
-python -m pip install --user -e "$projectRoot"
+python -m pip install --user -e "$projectRoot[web]"
 
 if ($LASTEXITCODE -eq 0) {
     Write-Host "Installation successful!" -ForegroundColor Green
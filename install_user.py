@@ -5,6 +5,59 @@ import sys
 import subprocess
 from pathlib import Path
 
+HWND_BROADCAST = 0xFFFF
+WM_SETTINGCHANGE = 0x001A
+SMTO_ABORTIFHUNG = 0x0002
+
+
+def broadcast_environment_change():
+    """Tell running programs (Explorer, new shells) that the user environment changed."""
+    import ctypes
+    from ctypes import wintypes
+
+    try:
+        result = wintypes.DWORD()
+        ctypes.windll.user32.SendMessageTimeoutW(
+            HWND_BROADCAST,
+            WM_SETTINGCHANGE,
+            0,
+            "Environment",
+            SMTO_ABORTIFHUNG,
+            5000,
+            ctypes.byref(result),
+        )
+    except (AttributeError, OSError):
+        # Best effort only: the registry value is already written.
+        pass
+
+
+def add_to_user_path(entry):
+    """Append entry to the user's PATH in HKCU\\Environment if it is missing.
+
+    The key is opened once and only its Path value is read; subkeys are
+    never enumerated. Returns True when PATH was changed.
+    """
+    import winreg
+
+    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Environment", 0, winreg.KEY_READ | winreg.KEY_WRITE) as key:
+        try:
+            current_path, value_type = winreg.QueryValueEx(key, "Path")
+        except FileNotFoundError:
+            current_path, value_type = "", winreg.REG_EXPAND_SZ
+        if value_type not in (winreg.REG_SZ, winreg.REG_EXPAND_SZ):
+            raise ValueError(f"user Path has unexpected registry type {value_type}")
+        
+        paths = [p for p in current_path.split(";") if p]
+        existing = {p.rstrip("\\").casefold() for p in paths}
+        if entry.rstrip("\\").casefold() in existing:
+            return False
+        paths.append(entry)
+        winreg.SetValueEx(key, "Path", 0, value_type, ";".join(paths))
+    
+    broadcast_environment_change()
+    return True
+
+
 def main():
     print("Installing Plain Language to User Directory")
     print("=" * 50)
@@ -13,13 +66,26 @@ def main():
     print(f"Project directory: {project_root}")
     
     print("\nInstalling Plain Language...")
-    result = subprocess.run(
-        [sys.executable, "-m", "pip", "install", "--user", "-e", str(project_root)],
-        capture_output=True,
-        text=True
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "pip", "install",
+            "--user",
+            "--prefer-binary",
+            "--disable-pip-version-check",
+            "-e", f"{project_root}[web]",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
     )
+    # Stream pip's progress as it happens, so its errors are already on screen.
+    for line in proc.stdout:
+        sys.stdout.write(line)
+    proc.stdout.close()
     
-    if result.returncode == 0:
+    returncode = proc.wait()
+    if returncode == 0:
         print("Installation successful!")
         
         version = f"{sys.version_info.major}{sys.version_info.minor}"
@@ -27,24 +93,12 @@ def main():
         
         print(f"\nScripts installed to: {scripts_path}")
         
-        import winreg
         try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Environment", 0, winreg.KEY_READ | winreg.KEY_WRITE)
-            try:
-                current_path, _ = winreg.QueryValueEx(key, "Path")
-            except FileNotFoundError:
-                current_path = ""
-            
-            scripts_str = str(scripts_path)
-            if scripts_str not in current_path:
-                new_path = current_path + ";" + scripts_str if current_path else scripts_str
-                winreg.SetValueEx(key, "Path", 0, winreg.REG_EXPAND_SZ, new_path)
+            if add_to_user_path(str(scripts_path)):
                 print("\nAdded to user PATH")
                 print("Please restart PowerShell/VS Code for changes to take effect!")
             else:
                 print("\nAlready in user PATH")
-            
-            winreg.CloseKey(key)
         except Exception as e:
             print(f"\nWarning: Could not update PATH automatically: {e}")
             print(f"Please manually add to PATH: {scripts_path}")
@@ -62,8 +116,7 @@ def main():
             print("Warning: plain command not found in current session")
             print("Restart PowerShell/VS Code to use the 'plain' command")
     else:
-        print("\nInstallation failed!")
-        print(result.stderr)
+        print(f"\nInstallation failed: pip exited with code {returncode} (see its output above).")
         sys.exit(1)
 
 if __name__ == "__main__":
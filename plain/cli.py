@@ -2,26 +2,22 @@
 
 import sys
 from pathlib import Path
+from typing import Optional
 
 import click
 
-try:
-    from . import __version__
-    from .compiler import Compiler
-    from .runtime import Runtime
-    from .repl import REPL
-    from .enhanced_transpiler import EnhancedTranspiler
-except ImportError:
+# Subcommand modules (compiler, runtime, REPL) are imported inside the
+# commands that need them so `plain --help` and `plain --version` stay fast.
+# They are imported as `plain.*` so this also works when run as a script.
+if __package__ in (None, ""):
     import os
 
-    package_root = os.path.dirname(os.path.dirname(__file__))
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if package_root not in sys.path:
         sys.path.insert(0, package_root)
     from plain import __version__
-    from plain.compiler import Compiler
-    from plain.runtime import Runtime
-    from plain.repl import REPL
-    from plain.enhanced_transpiler import EnhancedTranspiler
+else:
+    from . import __version__
 
 
 @click.group()
@@ -34,11 +30,15 @@ def main():
 @main.command()
 @click.argument("file_path", type=click.Path(exists=True))
 @click.option("--no-validate", is_flag=True, help="Skip Python syntax validation")
+@click.option("--no-cache", is_flag=True, help="Do not read or write the transpile cache")
 @click.option("--verbose", "-v", is_flag=True, help="Show generated Python code")
-def run(file_path: str, no_validate: bool, verbose: bool):
+def run(file_path: str, no_validate: bool, no_cache: bool, verbose: bool):
     """Compile and execute a .pln file."""
     try:
-        compiler = Compiler()
+        from plain.compiler import Compiler
+        from plain.runtime import Runtime
+
+        compiler = Compiler(use_cache=not no_cache)
         
         if verbose:
             click.echo("Compiling...")
@@ -54,7 +54,7 @@ def run(file_path: str, no_validate: bool, verbose: bool):
         
         runtime = Runtime()
         stdout, stderr, exception = runtime.execute_file(
-            python_code,
+            getattr(compiler, "last_code", None) or python_code,
             filename=file_path,
             line_mapping=getattr(compiler, "last_mapping", None),
             source_lines=getattr(compiler, "last_source_lines", None),
@@ -91,19 +91,17 @@ def run(file_path: str, no_validate: bool, verbose: bool):
 
 
 @main.command()
-@click.argument("file_path", type=click.Path(exists=True))
-@click.option("-o", "--output", type=click.Path(), help="Output file path")
+@click.argument("file_path", type=click.Path(exists=True, path_type=Path))
+@click.option("-o", "--output", type=click.Path(path_type=Path), help="Output file path")
 @click.option("--no-validate", is_flag=True, help="Skip Python syntax validation")
-def compile_cmd(file_path: str, output: str, no_validate: bool):
+@click.option("--no-cache", is_flag=True, help="Do not read or write the transpile cache")
+def compile_cmd(file_path: Path, output: Optional[Path], no_validate: bool, no_cache: bool):
     """Compile a .pln file to Python code."""
     try:
-        compiler = Compiler()
-        
-        if output:
-            output_path = output
-        else:
-            input_path = Path(file_path)
-            output_path = str(input_path.with_suffix(".py"))
+        from plain.compiler import Compiler
+
+        compiler = Compiler(use_cache=not no_cache)
+        output_path = output or file_path.with_suffix(".py")
         
         click.echo(f"Compiling {file_path}...")
         result_path = compiler.compile_to_file(file_path, output_path, validate=not no_validate)
@@ -124,11 +122,56 @@ def compile_cmd(file_path: str, output: str, no_validate: bool):
         sys.exit(1)
 
 
+@main.command()
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("-o", "--output-dir", type=click.Path(file_okay=False), help="Directory for the generated .py files")
+@click.option("-j", "--jobs", type=int, default=None, help="Number of worker processes (default: CPU count)")
+@click.option("--no-validate", is_flag=True, help="Skip Python syntax validation")
+@click.option("--no-cache", is_flag=True, help="Do not read or write the transpile cache")
+def build(paths, output_dir: str, jobs: int, no_validate: bool, no_cache: bool):
+    """Compile many .pln files in one process pool."""
+    try:
+        from plain.compiler import Compiler
+
+        compiler = Compiler(use_cache=not no_cache)
+        results = compiler.compile_many(
+            list(paths),
+            output_dir=output_dir,
+            validate=not no_validate,
+            workers=jobs,
+        )
+        
+        failed = 0
+        for file_path, result_path, error in results:
+            if error:
+                failed += 1
+                click.echo(f"Error: {file_path}: {error}", err=True)
+            else:
+                click.echo(f"Compiled {file_path} -> {result_path}")
+        
+        if failed:
+            click.echo(f"{failed} of {len(results)} file(s) failed to compile", err=True)
+            sys.exit(1)
+        
+    except ImportError as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        click.echo("Install required packages with: pip install -r requirements.txt", err=True)
+        sys.exit(1)
+    except ValueError as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"Unexpected error: {str(e)}", err=True)
+        sys.exit(1)
+
+
 @main.command()
 @click.option("--verbose", "-v", is_flag=True, help="Show generated Python code")
 def repl(verbose: bool):
     """Start an interactive REPL."""
     try:
+        from plain.repl import REPL
+
         repl_instance = REPL(verbose=verbose)
         repl_instance.run()
         
@@ -142,4 +185,9 @@ def repl(verbose: bool):
 
 
 if __name__ == "__main__":
+    # In a frozen (PyInstaller) build, worker processes start by re-running
+    # this entry point; freeze_support() hands them over to multiprocessing.
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     main()
@@ -1,24 +1,163 @@
 """Compiler that converts .pln files to Python code."""
 
-import ast
+import concurrent.futures
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import py_compile
+import sys
+from collections import OrderedDict
 from pathlib import Path
+from types import CodeType
 from typing import Dict, List, Optional, Tuple
-from .enhanced_transpiler import EnhancedTranspiler, SourceLine
+from . import __version__
+from .enhanced_transpiler import SourceLine, default_transpiler
+
+
+READ_CACHE_SIZE = 64
+VALIDATE_CACHE_SIZE = 128
+# Entries kept in the on-disk transpile cache; the oldest writes go first.
+DISK_CACHE_SIZE = 256
+
+# (filename, code) -> (code_object, error_message). Keyed on the full source
+# string, so a hit is always for identical code, never a hash collision.
+_validate_cache: "OrderedDict[Tuple[str, str], Tuple[Optional[CodeType], Optional[str]]]" = OrderedDict()
+
+def default_cache_dir() -> Path:
+    """Return the directory used to cache transpiled output."""
+    return Path(os.environ.get("PLAIN_CACHE", Path.home() / ".cache" / "plain"))
+
+
+# Compilers reused across the jobs a compile_many worker process runs, so
+# each worker builds its transpiler and caches once rather than per file.
+_worker_compilers: Dict[Tuple[Optional[str], bool], "Compiler"] = {}
+
+
+def _compile_worker(
+    job: Tuple[str, str, bool, Optional[str], bool],
+) -> Tuple[str, Optional[str], Optional[str]]:
+    """Compile one file inside a compile_many worker process."""
+    file_path, output_path, validate, cache_dir, use_cache = job
+    compiler = _worker_compilers.get((cache_dir, use_cache))
+    if compiler is None:
+        compiler = Compiler(cache_dir=cache_dir, use_cache=use_cache)
+        _worker_compilers[(cache_dir, use_cache)] = compiler
+    try:
+        return (file_path, compiler.compile_to_file(file_path, output_path, validate=validate), None)
+    except Exception as e:
+        return (file_path, None, str(e))
 
 
 class Compiler:
     """Compiles .pln files to Python code using enhanced transpilation."""
     
-    def __init__(self, transpiler=None):
+    def __init__(self, transpiler=None, cache_dir: Optional[str] = None, use_cache: bool = True):
         """Initialize the compiler.
         
         Args:
-            transpiler: Transpiler instance (creates enhanced one if not provided)
+            transpiler: Transpiler instance (shares the default enhanced one if not provided)
+            cache_dir: Directory for cached output (defaults to $PLAIN_CACHE or ~/.cache/plain)
+            use_cache: Whether to reuse cached output for unchanged sources
         """
-        self.transpiler = transpiler or EnhancedTranspiler()
+        self.transpiler = transpiler or default_transpiler()
+        self.cache_dir: Optional[Path] = (Path(cache_dir) if cache_dir else default_cache_dir()) if use_cache else None
+        self._transpiler_fingerprint = self._fingerprint_transpiler()
         self.last_mapping: Dict[int, SourceLine] = {}
         self.last_source_lines: List[str] = []
         self.last_file: Optional[str] = None
+        self.last_code: Optional[CodeType] = None
+        self._read_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
+    def _fingerprint_transpiler(self) -> str:
+        """Identify the transpiler build so cached output is invalidated on upgrade."""
+        transpiler_type = type(self.transpiler)
+        parts = [__version__, f"{transpiler_type.__module__}.{transpiler_type.__qualname__}"]
+        module_file = getattr(sys.modules.get(transpiler_type.__module__), "__file__", None)
+        if module_file:
+            try:
+                parts.append(str(os.stat(module_file).st_mtime_ns))
+            except OSError:
+                pass
+        return "\0".join(parts)
+
+    def _cache_path(self, plain_text: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256()
+        digest.update(self._transpiler_fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(plain_text.encode("utf-8"))
+        return self.cache_dir / f"{digest.hexdigest()}.json"
+
+    def _load_cached(self, cache_path: Optional[Path]) -> Optional[Tuple[str, Dict[int, SourceLine], bool]]:
+        """Load cached output, returning None on a miss or an unreadable entry."""
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            mapping = {
+                int(py_line): SourceLine(content=content, indent=indent, line_no=line_no)
+                for py_line, content, indent, line_no in entry["mapping"]
+            }
+            return (entry["code"], mapping, bool(entry["validated"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store_cached(
+        self,
+        cache_path: Optional[Path],
+        python_code: str,
+        mapping: Dict[int, SourceLine],
+        validated: bool,
+    ) -> None:
+        """Write output to the cache; failures only cost a future cache miss."""
+        if cache_path is None:
+            return
+        entry = {
+            "code": python_code,
+            "mapping": [[py_line, src.content, src.indent, src.line_no] for py_line, src in mapping.items()],
+            "validated": validated,
+        }
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+        self._prune_cache(cache_path.parent)
+
+    @staticmethod
+    def _prune_cache(cache_dir: Path) -> None:
+        """Delete the least recently written entries beyond DISK_CACHE_SIZE."""
+        try:
+            entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".json")]
+        except OSError:
+            return
+        excess = len(entries) - DISK_CACHE_SIZE
+        if excess <= 0:
+            return
+
+        def written(entry: "os.DirEntry[str]") -> int:
+            try:
+                return entry.stat().st_mtime_ns
+            except OSError:
+                return 0
+
+        entries.sort(key=written)
+        for entry in entries[:excess]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
     
     def read_pl_file(self, file_path: str) -> str:
         """Read a .pln file and return its contents.
@@ -31,6 +170,7 @@ class Compiler:
             
         Raises:
             FileNotFoundError: If file doesn't exist
+            ValueError: If file is not a .pln file or is empty
             IOError: If file cannot be read
         """
         path = Path(file_path)
@@ -40,9 +180,50 @@ class Compiler:
         if not path.suffix == ".pln":
             raise ValueError(f"File must have .pln extension: {file_path}")
         
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
+        st = path.stat()
+        if st.st_size == 0:
+            raise ValueError(f"File is empty: {file_path}")
+        key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+        cached = self._read_cache.get(key)
+        if cached is not None:
+            self._read_cache.move_to_end(key)
+            return cached
+        
+        # One read and one decode; the transpiler splits with splitlines(),
+        # so universal-newline translation is not needed here.
+        contents = path.read_bytes().decode("utf-8")
+        
+        self._read_cache[key] = contents
+        if len(self._read_cache) > READ_CACHE_SIZE:
+            self._read_cache.popitem(last=False)
+        return contents
     
+    def _compile_python(self, code: str, filename: str) -> Tuple[Optional[CodeType], Optional[str]]:
+        """Compile Python code, returning (code_object, error_message)."""
+        key = (filename, code)
+        hit = _validate_cache.get(key)
+        if hit is not None:
+            _validate_cache.move_to_end(key)
+            return hit
+        
+        try:
+            result: Tuple[Optional[CodeType], Optional[str]] = (
+                compile(code, filename, "exec", dont_inherit=True),
+                None,
+            )
+        except SyntaxError as e:
+            error_msg = f"Syntax error at line {e.lineno}: {e.msg}"
+            if e.text:
+                error_msg += f"\n  {e.text.strip()}"
+            result = (None, error_msg)
+        except Exception as e:
+            result = (None, f"Validation error: {str(e)}")
+        
+        _validate_cache[key] = result
+        if len(_validate_cache) > VALIDATE_CACHE_SIZE:
+            _validate_cache.popitem(last=False)
+        return result
+
     def validate_python(self, code: str) -> Tuple[bool, Optional[str]]:
         """Validate Python code syntax.
         
@@ -52,16 +233,8 @@ class Compiler:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        try:
-            ast.parse(code)
-            return (True, None)
-        except SyntaxError as e:
-            error_msg = f"Syntax error at line {e.lineno}: {e.msg}"
-            if e.text:
-                error_msg += f"\n  {e.text.strip()}"
-            return (False, error_msg)
-        except Exception as e:
-            return (False, f"Validation error: {str(e)}")
+        code_obj, error_msg = self._compile_python(code, "<plain>")
+        return (code_obj is not None, error_msg)
     
     def compile(self, file_path: str, validate: bool = True) -> str:
         """Compile a .pln file to Python code.
@@ -78,30 +251,55 @@ class Compiler:
             ValueError: If generated code is invalid
             Exception: If compilation fails
         """
+        file_path = os.fspath(file_path)
         plain_text = self.read_pl_file(file_path)
         
+        # Zero-byte files are rejected by read_pl_file before any read.
         if not plain_text.strip():
             raise ValueError(f"File is empty: {file_path}")
         
-        python_code, mapping = self.transpiler.transpile(plain_text, with_mapping=True)
-        self.last_mapping = mapping or {}
+        cache_path = self._cache_path(plain_text)
+        cached = self._load_cached(cache_path)
+        if cached is not None:
+            python_code, mapping, validated = cached
+            needs_store = False
+        else:
+            python_code, mapping = self.transpiler.transpile(plain_text, with_mapping=True)
+            mapping = mapping or {}
+            validated = False
+            needs_store = True
+        self.last_mapping = mapping
         self.last_source_lines = plain_text.splitlines()
         self.last_file = file_path
+        self.last_code = None
         
-        if validate:
-            is_valid, error_msg = self.validate_python(python_code)
-            if not is_valid:
+        if validate and not validated:
+            code_obj, error_msg = self._compile_python(python_code, file_path)
+            if code_obj is None:
                 raise ValueError(f"Generated Python code is invalid:\n{error_msg}\n\nGenerated code:\n{python_code}")
+            self.last_code = code_obj
+            validated = True
+            needs_store = True
+        
+        if needs_store:
+            self._store_cached(cache_path, python_code, mapping, validated)
         
         return python_code
     
-    def compile_to_file(self, file_path: str, output_path: str, validate: bool = True) -> str:
+    def compile_to_file(
+        self,
+        file_path: str,
+        output_path: str,
+        validate: bool = True,
+        write_bytecode: bool = True,
+    ) -> str:
         """Compile a .pln file and save to a .py file.
         
         Args:
             file_path: Path to the .pln file
             output_path: Path to save the .py file
             validate: Whether to validate the generated Python code
+            write_bytecode: Whether to also write the matching __pycache__ .pyc
             
         Returns:
             Path to the generated .py file
@@ -120,11 +318,114 @@ class Compiler:
         except Exception as e:
             raise IOError(f"Cannot create output directory: {str(e)}")
         
-        try:
-            with open(output, "w", encoding="utf-8") as f:
-                f.write(python_code)
-        except Exception as e:
-            raise IOError(f"Cannot write to output file {output_path}: {str(e)}")
+        if not self._output_is_current(output, python_code):
+            # Write beside the target and swap it in, so an interrupted run never
+            # leaves a truncated .py behind.
+            tmp_output = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp_output, "w", encoding="utf-8") as f:
+                    f.write(python_code)
+                os.replace(tmp_output, output)
+            except Exception as e:
+                try:
+                    tmp_output.unlink()
+                except OSError:
+                    pass
+                raise IOError(f"Cannot write to output file {output_path}: {str(e)}")
+        
+        if write_bytecode:
+            self._write_bytecode(output, self.last_code)
         
         return str(output)
 
+    def _output_is_current(self, output: Path, python_code: str) -> bool:
+        """Whether output already holds python_code (skipping the write keeps its mtime)."""
+        try:
+            if not output.is_file():
+                return False
+            with open(output, "r", encoding="utf-8") as f:
+                return f.read() == python_code
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def _write_bytecode(self, output: Path, code_obj: Optional[CodeType] = None) -> None:
+        """Precompile the generated module into __pycache__ so importing it skips parsing."""
+        # Default optimization level on purpose: optimize=2 would strip asserts
+        # written in Plain programs.
+        try:
+            if code_obj is None:
+                py_compile.compile(str(output), doraise=True)
+                return
+            # Validation already compiled this exact source; serialize that code
+            # object (PEP 552 timestamp pyc) instead of parsing the file again.
+            # The import system rewrites co_filename to the .py path on load.
+            st = output.stat()
+            header = importlib.util.MAGIC_NUMBER + b"".join(
+                value.to_bytes(4, "little")
+                for value in (0, int(st.st_mtime) & 0xFFFFFFFF, st.st_size & 0xFFFFFFFF)
+            )
+            cfile = Path(importlib.util.cache_from_source(str(output)))
+            cfile.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cfile.with_name(f"{cfile.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(header + marshal.dumps(code_obj))
+            os.replace(tmp_path, cfile)
+        except (py_compile.PyCompileError, OSError, ValueError):
+            # The .py is already written; Python reports any error when it is run.
+            pass
+
+    def compile_many(
+        self,
+        file_paths: List[str],
+        output_dir: Optional[str] = None,
+        validate: bool = True,
+        workers: Optional[int] = None,
+    ) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """Compile several .pln files, fanning out across worker processes.
+        
+        Args:
+            file_paths: Paths to the .pln files
+            output_dir: Directory for the .py files (defaults to next to each source)
+            validate: Whether to validate the generated Python code
+            workers: Number of worker processes (defaults to the CPU count);
+                files are compiled in this process when a custom transpiler is set
+            
+        Returns:
+            List of (file_path, output_path, error_message) in input order;
+            output_path is None and error_message set for files that failed
+            
+        Raises:
+            ValueError: If two inputs would be written to the same output file
+        """
+        jobs = []
+        seen: Dict[str, str] = {}
+        cache_dir = str(self.cache_dir) if self.cache_dir is not None else None
+        for file_path in file_paths:
+            source = Path(file_path)
+            if output_dir:
+                output = Path(output_dir) / source.with_suffix(".py").name
+            else:
+                output = source.with_suffix(".py")
+            key = str(output.resolve())
+            if key in seen:
+                raise ValueError(f"{seen[key]} and {file_path} would both compile to {output}")
+            seen[key] = file_path
+            jobs.append((file_path, str(output), validate, cache_dir, self.cache_dir is not None))
+        
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        # Workers always build the default transpiler, so a custom one is only
+        # honoured on the serial path. Frozen executables cannot reliably spawn
+        # worker processes either, so they always compile serially.
+        if workers <= 1 or self.transpiler is not default_transpiler() or getattr(sys, "frozen", False):
+            results = []
+            for file_path, output_path, job_validate, _, _ in jobs:
+                try:
+                    results.append((file_path, self.compile_to_file(file_path, output_path, validate=job_validate), None))
+                except Exception as e:
+                    results.append((file_path, None, str(e)))
+            return results
+        
+        # Hand jobs out in batches so many small files don't each pay a
+        # round trip to the pool, while still leaving work to balance.
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_compile_worker, jobs, chunksize=chunksize))
@@ -2,41 +2,1021 @@
 """Enhanced transpiler for Plain language with full natural English support."""
 
 import ast
+import io
 import keyword
 import re
+import sys
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Set, Tuple, List, Dict, Union
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, NamedTuple, Optional, Sequence, Set, Tuple, List, Dict, Union
+
+
+LINE_CACHE_SIZE = 1024
+PHRASE_CACHE_SIZE = 4096
+
+# Per-line records are created for every source and output line, so drop
+# their instance dicts where the interpreter supports slotted dataclasses.
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Indentation strings for the common output widths, shared between lines.
+_INDENTS = tuple(' ' * width for width in range(128))
+
+_LEADING_WORD = re.compile(r'[^\W\d_]*')
+
+# Line patterns whose output depends only on the line text and the enclosing
+# function's parameters, never on neighbouring lines or block state.
+_CONTEXT_FREE_LINES = frozenset({
+    'print_numbers',
+    'elif_then_inline', 'elif_do_inline', 'else_inline',
+    'if_return', 'if_then_inline', 'if_do_inline',
+    'wait_sleep',
+    'set_named', 'let', 'set', 'increase', 'decrease',
+    'create_variable_set', 'create_variable',
+    'append_to_list', 'prepend_to_list', 'remove_from_list', 'pop_from_list',
+    'clear_list', 'sort_list', 'reverse_list',
+    'say_message', 'log_message', 'print', 'return', 'await',
+    'raise', 'throw', 'exit', 'yield',
+    'call_function', 'call_with', 'decorator', 'list_comprehension', 'lambda',
+    'connect_db', 'query_db', 'insert_db',
+})
+
+
+# Whole lines that always resolve to a block keyword pattern, and leading
+# words whose pattern is just "<keyword> <rest>", so they can be dispatched
+# without running any regex.
+_KEYWORD_LINES = {
+    'try': 'try_block',
+    'try:': 'try_block',
+    'try do': 'try_block',
+    'finally': 'finally',
+    'finally:': 'finally',
+    'else do': 'else_do_block',
+    'otherwise do': 'else_do_block',
+}
+_KEYWORD_STATEMENTS = {
+    'return': 'return',
+    'await': 'await',
+    'raise': 'raise',
+    'throw': 'throw',
+    'yield': 'yield',
+}
+
+# "print X" with a single-token argument, and "set X to Y" style assignments
+# of exactly four words, only ever match the print and set_named patterns.
+_PRINT_WORDS = frozenset({'print', 'show', 'display', 'echo', 'log'})
+_ASSIGN_WORDS = frozenset({'set', 'let', 'assign'})
+_ASSIGN_SEPARATORS = frozenset({'to', 'as', 'be'})
+_WHITESPACE = re.compile(r'\s')
+
+_SIMPLE_VALUE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*|-?[0-9]+(?:\.[0-9]+)?')
+_ASCII_NAME = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+# Small patterns shared by the name and value helpers.
+_ARTICLE = re.compile(r'^(?:the|a|an|my|your|our|their)\s+', re.IGNORECASE)
+_SHORT_ARTICLE = re.compile(r'^(?:the|a|an)\s+', re.IGNORECASE)
+_NON_WORD = re.compile(r'[^\w]+')
+_NAMED_SUFFIX = re.compile(r'(?:named|called)\s+(.+)$', re.IGNORECASE)
+_COLLECTION_OF = re.compile(
+    r'^(?:list|array|set|tuple|dictionary|dict|map|collection|sequence)\s+of\s+(.+)$',
+    re.IGNORECASE,
+)
+_IDENTIFIER = re.compile(r'^[A-Za-z_]\w*$')
+_NUMBER_LITERAL = re.compile(r'^-?\d+(\.\d+)?$')
+_VALUE_OF = re.compile(r'^(?:value|result)\s+of\s+(.+)$', re.IGNORECASE)
+_DOTTED_NAME = re.compile(r'^[A-Za-z_]\w*(?:\.\w+)*$')
+_PARENT_SEPARATOR = re.compile(r'\s+and\s+|,\s*')
+
+# Optional lead-ins before the items of a collection initializer. Every part
+# is optional, so these always match (possibly empty) at the start.
+_LIST_ITEMS_PREFIX = re.compile(r'(?:with\s+)?(?:items|values|elements|entries)?\s*', re.IGNORECASE)
+_DICT_ITEMS_PREFIX = re.compile(r'(?:with\s+)?(?:items|values|entries|pairs)?\s*', re.IGNORECASE)
+_KEY_VALUE = re.compile(r'^(.+?)\s*(?:=|:|to|->)\s*(.+)$')
+
+# Two names separated by whitespace at the start of a line, and the soft
+# keywords that can legally begin a statement that way (see _never_parses).
+_LEADING_NAMES = re.compile(r'([A-Za-z_]\w*)\s+([A-Za-z_]\w*)')
+_SOFT_KEYWORDS = frozenset({'match', 'case', 'type'})
+
+# Words that continue an expression or condition rather than start the
+# arguments of a call written without parentheses.
+_NOT_CALL_PREFIXES = (
+    'is ', 'are ', 'was ', 'were ', 'has ', 'have ',
+    'times ', 'plus ', 'minus ', 'divided ', 'over ', 'mod ', 'modulo ',
+    'between ', 'greater ', 'less ', 'equals ', 'equal ', 'contains ',
+    'starts ', 'ends ', 'and ', 'or ', 'not '
+)
+
+# Seconds per duration unit, as the literal text emitted into sleep calls.
+_DURATION_MULTIPLIERS = MappingProxyType({
+    "ms": "0.001",
+    "millisecond": "0.001",
+    "milliseconds": "0.001",
+    "second": "1",
+    "seconds": "1",
+    "minute": "60",
+    "minutes": "60",
+    "hour": "3600",
+    "hours": "3600",
+})
+
+# Values of the number words understood in expressions and parameter counts.
+_NUMBER_WORDS = MappingProxyType({
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+})
+
+# Item separators for _split_items: a comma or a whitespace-delimited "and".
+# Quoted strings (running to the end of the text when unterminated) are
+# matched first so separators inside them are skipped.
+_ITEM_SEPARATOR = re.compile(r'"[^"]*"?|\'[^\']*\'?|(,|\s+and(?:\s+|\Z))', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _expr_node_type(expr: str) -> Optional[type]:
+    """Return the AST node type ``expr`` parses to in eval mode, or None if it does not parse."""
+    # Plain names and natural-language phrases are by far the most common
+    # inputs, and neither needs the parser to classify.
+    if _ASCII_NAME.fullmatch(expr):
+        if not keyword.iskeyword(expr):
+            return ast.Name
+        return ast.Constant if expr in ('True', 'False', 'None') else None
+    if _never_parses(expr):
+        return None
+    try:
+        return type(ast.parse(expr, mode='eval').body)
+    except Exception:
+        return None
+
+
+def _never_parses(text: str) -> bool:
+    """Return True if ``text`` is certain to be a Python syntax error.
+
+    Natural-language lines almost always open with two plain names in a row
+    ("greet the user"), which no Python statement does unless one of them is
+    a keyword or the first is a soft keyword. Recognising that up front
+    saves a failing ast.parse, which is the slowest way to find out.
+    """
+    match = _LEADING_NAMES.match(text)
+    if match is None:
+        return False
+    first, second = match.groups()
+    return not (keyword.iskeyword(first) or keyword.iskeyword(second) or first in _SOFT_KEYWORDS)
+
+
+def _leading_literal(pattern: str) -> str:
+    """Return the lowercased literal text that every match of ``pattern`` starts with."""
+    # Alternatives inside a group further on leave the leading literal alone;
+    # only a bar outside every group (or inside a nested one) rules it out.
+    if '|' in re.sub(r'\\.|\[[^\]]*\]|\([^()]*\)', '', pattern):
+        return ''
+    i = 2 if pattern.startswith('\\b') else 0
+    chars = []
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\' and pattern[i + 1:i + 2] in ('.', '(', ')', '[', ']'):
+            literal, step = pattern[i + 1], 2
+        elif ch.isalnum() or ch in ' _@=':
+            literal, step = ch, 1
+        else:
+            break
+        if pattern[i + step:i + step + 1] in ('?', '*', '+', '{'):
+            break
+        chars.append(literal)
+        i += step
+    return ''.join(chars).lower()
+
+
+class BlockType(IntEnum):
+    """Kind of block a header line opens."""
 
+    BLOCK = 1
+    DEF = 2
+    CLASS = 3
 
-@dataclass
+
+# Not frozen: a frozen dataclass pays an object.__setattr__ call per field
+# on construction, which shows up in the tokenizer. Source lines are never
+# shared through the line cache, so they do not need to be immutable.
+@dataclass(**_SLOTS)
 class SourceLine:
     content: str
     indent: int
     line_no: int
 
 
-@dataclass
-class OutputLine:
+class OutputLine(NamedTuple):
+    # A plain tuple underneath: cheaper to build than a dataclass and
+    # unpacks directly as ``offset, text`` when blocks are re-indented.
     indent_offset: int
     text: str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TranspileResult:
     lines: List[OutputLine]
     consumed: int = 1
     opens_block: bool = False
-    block_type: Optional[str] = None
+    block_type: Optional[BlockType] = None
     block_name: Optional[str] = None
     block_params: Optional[List[str]] = None
 
+    @classmethod
+    def single(cls, text: str) -> "TranspileResult":
+        """Return a result made of one top-level output line."""
+        return cls([_COMMON_LINES.get(text) or OutputLine(0, text)])
+
+
+# Shared output lines for the bodies that recur in almost every program.
+_COMMON_LINES = {text: OutputLine(0, text) for text in ('pass', 'break', 'continue')}
+_PASS_BODY = (_COMMON_LINES['pass'],)
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class Block:
     indent: int
-    block_type: str
+    block_type: BlockType
     name: Optional[str] = None
     params: Optional[List[str]] = None
+    # Parameters of the innermost function and name of the innermost class
+    # enclosing this block (or the block itself), carried along so lookups
+    # don't rescan the stack.
+    function_params: Optional[Tuple[str, ...]] = None
+    class_name: Optional[str] = None
+
+
+@dataclass(**_SLOTS)
+class LineContext:
+    line: SourceLine
+    text: str
+    all_lines: List[SourceLine]
+    index: int
+    stack: List[Block]
+    endpoint_names: Dict[str, int]
+    current_params: Optional[Tuple[str, ...]]
+
+
+class LinePatternSet:
+    """Match a line against an ordered list of patterns in a single regex pass.
+
+    The patterns are joined into one anchored alternation in priority order, so
+    the first pattern that matches wins exactly as it would in a cascade of
+    separate ``match`` calls.
+    """
+
+    def __init__(self, patterns: List[Tuple[str, "re.Pattern[str]"]]):
+        parts = []
+        for name, pattern in patterns:
+            flags = ''
+            if pattern.flags & re.IGNORECASE:
+                flags += 'i'
+            if pattern.flags & re.DOTALL:
+                flags += 's'
+            parts.append(f"(?P<{name}>(?{flags}:{pattern.pattern}))")
+        self._regex = re.compile('|'.join(parts))
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        for name, pattern in patterns:
+            start = self._regex.groupindex[name]
+            self._spans[name] = (start, start + pattern.groups)
+
+    def match(self, text: str) -> Optional[Tuple[str, Tuple[Optional[str], ...]]]:
+        """Return the name of the first matching pattern and its groups."""
+        match = self._regex.match(text)
+        if not match:
+            return None
+        name = match.lastgroup
+        start, end = self._spans[name]
+        return name, match.groups()[start:end]
+
+
+_LIBRARY_PATTERNS = MappingProxyType({
+    'json': [r'\bjson\.', r'json\.loads', r'json\.dumps', r'json\.load', r'json\.dump'],
+    'os': [r'\bos\.', r'os\.path', r'os\.getenv', r'os\.environ', r'os\.system'],
+    'sys': [
+        r'\bsys\.',
+        r'sys\.argv',
+        r'sys\.exit',
+        r'sys\.path',
+        r'\bexit\b',
+        r'\bquit\b',
+        r'\bstop\s+program\b',
+    ],
+    'datetime': [r'\bdatetime\.', r'datetime\.now', r'from datetime', r'datetime\.today'],
+    'time': [
+        r'\btime\.',
+        r'time\.sleep',
+        r'time\.time',
+        r'\bwait\b',
+        r'\bsleep\b',
+        r'\bdelay\b',
+    ],
+    'csv': [r'\bcsv\.', r'csv\.reader', r'csv\.writer', r'csv\.DictReader'],
+    're': [r'\bre\.', r're\.search', r're\.match', r're\.findall'],
+    'logging': [
+        r'\blogging\.',
+        r'logging\.info',
+        r'logging\.error',
+        r'logging\.debug',
+        r'\blog\s+(?:debug|info|warning|error|critical)\b',
+        r'\blogging\s+(?:debug|info|warning|error|critical)\b',
+        r'\blogger\s+(?:debug|info|warning|error|critical)\b',
+    ],
+    'pathlib': [r'\bpathlib\.', r'Path\(', r'from pathlib'],
+    'collections': [r'\bcollections\.', r'from collections'],
+    'itertools': [r'\bitertools\.', r'from itertools'],
+    'functools': [r'\bfunctools\.', r'from functools'],
+    'asyncio': [r'\basyncio\.', r'async def', r'await ', r'from asyncio', r'async function'],
+    'threading': [r'\bthreading\.', r'Thread\(', r'from threading'],
+    'multiprocessing': [r'\bmultiprocessing\.', r'Process\(', r'from multiprocessing'],
+    'sqlite3': [r'\bsqlite3\.', r'sqlite3\.connect', r'from sqlite3'],
+    'urllib': [r'\burllib\.', r'urllib\.request', r'urllib\.parse'],
+    'http': [r'\bhttp\.', r'http\.server', r'http\.client'],
+    'email': [r'\bemail\.', r'from email'],
+    'hashlib': [r'\bhashlib\.', r'hashlib\.md5', r'hashlib\.sha256'],
+    'base64': [r'\bbase64\.', r'base64\.encode', r'base64\.decode'],
+    'uuid': [r'\buuid\.', r'uuid\.uuid4', r'from uuid'],
+    'random': [r'\brandom\.', r'random\.choice', r'random\.randint'],
+    'math': [r'\bmath\.', r'math\.sqrt', r'math\.pi'],
+    'statistics': [r'\bstatistics\.', r'from statistics'],
+    'flask': [r'\bflask\.', r'from flask', r'Flask\(', r'@app\.route', r'jsonify\('],
+    'django': [r'\bdjango\.', r'from django', r'Django', r'@csrf_exempt'],
+    'fastapi': [r'\bfastapi\.', r'from fastapi', r'FastAPI\(', r'@app\.'],
+    'tornado': [r'\btornado\.', r'from tornado'],
+    'aiohttp': [r'\baiohttp\.', r'from aiohttp'],
+    'requests': [r'\brequests\.', r'requests\.get', r'requests\.post', r'from requests'],
+    'httpx': [r'\bhttpx\.', r'from httpx'],
+    'urllib3': [r'\burllib3\.', r'from urllib3'],
+    'sqlalchemy': [r'\bsqlalchemy\.', r'from sqlalchemy', r'SQLAlchemy', r'Base = declarative_base'],
+    'psycopg2': [r'\bpsycopg2\.', r'from psycopg2'],
+    'pymongo': [r'\bpymongo\.', r'from pymongo', r'MongoClient'],
+    'redis': [r'\bredis\.', r'from redis', r'Redis\('],
+    'pymysql': [r'\bpymysql\.', r'from pymysql'],
+    'pandas': [r'\bpandas\.', r'import pandas', r'pd\.', r'DataFrame', r'Series'],
+    'numpy': [r'\bnumpy\.', r'import numpy', r'np\.', r'array\(', r'ndarray'],
+    'matplotlib': [r'\bmatplotlib\.', r'from matplotlib', r'plt\.', r'pyplot'],
+    'seaborn': [r'\bseaborn\.', r'from seaborn', r'sns\.'],
+    'scipy': [r'\bscipy\.', r'from scipy'],
+    'sklearn': [r'\bsklearn\.', r'from sklearn', r'scikit-learn'],
+    'unittest': [r'\bunittest\.', r'from unittest', r'TestCase', r'@unittest'],
+    'pytest': [r'\bpytest\.', r'from pytest', r'@pytest', r'def test_'],
+    'mock': [r'\bmock\.', r'from mock', r'@patch'],
+    'click': [r'\bclick\.', r'from click', r'@click'],
+    'typing': [r'\btyping\.', r'from typing', r'List\[', r'Dict\[', r'Optional\[', r'Union\['],
+    'dataclasses': [r'\bdataclasses\.', r'from dataclasses', r'@dataclass'],
+    'enum': [r'\benum\.', r'from enum', r'Enum'],
+    'pydantic': [r'\bpydantic\.', r'from pydantic', r'BaseModel'],
+    'configparser': [r'\bconfigparser\.', r'from configparser'],
+    'yaml': [r'\byaml\.', r'import yaml', r'yaml\.load'],
+    'toml': [r'\btoml\.', r'from toml'],
+    'dotenv': [r'\bdotenv\.', r'from dotenv', r'load_dotenv'],
+})
+
+# Each library pattern compiled once, paired with the literal its matches
+# start with (see _detect_libraries).
+_LIBRARY_REGEXES = MappingProxyType({
+    lib: tuple((_leading_literal(pattern), re.compile(pattern, re.IGNORECASE)) for pattern in patterns)
+    for lib, patterns in _LIBRARY_PATTERNS.items()
+})
+
+# Standard-library modules among the detectable libraries.
+_STDLIB_MODULES = frozenset({
+    'json', 'os', 'sys', 'datetime', 'time', 'csv', 're', 'logging', 'pathlib',
+    'collections', 'itertools', 'functools', 'asyncio', 'threading', 'multiprocessing',
+    'sqlite3', 'urllib', 'http', 'email', 'hashlib', 'base64', 'uuid', 'random',
+    'math', 'statistics', 'unittest', 'configparser', 'enum', 'dataclasses', 'typing'
+})
+
+# Import lines for libraries that need more than a plain "import <name>".
+_LIBRARY_IMPORTS = MappingProxyType({
+    # Standard library
+    'datetime': "from datetime import datetime, timedelta",
+    'typing': "from typing import List, Dict, Optional, Union, Any, Tuple, Callable",
+    'pathlib': "from pathlib import Path",
+    'collections': "from collections import defaultdict, Counter, deque",
+    'itertools': "from itertools import chain, combinations, permutations",
+    'functools': "from functools import wraps, lru_cache",
+    'asyncio': "import asyncio",
+    'unittest': "import unittest",
+    'enum': "from enum import Enum",
+    'dataclasses': "from dataclasses import dataclass, field",
+    # Web frameworks
+    'flask': "from flask import Flask, request, jsonify, render_template, send_file, send_from_directory",
+    'django': "from django.http import HttpResponse, JsonResponse",
+    'fastapi': "from fastapi import FastAPI, HTTPException",
+    'tornado': "import tornado.web",
+    'aiohttp': "import aiohttp",
+    # Databases
+    'sqlalchemy': "from sqlalchemy import create_engine, Column, Integer, String, ForeignKey\n"
+                  "from sqlalchemy.ext.declarative import declarative_base\n"
+                  "from sqlalchemy.orm import sessionmaker",
+    'psycopg2': "import psycopg2",
+    'pymongo': "from pymongo import MongoClient",
+    'redis': "import redis",
+    'pymysql': "import pymysql",
+    # Data science
+    'pandas': "import pandas as pd",
+    'numpy': "import numpy as np",
+    'matplotlib': "import matplotlib.pyplot as plt",
+    'seaborn': "import seaborn as sns",
+    # HTTP clients
+    'requests': "import requests",
+    'httpx': "import httpx",
+    # Testing
+    'pytest': "import pytest",
+    'mock': "from unittest.mock import Mock, patch",
+    # Configuration
+    'yaml': "import yaml",
+    'toml': "import toml",
+    'dotenv': "from dotenv import load_dotenv",
+})
+_LIBRARY_IMPORT_LINES = MappingProxyType({
+    lib: tuple(text.split('\n')) for lib, text in _LIBRARY_IMPORTS.items()
+})
+
+_PATTERNS = MappingProxyType({
+    'create_function': re.compile(
+        r'^(?:create|make|build)\s+(?:a\s+)?function\s+(?:named|called)\s+(.+?)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
+        re.IGNORECASE
+    ),
+    'define_function': re.compile(
+        r'^define\s+(?:a\s+)?function\s+(?:named|called)\s+(.+?)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
+        re.IGNORECASE
+    ),
+
+    'let': re.compile(r'^let\s+(\w+)\s+be\s+(.+)$', re.IGNORECASE),
+    'set': re.compile(r'^set\s+(\w+)\s+to\s+(.+)$', re.IGNORECASE),
+    'set_named': re.compile(
+        r'^(?:set|let|assign)\s+(?:the\s+)?(.+?)\s+(?:to|as|be|equal\s+to)\s+(.+)$',
+        re.IGNORECASE
+    ),
+    'create_variable': re.compile(
+        r'^create\s+(?:a\s+)?(?:variable|list|dictionary|dict|map)\s+(?:named|called)\s+(.+?)(?:\s+with\s+(.+))?$',
+        re.IGNORECASE
+    ),
+    'create_variable_set': re.compile(
+        r'^create\s+(?:a\s+)?(?:variable|list|dictionary|dict|map)\s+(?:named|called)\s+(.+?)\s+set\s+to\s+(.+)$',
+        re.IGNORECASE
+    ),
+    'increase': re.compile(r'^(?:increase|increment)\s+(.+?)\s+by\s+(.+)$', re.IGNORECASE),
+    'decrease': re.compile(r'^(?:decrease|decrement|reduce)\s+(.+?)\s+by\s+(.+)$', re.IGNORECASE),
+
+    'if_then_do_block': re.compile(r'^if\s+(.+?)\s+then\s+do\s*$', re.IGNORECASE),
+    'if_do_block': re.compile(r'^if\s+(.+?)\s+do\s*$', re.IGNORECASE),
+    'if_then_inline': re.compile(r'^if\s+(.+?)\s+then\s+(.+)$', re.IGNORECASE),
+    'if_do_inline': re.compile(r'^if\s+(.+?)\s+do\s+(.+)$', re.IGNORECASE),
+    'if_return': re.compile(r'^if\s+(.+?)\s+return\s+(.+)$', re.IGNORECASE),
+    'elif_then_do_block': re.compile(r'^(?:elif|else\s+if)\s+(.+?)\s+then\s+do\s*$', re.IGNORECASE),
+    'elif_do_block': re.compile(r'^(?:elif|else\s+if)\s+(.+?)\s+do\s*$', re.IGNORECASE),
+    'elif_then_inline': re.compile(r'^(?:elif|else\s+if)\s+(.+?)\s+then\s+(.+)$', re.IGNORECASE),
+    'elif_do_inline': re.compile(r'^(?:elif|else\s+if)\s+(.+?)\s+do\s+(.+)$', re.IGNORECASE),
+    'else_do_block': re.compile(r'^(?:else|otherwise)\s+do\s*$', re.IGNORECASE),
+    'else_inline': re.compile(r'^(?:else|otherwise)\s*,?\s+(.+)$', re.IGNORECASE),
+
+    'for_each': re.compile(
+        r'^for\s+each\s+(\w+)\s+in\s+(.+?)\s+do\s*(.*)$',
+        re.IGNORECASE | re.DOTALL
+    ),
+    'for_each_in': re.compile(r'^for\s+each\s+(\w+)\s+in\s+(.+)$', re.IGNORECASE),
+    'while_do': re.compile(r'^while\s+(.+?)\s+do\s*(.*)$', re.IGNORECASE),
+    'repeat_times': re.compile(r'^repeat\s+(.+?)\s+times\s+do\s*(.*)$', re.IGNORECASE),
+    'repeat_until': re.compile(r'^repeat\s+until\s+(.+?)\s+do\s*(.*)$', re.IGNORECASE),
+    'repeat_while': re.compile(r'^repeat\s+while\s+(.+?)\s+do\s*(.*)$', re.IGNORECASE),
+    'wait_sleep': re.compile(
+        r'^(?:wait|sleep|delay)\s+(?:for\s+)?(.+?)(?:\s+(seconds?|minutes?|hours?|ms|milliseconds?))?$',
+        re.IGNORECASE
+    ),
+
+    'print_numbers': re.compile(r'^print\s+numbers\s+from\s+(.+?)\s+to\s+(.+)$', re.IGNORECASE),
+    'print': re.compile(r'^(?:print|show|display|echo|log)\s+(.+)$', re.IGNORECASE),
+    'say_message': re.compile(r'^(?:say|tell|announce)\s+(.+)$', re.IGNORECASE),
+    'log_message': re.compile(
+        r'^(?:log|logging|logger)\s+(debug|info|warning|error|critical)\s+(.+)$',
+        re.IGNORECASE
+    ),
+
+    'return': re.compile(r'^(?:return|give\s+back|send\s+back)\s+(.+)$', re.IGNORECASE),
+
+    'call_function': re.compile(r'^(?:call|run|execute)\s+(.+?)(?:\s+with\s+(.+))?$', re.IGNORECASE),
+    'call_with': re.compile(
+        r'^([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)\s+(?:with|using)\s+(.+)$',
+        re.IGNORECASE
+    ),
+    'dot_call': re.compile(r'^([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+)\s+(.+)$', re.IGNORECASE),
+
+    'class_inheritance': re.compile(
+        r'^(?:create|make|define)\s+(?:a\s+)?class\s+(?:named|called)\s+(.+?)\s+that\s+(?:extends|inherits\s+from)\s+(.+)$',
+        re.IGNORECASE
+    ),
+    'create_class': re.compile(
+        r'^(?:create|make|define)\s+(?:a\s+)?class\s+(?:named|called)\s+(.+?)\s*$',
+        re.IGNORECASE
+    ),
+
+    'string_length_comparison': re.compile(
+        r'^if\s+the\s+length\s+of\s+string\s+(\w+)\s+is\s+'
+        r'(bigger|greater|longer|smaller|less|shorter|equal|same)\s+than\s+string\s+(\w+)'
+        r'(?:\s*,?\s*then\s*)?\s*return\s+(.+)$',
+        re.IGNORECASE
+    ),
+
+    'try_block': re.compile(r'^try\s*(?::\s*)?(?:do\s*)?$', re.IGNORECASE),
+    'catch': re.compile(
+        r'^catch\s+(?:exception|error)?(?:\s+as\s+(\w+))?\s*:?\s*(?:do\s*(.*))?$',
+        re.IGNORECASE
+    ),
+    'finally': re.compile(r'^finally\s*:?\s*(?:do\s*(.*))?$', re.IGNORECASE),
+    'raise': re.compile(r'^raise\s+(.+)$', re.IGNORECASE),
+    'throw': re.compile(r'^throw\s+(.+)$', re.IGNORECASE),
+    'exit': re.compile(
+        r'^(?:exit|quit|stop)(?:\s+program|\s+app|\s+script)?(?:\s+(?:with\s+code\s+)?(.+))?$',
+        re.IGNORECASE
+    ),
+
+    'async_function': re.compile(
+        r'^(?:create|make|define)\s+(?:an\s+)?async\s+function\s+(?:named|called)\s+(.+?)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
+        re.IGNORECASE
+    ),
+    'await': re.compile(r'^await\s+(.+)$', re.IGNORECASE),
+
+    'class_method': re.compile(
+        r'^(?:create|make|define)\s+(?:a\s+)?class\s+method\s+(?:named|called)\s+(\w+)\s+in\s+class\s+(\w+)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
+        re.IGNORECASE
+    ),
+    'instance_method': re.compile(
+        r'^(?:create|make|define)\s+(?:a\s+)?method\s+(?:named|called)\s+(\w+)\s+in\s+class\s+(\w+)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
+        re.IGNORECASE
+    ),
+    'static_method': re.compile(
+        r'^(?:create|make|define)\s+(?:a\s+)?static\s+method\s+(?:named|called)\s+(\w+)\s+(?:in\s+class\s+(\w+)\s+)?that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
+        re.IGNORECASE
+    ),
+    'property': re.compile(
+        r'^create\s+(?:a\s+)?property\s+named\s+(\w+)\s+(?:in\s+class\s+(\w+)\s+)?that\s+returns\s+(.+)$',
+        re.IGNORECASE
+    ),
+
+    'decorator': re.compile(r'^decorate\s+(\w+)\s+with\s+(.+)$', re.IGNORECASE),
+
+    'with_as': re.compile(r'^with\s+(.+?)\s+as\s+(\w+)\s+do\s*(.*)$', re.IGNORECASE),
+    'with_simple': re.compile(r'^with\s+(.+?)\s+do\s*(.*)$', re.IGNORECASE),
+
+    'generator': re.compile(
+        r'^(?:create|make|define)\s+(?:a\s+)?generator\s+(?:named|called)\s+(.+?)\s+that\s+takes\s+(.+?)\s+and\s+yields\s*(.*)$',
+        re.IGNORECASE
+    ),
+    'yield': re.compile(r'^yield\s+(.+)$', re.IGNORECASE),
+    'append_to_list': re.compile(r'^(?:add|append|push)\s+(.+?)\s+to\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
+    'prepend_to_list': re.compile(r'^prepend\s+(.+?)\s+to\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
+    'remove_from_list': re.compile(r'^(?:remove|delete)\s+(.+?)\s+from\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
+    'pop_from_list': re.compile(r'^pop\s+(?:from\s+)?(.+)$', re.IGNORECASE),
+    'clear_list': re.compile(r'^(?:clear|empty)\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
+    'sort_list': re.compile(r'^(?:sort|order)\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
+    'reverse_list': re.compile(r'^(?:reverse)\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
+
+    'connect_db': re.compile(r'^connect\s+to\s+database\s+(.+)$', re.IGNORECASE),
+    'query_db': re.compile(r'^query\s+database\s+with\s+(.+)$', re.IGNORECASE),
+    'insert_db': re.compile(r'^insert\s+into\s+database\s+(.+)$', re.IGNORECASE),
+
+    'type_hint': re.compile(r'^(\w+)\s*:\s*(.+)$', re.IGNORECASE),
+
+    'list_comprehension': re.compile(
+        r'^create\s+(?:a\s+)?list\s+of\s+(.+?)\s+for\s+each\s+(\w+)\s+in\s+(.+?)(?:\s+if\s+(.+))?$',
+        re.IGNORECASE
+    ),
+
+    'lambda': re.compile(
+        r'^create\s+(?:a\s+)?lambda\s+function\s+that\s+takes\s+(.+?)\s+and\s+returns\s+(.+)$',
+        re.IGNORECASE
+    ),
+
+    'api_endpoint': re.compile(
+        r'^create\s+(?:an\s+)?api\s+endpoint\s+at\s+(.+?)\s+that\s+(\w+)\s+and\s+returns\s+(.+)$',
+        re.IGNORECASE
+    ),
+    'api_endpoint_block': re.compile(
+        r'^create\s+(?:an\s+)?api\s+endpoint\s+at\s+(.+?)\s+that\s+(\w+)\s+and\s+does\s*$',
+        re.IGNORECASE
+    ),
+    'async_api_endpoint': re.compile(
+        r'^create\s+(?:an\s+)?async\s+api\s+endpoint\s+at\s+(.+?)\s+that\s+(\w+)\s+and\s+returns\s+(.+)$',
+        re.IGNORECASE
+    ),
+    'async_api_endpoint_block': re.compile(
+        r'^create\s+(?:an\s+)?async\s+api\s+endpoint\s+at\s+(.+?)\s+that\s+(\w+)\s+and\s+does\s*$',
+        re.IGNORECASE
+    ),
+})
+
+_MAKERS = ('create', 'make', 'define')
+
+# Line patterns in the order they take priority, each tagged with the leading
+# words it can start with (None when it can start with anything) and the
+# method that renders it. Lines are only matched against the patterns for
+# their own first word, combined into a single regex per word.
+_LINE_PATTERNS = (
+    ('string_length_comparison', ('if',), '_line_string_length_comparison'),
+    ('async_api_endpoint', ('create',), '_line_async_api_endpoint'),
+    ('async_api_endpoint_block', ('create',), '_line_async_api_endpoint'),
+    ('api_endpoint', ('create',), '_line_api_endpoint'),
+    ('api_endpoint_block', ('create',), '_line_api_endpoint'),
+    ('print_numbers', ('print',), '_line_print_numbers'),
+    ('elif_then_do_block', ('elif', 'else'), '_line_elif_block'),
+    ('elif_do_block', ('elif', 'else'), '_line_elif_block'),
+    ('elif_then_inline', ('elif', 'else'), '_line_elif_inline'),
+    ('elif_do_inline', ('elif', 'else'), '_line_elif_inline'),
+    ('else_do_block', ('else', 'otherwise'), '_line_else_do_block'),
+    ('else_inline', ('else', 'otherwise'), '_line_else_inline'),
+    ('if_then_do_block', ('if',), '_line_if_block'),
+    ('if_do_block', ('if',), '_line_if_block'),
+    ('if_return', ('if',), '_line_if_return'),
+    ('if_then_inline', ('if',), '_line_if_inline'),
+    ('if_do_inline', ('if',), '_line_if_inline'),
+    ('for_each', ('for',), '_line_for_each'),
+    ('for_each_in', ('for',), '_line_for_each_in'),
+    ('repeat_times', ('repeat',), '_line_repeat_times'),
+    ('repeat_until', ('repeat',), '_line_repeat_until'),
+    ('repeat_while', ('repeat',), '_line_while'),
+    ('wait_sleep', ('wait', 'sleep', 'delay'), '_line_wait_sleep'),
+    ('while_do', ('while',), '_line_while'),
+    ('with_as', ('with',), '_line_with_as'),
+    ('with_simple', ('with',), '_line_with_simple'),
+    ('try_block', None, '_line_try_block'),
+    ('catch', ('catch',), '_line_catch'),
+    ('finally', None, '_line_finally'),
+    ('create_function', ('create', 'make', 'build'), '_line_function'),
+    ('define_function', ('define',), '_line_function'),
+    ('async_function', _MAKERS, '_line_async_function'),
+    ('generator', _MAKERS, '_line_generator'),
+    ('class_inheritance', _MAKERS, '_line_class_inheritance'),
+    ('create_class', _MAKERS, '_line_create_class'),
+    ('class_method', _MAKERS, '_line_class_method'),
+    ('static_method', _MAKERS, '_line_static_method'),
+    ('instance_method', _MAKERS, '_line_instance_method'),
+    ('property', ('create',), '_line_property'),
+    ('set_named', ('set', 'let', 'assign'), '_line_assign'),
+    ('let', ('let',), '_line_assign'),
+    ('set', ('set',), '_line_assign'),
+    ('increase', ('increase', 'increment'), '_line_increase'),
+    ('decrease', ('decrease', 'decrement', 'reduce'), '_line_decrease'),
+    ('create_variable_set', ('create',), '_line_create_variable_set'),
+    ('create_variable', ('create',), '_line_create_variable'),
+    ('append_to_list', ('add', 'append', 'push'), '_line_append_to_list'),
+    ('prepend_to_list', ('prepend',), '_line_prepend_to_list'),
+    ('remove_from_list', ('remove', 'delete'), '_line_remove_from_list'),
+    ('pop_from_list', ('pop',), '_line_pop_from_list'),
+    ('clear_list', ('clear', 'empty'), '_line_clear_list'),
+    ('sort_list', ('sort', 'order'), '_line_sort_list'),
+    ('reverse_list', ('reverse',), '_line_reverse_list'),
+    ('say_message', ('say', 'tell', 'announce'), '_line_say_message'),
+    ('log_message', ('log', 'logging', 'logger'), '_line_log_message'),
+    ('print', ('print', 'show', 'display', 'echo', 'log'), '_line_print'),
+    ('return', ('return', 'give', 'send'), '_line_return'),
+    ('await', ('await',), '_line_await'),
+    ('raise', ('raise',), '_line_raise'),
+    ('throw', ('throw',), '_line_raise'),
+    ('exit', ('exit', 'quit', 'stop'), '_line_exit'),
+    ('yield', ('yield',), '_line_yield'),
+    ('call_function', ('call', 'run', 'execute'), '_line_call_function'),
+    ('call_with', None, '_line_call_with'),
+    ('decorator', ('decorate',), '_line_decorator'),
+    ('list_comprehension', ('create',), '_line_list_comprehension'),
+    ('lambda', ('create',), '_line_lambda'),
+    ('connect_db', ('connect',), '_line_connect_db'),
+    ('query_db', ('query',), '_line_query_db'),
+    ('insert_db', ('insert',), '_line_insert_db'),
+)
+
+_LINE_WORDS = {
+    word: tuple(name for name, words, _ in _LINE_PATTERNS if words is None or word in words)
+    for word in {word for _, words, _ in _LINE_PATTERNS for word in words or ()}
+}
+_LINE_ANY_WORD = tuple(name for name, words, _ in _LINE_PATTERNS if words is None)
+_LINE_ALL = tuple(name for name, _, _ in _LINE_PATTERNS)
+
+# Inline statements (bodies written on the same line as their header) in the
+# order _parse_inline_action tries them, with the method that renders each.
+# The paren-less call check runs between the two groups.
+_INLINE_ACTIONS_BEFORE_CALL = (
+    ('print_numbers', '_inline_print_numbers'),
+    ('yield', '_inline_yield'),
+    ('for_each', '_inline_for_each'),
+    ('repeat_times', '_inline_repeat_times'),
+    ('repeat_until', '_inline_repeat_until'),
+    ('repeat_while', '_inline_while'),
+    ('wait_sleep', '_inline_wait_sleep'),
+    ('while_do', '_inline_while'),
+    ('if_return', '_inline_if_return'),
+    ('if_then_inline', '_inline_if'),
+    ('if_do_inline', '_inline_if'),
+    ('say_message', '_inline_say_message'),
+    ('log_message', '_inline_log_message'),
+)
+_INLINE_ACTIONS_AFTER_CALL = (
+    ('print', '_inline_print'),
+    ('return', '_inline_return'),
+    ('set_named', '_inline_set'),
+    ('let', '_inline_set'),
+    ('set', '_inline_set'),
+    ('increase', '_inline_increase'),
+    ('decrease', '_inline_decrease'),
+    ('create_variable_set', '_inline_create_variable_set'),
+    ('create_variable', '_inline_create_variable'),
+    ('append_to_list', '_inline_append_to_list'),
+    ('prepend_to_list', '_inline_prepend_to_list'),
+    ('remove_from_list', '_inline_remove_from_list'),
+    ('pop_from_list', '_inline_pop_from_list'),
+    ('clear_list', '_inline_clear_list'),
+    ('sort_list', '_inline_sort_list'),
+    ('reverse_list', '_inline_reverse_list'),
+    ('await', '_inline_await'),
+    ('raise', '_inline_raise'),
+    ('throw', '_inline_raise'),
+    ('exit', '_inline_exit'),
+    ('call_function', '_inline_call'),
+    ('call_with', '_inline_call'),
+)
+
+_LINE_PATTERN_WORDS = {name: words for name, words, _ in _LINE_PATTERNS}
+
+
+@lru_cache(maxsize=512)
+def _inline_candidates(actions: Tuple[Tuple[str, str], ...], word: str) -> Tuple[str, ...]:
+    """Return the names in ``actions`` whose pattern can match a statement starting with ``word``."""
+    if not word.isascii():
+        # Case-insensitive matching folds some non-ASCII letters onto ASCII
+        # keywords, so keep every pattern (see _line_patterns_for).
+        return tuple(name for name, _ in actions)
+    word = word.lower()
+    return tuple(
+        name for name, _ in actions
+        if _LINE_PATTERN_WORDS[name] is None or word in _LINE_PATTERN_WORDS[name]
+    )
+
+# Combined regexes per candidate pattern list, compiled on first use.
+_LINE_PATTERN_SETS: Dict[Tuple[str, ...], LinePatternSet] = {}
+
+# Statements that can follow a generator's "yields" as an inline action.
+_INLINE_ACTION_NAMES = (
+    'for_each',
+    'while_do',
+    'repeat_times',
+    'repeat_until',
+    'repeat_while',
+    'wait_sleep',
+    'if_return',
+    'if_then_inline',
+    'if_do_inline',
+    'yield',
+    'print_numbers',
+    'print',
+    'say_message',
+    'log_message',
+    'return',
+    'set_named',
+    'let',
+    'set',
+    'create_variable_set',
+    'create_variable',
+    'increase',
+    'decrease',
+    'append_to_list',
+    'prepend_to_list',
+    'remove_from_list',
+    'pop_from_list',
+    'clear_list',
+    'sort_list',
+    'reverse_list',
+    'call_function',
+    'call_with',
+    'dot_call',
+    'await',
+    'raise',
+    'throw',
+    'exit',
+)
+
+
+def _pattern_set(names: Tuple[str, ...]) -> LinePatternSet:
+    """Return the combined regex for ``names``, compiling it on first use."""
+    pattern_set = _LINE_PATTERN_SETS.get(names)
+    if pattern_set is None:
+        pattern_set = LinePatternSet([(name, _PATTERNS[name]) for name in names])
+        _LINE_PATTERN_SETS[names] = pattern_set
+    return pattern_set
+
+
+_API_PATTERNS = LinePatternSet([
+    (name, _PATTERNS[name])
+    for name in ('api_endpoint', 'api_endpoint_block', 'async_api_endpoint', 'async_api_endpoint_block')
+])
+
+
+# Conversion functions for the type groups of the 'as_type' expression pattern.
+_TYPE_COERCE = ('str', 'int', 'float', 'bool')
+
+# Phrase patterns tried in order by _parse_expression and _parse_condition.
+_EXPRESSION_PATTERNS = MappingProxyType({
+    # Same phrase as the 'call_function' statement, so share the compiled pattern.
+    'call': _PATTERNS['call_function'],
+    'value_of': re.compile(r'^(?:value|result)\s+of\s+(.+)$', re.IGNORECASE),
+    'ask': re.compile(r'^(?:ask|prompt|input)\s+(.+)$', re.IGNORECASE),
+    # One group per target type, in the order of _TYPE_COERCE. The type
+    # words end the phrase and never overlap, so at most one group can match.
+    'as_type': re.compile(
+        r'^(.+?)\s+(?:as|to)\s+'
+        r'(?:(string|text)|(integer|int|whole\s+number)|(float|decimal|number)|(boolean|bool))\s*$',
+        re.IGNORECASE
+    ),
+    'length_of': re.compile(r'^(?:length|len|size|count|number)\s+of\s+(.+)$', re.IGNORECASE),
+    'sum_of': re.compile(r'^(?:sum|total)\s+of\s+(.+)$', re.IGNORECASE),
+    'average_of': re.compile(r'^(?:average|mean)\s+of\s+(.+)$', re.IGNORECASE),
+    'min_of': re.compile(r'^(?:min|minimum)\s+of\s+(.+)$', re.IGNORECASE),
+    'max_of': re.compile(r'^(?:max|maximum)\s+of\s+(.+)$', re.IGNORECASE),
+    'uppercase': re.compile(r'^(?:uppercase|upper\s+case)\s+(?:of\s+)?(.+)$', re.IGNORECASE),
+    'lowercase': re.compile(r'^(?:lowercase|lower\s+case)\s+(?:of\s+)?(.+)$', re.IGNORECASE),
+    'title_case': re.compile(r'^(?:title\s+case)\s+(?:of\s+)?(.+)$', re.IGNORECASE),
+    'trim': re.compile(r'^(?:trim|strip)\s+(?:of\s+)?(.+)$', re.IGNORECASE),
+    'not_contains': re.compile(r'^(.+?)\s+does\s+not\s+contain\s+(.+)$', re.IGNORECASE),
+    'contains': re.compile(r'^(.+?)\s+contains\s+(.+)$', re.IGNORECASE),
+    'not_empty': re.compile(r'^(.+?)\s+is\s+not\s+empty$', re.IGNORECASE),
+    'empty': re.compile(r'^(.+?)\s+is\s+empty$', re.IGNORECASE),
+    'ends_with': re.compile(r'^(.+?)\s+ends\s+with\s+(.+)$', re.IGNORECASE),
+    'starts_with': re.compile(r'^(.+?)\s+starts\s+with\s+(.+)$', re.IGNORECASE),
+    'negative': re.compile(r'^(?:minus|negative)\s+(.+)$', re.IGNORECASE),
+    'subtract_from': re.compile(r'^subtract\s+(.+?)\s+from\s+(.+)$', re.IGNORECASE),
+    'add_to': re.compile(r'^add\s+(.+?)\s+to\s+(.+)$', re.IGNORECASE),
+    'add_and': re.compile(r'^add\s+(.+?)\s+and\s+(.+)$', re.IGNORECASE),
+    'plus': re.compile(r'^(.+?)\s+plus\s+(.+)$', re.IGNORECASE),
+    'minus': re.compile(r'^(.+?)\s+minus\s+(.+)$', re.IGNORECASE),
+    'times': re.compile(r'^(.+?)\s+(?:times|multiplied\s+by|multiply\s+by)\s+(.+)$', re.IGNORECASE),
+    'divided_by': re.compile(r'^(.+?)\s+(?:divided\s+by|over)\s+(.+)$', re.IGNORECASE),
+    'mod': re.compile(r'^(.+?)\s+(?:mod|modulo)\s+(.+)$', re.IGNORECASE),
+    'power': re.compile(r'^(.+?)\s+(?:to\s+the\s+power\s+of|power\s+of|powered\s+by)\s+(.+)$', re.IGNORECASE),
+    'call_literal': re.compile(r'^(\w+)\s*\(([^)]*)\)$'),
+})
+
+# Leading words of the expression patterns that start with a keyword. Such a
+# pattern can only match when the phrase's leading word is one of these.
+_EXPRESSION_LEADS = {
+    'call': ('call', 'run', 'execute'),
+    'value_of': ('value', 'result'),
+    'ask': ('ask', 'prompt', 'input'),
+    'length_of': ('length', 'len', 'size', 'count', 'number'),
+    'sum_of': ('sum', 'total'),
+    'average_of': ('average', 'mean'),
+    'min_of': ('min', 'minimum'),
+    'max_of': ('max', 'maximum'),
+    'uppercase': ('uppercase', 'upper'),
+    'lowercase': ('lowercase', 'lower'),
+    'title_case': ('title',),
+    'trim': ('trim', 'strip'),
+    'negative': ('minus', 'negative'),
+    'subtract_from': ('subtract',),
+    'add_to': ('add',),
+    'add_and': ('add',),
+}
+_EXPRESSION_LEAD_NAMES = {
+    word: frozenset(name for name, words in _EXPRESSION_LEADS.items() if word in words)
+    for words in _EXPRESSION_LEADS.values()
+    for word in words
+}
+_EXPRESSION_LEAD_ALL = frozenset(_EXPRESSION_LEADS)
+
+# Connecting words of the infix expression patterns. Each pattern needs one of
+# its words as a whole whitespace-separated token somewhere in the phrase.
+_EXPRESSION_CONNECTORS = {
+    'as_type': ('as', 'to'),
+    'not_contains': ('contain',),
+    'contains': ('contains',),
+    'not_empty': ('empty',),
+    'empty': ('empty',),
+    'ends_with': ('ends',),
+    'starts_with': ('starts',),
+    'plus': ('plus',),
+    'minus': ('minus',),
+    'times': ('times', 'multiplied', 'multiply'),
+    'divided_by': ('divided', 'over'),
+    'mod': ('mod', 'modulo'),
+    'power': ('power', 'powered'),
+}
+_EXPRESSION_CONNECTOR_NAMES = {
+    word: frozenset(name for name, words in _EXPRESSION_CONNECTORS.items() if word in words)
+    for words in _EXPRESSION_CONNECTORS.values()
+    for word in words
+}
+_EXPRESSION_CONNECTOR_WORDS = frozenset(_EXPRESSION_CONNECTOR_NAMES)
+_EXPRESSION_KEYWORD_ALL = _EXPRESSION_LEAD_ALL | frozenset(_EXPRESSION_CONNECTORS)
+
+_CONDITION_PATTERNS = MappingProxyType({
+    'not_empty': re.compile(r'^(.+?)\s+is\s+not\s+empty$', re.IGNORECASE),
+    'empty': re.compile(r'^(.+?)\s+is\s+empty$', re.IGNORECASE),
+    'not_contains': re.compile(r'^(.+?)\s+(?:does\s+not|doesn\'t)\s+contain\s+(.+)$', re.IGNORECASE),
+    'contains': re.compile(r'^(.+?)\s+contains\s+(.+)$', re.IGNORECASE),
+    'not_in': re.compile(r'^(.+?)\s+is\s+not\s+in\s+(.+)$', re.IGNORECASE),
+    'in': re.compile(r'^(.+?)\s+is\s+in\s+(.+)$', re.IGNORECASE),
+    'has': re.compile(r'^(.+?)\s+has\s+(.+)$', re.IGNORECASE),
+    'between': re.compile(r'^(.+?)\s+is\s+between\s+(.+?)\s+and\s+(.+)$', re.IGNORECASE),
+    'greater_or_equal': re.compile(r'^(.+?)\s+is\s+(?:greater|bigger|larger)\s+than\s+or\s+equal\s+to\s+(.+)$', re.IGNORECASE),
+    'at_least': re.compile(r'^(.+?)\s+is\s+at\s+least\s+(.+)$', re.IGNORECASE),
+    'no_less_than': re.compile(r'^(.+?)\s+is\s+no\s+less\s+than\s+(.+)$', re.IGNORECASE),
+    'less_or_equal': re.compile(r'^(.+?)\s+is\s+(?:less|smaller)\s+than\s+or\s+equal\s+to\s+(.+)$', re.IGNORECASE),
+    'at_most': re.compile(r'^(.+?)\s+is\s+at\s+most\s+(.+)$', re.IGNORECASE),
+    'no_more_than': re.compile(r'^(.+?)\s+is\s+no\s+more\s+than\s+(.+)$', re.IGNORECASE),
+    'not_equal': re.compile(r'^(.+?)\s+is\s+not\s+equal\s+to\s+(.+)$', re.IGNORECASE),
+    'does_not_equal': re.compile(r'^(.+?)\s+does\s+not\s+equal\s+(.+)$', re.IGNORECASE),
+    'equal_to': re.compile(r'^(.+?)\s+is\s+equal\s+to\s+(.+)$', re.IGNORECASE),
+    'equals': re.compile(r'^(.+?)\s+equals\s+(.+)$', re.IGNORECASE),
+    'same_as': re.compile(r'^(.+?)\s+is\s+the\s+same\s+as\s+(.+)$', re.IGNORECASE),
+    'ends_with': re.compile(r'^(.+?)\s+ends\s+with\s+(.+)$', re.IGNORECASE),
+    'starts_with': re.compile(r'^(.+?)\s+starts\s+with\s+(.+)$', re.IGNORECASE),
+    'greater': re.compile(r'^(.+?)\s+is\s+(greater|bigger|larger)\s+than\s+(.+)$', re.IGNORECASE),
+    'less': re.compile(r'^(.+?)\s+is\s+(less|smaller)\s+than\s+(.+)$', re.IGNORECASE),
+    'is_not': re.compile(r'^(.+?)\s+is\s+not\s+(.+)$', re.IGNORECASE),
+    'is': re.compile(r'^(.+?)\s+is\s+(.+)$', re.IGNORECASE),
+})
+
+# _parse_condition tries the membership checks before splitting compound
+# conditions on "or"/"and", and the comparisons after, each in this order.
+_CONDITION_CHECKS = ('not_empty', 'empty', 'not_contains', 'contains', 'not_in', 'in', 'has')
+_CONDITION_COMPARISONS = (
+    'between', 'greater_or_equal', 'at_least', 'no_less_than', 'less_or_equal', 'at_most',
+    'no_more_than', 'not_equal', 'does_not_equal', 'equal_to', 'equals', 'same_as',
+    'ends_with', 'starts_with', 'greater', 'less', 'is_not', 'is',
+)
+
+# Words each condition pattern needs as whitespace-separated tokens. A
+# pattern is only tried when all of them occur in the condition.
+_CONDITION_WORDS = {
+    'not_empty': frozenset({'is', 'not', 'empty'}),
+    'empty': frozenset({'is', 'empty'}),
+    'not_contains': frozenset({'contain'}),
+    'contains': frozenset({'contains'}),
+    'not_in': frozenset({'is', 'not', 'in'}),
+    'in': frozenset({'is', 'in'}),
+    'has': frozenset({'has'}),
+    'between': frozenset({'is', 'between', 'and'}),
+    'greater_or_equal': frozenset({'is', 'than', 'or', 'equal', 'to'}),
+    'at_least': frozenset({'is', 'at', 'least'}),
+    'no_less_than': frozenset({'is', 'no', 'less', 'than'}),
+    'less_or_equal': frozenset({'is', 'than', 'or', 'equal', 'to'}),
+    'at_most': frozenset({'is', 'at', 'most'}),
+    'no_more_than': frozenset({'is', 'no', 'more', 'than'}),
+    'not_equal': frozenset({'is', 'not', 'equal', 'to'}),
+    'does_not_equal': frozenset({'does', 'not', 'equal'}),
+    'equal_to': frozenset({'is', 'equal', 'to'}),
+    'equals': frozenset({'equals'}),
+    'same_as': frozenset({'is', 'the', 'same', 'as'}),
+    'ends_with': frozenset({'ends', 'with'}),
+    'starts_with': frozenset({'starts', 'with'}),
+    'greater': frozenset({'is', 'than'}),
+    'less': frozenset({'is', 'than'}),
+    'is_not': frozenset({'is', 'not'}),
+    'is': frozenset({'is'}),
+}
+
+# Output for the two-operand conditions that only need both sides parsed.
+_CONDITION_FORMATS = {
+    'not_contains': '{right} not in {left}',
+    'contains': '{right} in {left}',
+    'not_in': '{left} not in {right}',
+    'in': '{left} in {right}',
+    'has': '{right} in {left}',
+    'greater_or_equal': '{left} >= {right}',
+    'at_least': '{left} >= {right}',
+    'no_less_than': '{left} >= {right}',
+    'less_or_equal': '{left} <= {right}',
+    'at_most': '{left} <= {right}',
+    'no_more_than': '{left} <= {right}',
+    'not_equal': '{left} != {right}',
+    'does_not_equal': '{left} != {right}',
+    'equal_to': '{left} == {right}',
+    'equals': '{left} == {right}',
+    'same_as': '{left} == {right}',
+    'is_not': '{left} != {right}',
+}
+
+# Connectives _parse_condition splits compound conditions on; "between X and
+# Y" is protected from the "and" split first.
+_OR_SEPARATOR = re.compile(r'\s+or\s+', re.IGNORECASE)
+_AND_SEPARATOR = re.compile(r'\s+and\s+', re.IGNORECASE)
+_BETWEEN_AND = re.compile(r'(\bbetween\b[^\n]+?)\s+and\s+', re.IGNORECASE)
+
+# Parameter and argument lists.
+_NUMBERED_PARAMS = re.compile(r'^(?:the\s+)?(\w+)\s+numbers?$', re.IGNORECASE)
+_PARAM_SEPARATOR = re.compile(r'\s+and\s+|,')
+_KEYWORD_ARGUMENT = re.compile(r'^(.+?)\s+(?:as|equals|=|to)\s+(.+)$', re.IGNORECASE)
+
+# "their sum", "the total", "sum of them", ... over a function's parameters.
+_SUM_PHRASE = re.compile(
+    r'^(?:(?:their|the)\s+sum\b|(?:their|the)\s+total\b|sum\s+of\s+them\b|sum\s+of\s+their\b|total\s+of\s+them\b)'
+)
+
+_LIST_WORD = re.compile(r'\blist\b')
+_DICTIONARY_WORD = re.compile(r'\b(dictionary|dict|map)\b')
+_ROUTE_PARAM = re.compile(r"<(?:[^:<>]+:)?([^<>]+)>")
 
 
 class EnhancedTranspiler:
@@ -44,267 +1024,45 @@ class EnhancedTranspiler:
 
     def __init__(self):
         """Initialize the enhanced transpiler."""
-        self._library_patterns = {
-            'json': [r'\bjson\.', r'json\.loads', r'json\.dumps', r'json\.load', r'json\.dump'],
-            'os': [r'\bos\.', r'os\.path', r'os\.getenv', r'os\.environ', r'os\.system'],
-            'sys': [
-                r'\bsys\.',
-                r'sys\.argv',
-                r'sys\.exit',
-                r'sys\.path',
-                r'\bexit\b',
-                r'\bquit\b',
-                r'\bstop\s+program\b',
-            ],
-            'datetime': [r'\bdatetime\.', r'datetime\.now', r'from datetime', r'datetime\.today'],
-            'time': [
-                r'\btime\.',
-                r'time\.sleep',
-                r'time\.time',
-                r'\bwait\b',
-                r'\bsleep\b',
-                r'\bdelay\b',
-            ],
-            'csv': [r'\bcsv\.', r'csv\.reader', r'csv\.writer', r'csv\.DictReader'],
-            're': [r'\bre\.', r're\.search', r're\.match', r're\.findall'],
-            'logging': [
-                r'\blogging\.',
-                r'logging\.info',
-                r'logging\.error',
-                r'logging\.debug',
-                r'\blog\s+(?:debug|info|warning|error|critical)\b',
-                r'\blogging\s+(?:debug|info|warning|error|critical)\b',
-                r'\blogger\s+(?:debug|info|warning|error|critical)\b',
-            ],
-            'pathlib': [r'\bpathlib\.', r'Path\(', r'from pathlib'],
-            'collections': [r'\bcollections\.', r'from collections'],
-            'itertools': [r'\bitertools\.', r'from itertools'],
-            'functools': [r'\bfunctools\.', r'from functools'],
-            'asyncio': [r'\basyncio\.', r'async def', r'await ', r'from asyncio', r'async function'],
-            'threading': [r'\bthreading\.', r'Thread\(', r'from threading'],
-            'multiprocessing': [r'\bmultiprocessing\.', r'Process\(', r'from multiprocessing'],
-            'sqlite3': [r'\bsqlite3\.', r'sqlite3\.connect', r'from sqlite3'],
-            'urllib': [r'\burllib\.', r'urllib\.request', r'urllib\.parse'],
-            'http': [r'\bhttp\.', r'http\.server', r'http\.client'],
-            'email': [r'\bemail\.', r'from email'],
-            'hashlib': [r'\bhashlib\.', r'hashlib\.md5', r'hashlib\.sha256'],
-            'base64': [r'\bbase64\.', r'base64\.encode', r'base64\.decode'],
-            'uuid': [r'\buuid\.', r'uuid\.uuid4', r'from uuid'],
-            'random': [r'\brandom\.', r'random\.choice', r'random\.randint'],
-            'math': [r'\bmath\.', r'math\.sqrt', r'math\.pi'],
-            'statistics': [r'\bstatistics\.', r'from statistics'],
-            'flask': [r'\bflask\.', r'from flask', r'Flask\(', r'@app\.route', r'jsonify\('],
-            'django': [r'\bdjango\.', r'from django', r'Django', r'@csrf_exempt'],
-            'fastapi': [r'\bfastapi\.', r'from fastapi', r'FastAPI\(', r'@app\.'],
-            'tornado': [r'\btornado\.', r'from tornado'],
-            'aiohttp': [r'\baiohttp\.', r'from aiohttp'],
-            'requests': [r'\brequests\.', r'requests\.get', r'requests\.post', r'from requests'],
-            'httpx': [r'\bhttpx\.', r'from httpx'],
-            'urllib3': [r'\burllib3\.', r'from urllib3'],
-            'sqlalchemy': [r'\bsqlalchemy\.', r'from sqlalchemy', r'SQLAlchemy', r'Base = declarative_base'],
-            'psycopg2': [r'\bpsycopg2\.', r'from psycopg2'],
-            'pymongo': [r'\bpymongo\.', r'from pymongo', r'MongoClient'],
-            'redis': [r'\bredis\.', r'from redis', r'Redis\('],
-            'pymysql': [r'\bpymysql\.', r'from pymysql'],
-            'pandas': [r'\bpandas\.', r'import pandas', r'pd\.', r'DataFrame', r'Series'],
-            'numpy': [r'\bnumpy\.', r'import numpy', r'np\.', r'array\(', r'ndarray'],
-            'matplotlib': [r'\bmatplotlib\.', r'from matplotlib', r'plt\.', r'pyplot'],
-            'seaborn': [r'\bseaborn\.', r'from seaborn', r'sns\.'],
-            'scipy': [r'\bscipy\.', r'from scipy'],
-            'sklearn': [r'\bsklearn\.', r'from sklearn', r'scikit-learn'],
-            'unittest': [r'\bunittest\.', r'from unittest', r'TestCase', r'@unittest'],
-            'pytest': [r'\bpytest\.', r'from pytest', r'@pytest', r'def test_'],
-            'mock': [r'\bmock\.', r'from mock', r'@patch'],
-            'click': [r'\bclick\.', r'from click', r'@click'],
-            'typing': [r'\btyping\.', r'from typing', r'List\[', r'Dict\[', r'Optional\[', r'Union\['],
-            'dataclasses': [r'\bdataclasses\.', r'from dataclasses', r'@dataclass'],
-            'enum': [r'\benum\.', r'from enum', r'Enum'],
-            'pydantic': [r'\bpydantic\.', r'from pydantic', r'BaseModel'],
-            'configparser': [r'\bconfigparser\.', r'from configparser'],
-            'yaml': [r'\byaml\.', r'import yaml', r'yaml\.load'],
-            'toml': [r'\btoml\.', r'from toml'],
-            'dotenv': [r'\bdotenv\.', r'from dotenv', r'load_dotenv'],
-        }
-
-        self._patterns = {
-            'create_function': re.compile(
-                r'^(?:create|make|build)\s+(?:a\s+)?function\s+(?:named|called)\s+(.+?)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
-                re.IGNORECASE
-            ),
-            'define_function': re.compile(
-                r'^define\s+(?:a\s+)?function\s+(?:named|called)\s+(.+?)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
-                re.IGNORECASE
-            ),
-
-            'let': re.compile(r'^let\s+(\w+)\s+be\s+(.+)$', re.IGNORECASE),
-            'set': re.compile(r'^set\s+(\w+)\s+to\s+(.+)$', re.IGNORECASE),
-            'set_named': re.compile(
-                r'^(?:set|let|assign)\s+(?:the\s+)?(.+?)\s+(?:to|as|be|equal\s+to)\s+(.+)$',
-                re.IGNORECASE
-            ),
-            'create_variable': re.compile(
-                r'^create\s+(?:a\s+)?(?:variable|list|dictionary|dict|map)\s+(?:named|called)\s+(.+?)(?:\s+with\s+(.+))?$',
-                re.IGNORECASE
-            ),
-            'create_variable_set': re.compile(
-                r'^create\s+(?:a\s+)?(?:variable|list|dictionary|dict|map)\s+(?:named|called)\s+(.+?)\s+set\s+to\s+(.+)$',
-                re.IGNORECASE
-            ),
-            'increase': re.compile(r'^(?:increase|increment)\s+(.+?)\s+by\s+(.+)$', re.IGNORECASE),
-            'decrease': re.compile(r'^(?:decrease|decrement|reduce)\s+(.+?)\s+by\s+(.+)$', re.IGNORECASE),
-
-            'if_then_do_block': re.compile(r'^if\s+(.+?)\s+then\s+do\s*$', re.IGNORECASE),
-            'if_do_block': re.compile(r'^if\s+(.+?)\s+do\s*$', re.IGNORECASE),
-            'if_then_inline': re.compile(r'^if\s+(.+?)\s+then\s+(.+)$', re.IGNORECASE),
-            'if_do_inline': re.compile(r'^if\s+(.+?)\s+do\s+(.+)$', re.IGNORECASE),
-            'if_return': re.compile(r'^if\s+(.+?)\s+return\s+(.+)$', re.IGNORECASE),
-            'elif_then_do_block': re.compile(r'^(?:elif|else\s+if)\s+(.+?)\s+then\s+do\s*$', re.IGNORECASE),
-            'elif_do_block': re.compile(r'^(?:elif|else\s+if)\s+(.+?)\s+do\s*$', re.IGNORECASE),
-            'elif_then_inline': re.compile(r'^(?:elif|else\s+if)\s+(.+?)\s+then\s+(.+)$', re.IGNORECASE),
-            'elif_do_inline': re.compile(r'^(?:elif|else\s+if)\s+(.+?)\s+do\s+(.+)$', re.IGNORECASE),
-            'else_do_block': re.compile(r'^(?:else|otherwise)\s+do\s*$', re.IGNORECASE),
-            'else_inline': re.compile(r'^(?:else|otherwise)\s*,?\s+(.+)$', re.IGNORECASE),
-
-            'for_each': re.compile(
-                r'^for\s+each\s+(\w+)\s+in\s+(.+?)\s+do\s*(.*)$',
-                re.IGNORECASE | re.DOTALL
-            ),
-            'for_each_in': re.compile(r'^for\s+each\s+(\w+)\s+in\s+(.+)$', re.IGNORECASE),
-            'while_do': re.compile(r'^while\s+(.+?)\s+do\s*(.*)$', re.IGNORECASE),
-            'repeat_times': re.compile(r'^repeat\s+(.+?)\s+times\s+do\s*(.*)$', re.IGNORECASE),
-            'repeat_until': re.compile(r'^repeat\s+until\s+(.+?)\s+do\s*(.*)$', re.IGNORECASE),
-            'repeat_while': re.compile(r'^repeat\s+while\s+(.+?)\s+do\s*(.*)$', re.IGNORECASE),
-            'wait_sleep': re.compile(
-                r'^(?:wait|sleep|delay)\s+(?:for\s+)?(.+?)(?:\s+(seconds?|minutes?|hours?|ms|milliseconds?))?$',
-                re.IGNORECASE
-            ),
-
-            'print_numbers': re.compile(r'^print\s+numbers\s+from\s+(.+?)\s+to\s+(.+)$', re.IGNORECASE),
-            'print': re.compile(r'^(?:print|show|display|echo|log)\s+(.+)$', re.IGNORECASE),
-            'say_message': re.compile(r'^(?:say|tell|announce)\s+(.+)$', re.IGNORECASE),
-            'log_message': re.compile(
-                r'^(?:log|logging|logger)\s+(debug|info|warning|error|critical)\s+(.+)$',
-                re.IGNORECASE
-            ),
-
-            'return': re.compile(r'^(?:return|give\s+back|send\s+back)\s+(.+)$', re.IGNORECASE),
-
-            'call_function': re.compile(r'^(?:call|run|execute)\s+(.+?)(?:\s+with\s+(.+))?$', re.IGNORECASE),
-            'call_with': re.compile(
-                r'^([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)\s+(?:with|using)\s+(.+)$',
-                re.IGNORECASE
-            ),
-            'dot_call': re.compile(r'^([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+)\s+(.+)$', re.IGNORECASE),
-
-            'class_inheritance': re.compile(
-                r'^(?:create|make|define)\s+(?:a\s+)?class\s+(?:named|called)\s+(.+?)\s+that\s+(?:extends|inherits\s+from)\s+(.+)$',
-                re.IGNORECASE
-            ),
-            'create_class': re.compile(
-                r'^(?:create|make|define)\s+(?:a\s+)?class\s+(?:named|called)\s+(.+?)\s*$',
-                re.IGNORECASE
-            ),
-
-            'string_length_comparison': re.compile(
-                r'^if\s+the\s+length\s+of\s+string\s+(\w+)\s+is\s+'
-                r'(bigger|greater|longer|smaller|less|shorter|equal|same)\s+than\s+string\s+(\w+)'
-                r'(?:\s*,?\s*then\s*)?\s*return\s+(.+)$',
-                re.IGNORECASE
-            ),
-
-            'try_block': re.compile(r'^try\s*(?::\s*)?(?:do\s*)?$', re.IGNORECASE),
-            'catch': re.compile(
-                r'^catch\s+(?:exception|error)?(?:\s+as\s+(\w+))?\s*:?\s*(?:do\s*(.*))?$',
-                re.IGNORECASE
-            ),
-            'finally': re.compile(r'^finally\s*:?\s*(?:do\s*(.*))?$', re.IGNORECASE),
-            'raise': re.compile(r'^raise\s+(.+)$', re.IGNORECASE),
-            'throw': re.compile(r'^throw\s+(.+)$', re.IGNORECASE),
-            'exit': re.compile(
-                r'^(?:exit|quit|stop)(?:\s+program|\s+app|\s+script)?(?:\s+(?:with\s+code\s+)?(.+))?$',
-                re.IGNORECASE
-            ),
-
-            'async_function': re.compile(
-                r'^(?:create|make|define)\s+(?:an\s+)?async\s+function\s+(?:named|called)\s+(.+?)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
-                re.IGNORECASE
-            ),
-            'await': re.compile(r'^await\s+(.+)$', re.IGNORECASE),
-
-            'class_method': re.compile(
-                r'^(?:create|make|define)\s+(?:a\s+)?class\s+method\s+(?:named|called)\s+(\w+)\s+in\s+class\s+(\w+)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
-                re.IGNORECASE
-            ),
-            'instance_method': re.compile(
-                r'^(?:create|make|define)\s+(?:a\s+)?method\s+(?:named|called)\s+(\w+)\s+in\s+class\s+(\w+)\s+that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
-                re.IGNORECASE
-            ),
-            'static_method': re.compile(
-                r'^(?:create|make|define)\s+(?:a\s+)?static\s+method\s+(?:named|called)\s+(\w+)\s+(?:in\s+class\s+(\w+)\s+)?that\s+takes\s+(.+?)\s+and\s+(returns|does)\s*(.*)$',
-                re.IGNORECASE
-            ),
-            'property': re.compile(
-                r'^create\s+(?:a\s+)?property\s+named\s+(\w+)\s+(?:in\s+class\s+(\w+)\s+)?that\s+returns\s+(.+)$',
-                re.IGNORECASE
-            ),
-
-            'decorator': re.compile(r'^decorate\s+(\w+)\s+with\s+(.+)$', re.IGNORECASE),
-
-            'with_as': re.compile(r'^with\s+(.+?)\s+as\s+(\w+)\s+do\s*(.*)$', re.IGNORECASE),
-            'with_simple': re.compile(r'^with\s+(.+?)\s+do\s*(.*)$', re.IGNORECASE),
-
-            'generator': re.compile(
-                r'^(?:create|make|define)\s+(?:a\s+)?generator\s+(?:named|called)\s+(.+?)\s+that\s+takes\s+(.+?)\s+and\s+yields\s*(.*)$',
-                re.IGNORECASE
-            ),
-            'yield': re.compile(r'^yield\s+(.+)$', re.IGNORECASE),
-            'append_to_list': re.compile(r'^(?:add|append|push)\s+(.+?)\s+to\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
-            'prepend_to_list': re.compile(r'^prepend\s+(.+?)\s+to\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
-            'remove_from_list': re.compile(r'^(?:remove|delete)\s+(.+?)\s+from\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
-            'pop_from_list': re.compile(r'^pop\s+(?:from\s+)?(.+)$', re.IGNORECASE),
-            'clear_list': re.compile(r'^(?:clear|empty)\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
-            'sort_list': re.compile(r'^(?:sort|order)\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
-            'reverse_list': re.compile(r'^(?:reverse)\s+(?:the\s+)?(?:list\s+)?(.+)$', re.IGNORECASE),
-
-            'connect_db': re.compile(r'^connect\s+to\s+database\s+(.+)$', re.IGNORECASE),
-            'query_db': re.compile(r'^query\s+database\s+with\s+(.+)$', re.IGNORECASE),
-            'insert_db': re.compile(r'^insert\s+into\s+database\s+(.+)$', re.IGNORECASE),
-
-            'type_hint': re.compile(r'^(\w+)\s*:\s*(.+)$', re.IGNORECASE),
-
-            'list_comprehension': re.compile(
-                r'^create\s+(?:a\s+)?list\s+of\s+(.+?)\s+for\s+each\s+(\w+)\s+in\s+(.+?)(?:\s+if\s+(.+))?$',
-                re.IGNORECASE
-            ),
-
-            'lambda': re.compile(
-                r'^create\s+(?:a\s+)?lambda\s+function\s+that\s+takes\s+(.+?)\s+and\s+returns\s+(.+)$',
-                re.IGNORECASE
-            ),
-
-            'api_endpoint': re.compile(
-                r'^create\s+(?:an\s+)?api\s+endpoint\s+at\s+(.+?)\s+that\s+(\w+)\s+and\s+returns\s+(.+)$',
-                re.IGNORECASE
-            ),
-            'api_endpoint_block': re.compile(
-                r'^create\s+(?:an\s+)?api\s+endpoint\s+at\s+(.+?)\s+that\s+(\w+)\s+and\s+does\s*$',
-                re.IGNORECASE
-            ),
-            'async_api_endpoint': re.compile(
-                r'^create\s+(?:an\s+)?async\s+api\s+endpoint\s+at\s+(.+?)\s+that\s+(\w+)\s+and\s+returns\s+(.+)$',
-                re.IGNORECASE
-            ),
-            'async_api_endpoint_block': re.compile(
-                r'^create\s+(?:an\s+)?async\s+api\s+endpoint\s+at\s+(.+?)\s+that\s+(\w+)\s+and\s+does\s*$',
-                re.IGNORECASE
-            ),
+        self._library_patterns = _LIBRARY_PATTERNS
+        self._library_regexes = _LIBRARY_REGEXES
+        self._patterns = _PATTERNS
+        self._line_handlers = {name: getattr(self, handler) for name, _, handler in _LINE_PATTERNS}
+        self._inline_handlers = {
+            name: getattr(self, handler)
+            for name, handler in _INLINE_ACTIONS_BEFORE_CALL + _INLINE_ACTIONS_AFTER_CALL
         }
+        # Results of lines that depend only on their text and the enclosing
+        # function's parameters, reused across lines and transpile calls.
+        self._line_cache: "OrderedDict[Tuple[str, Optional[Tuple[str, ...]]], TranspileResult]" = OrderedDict()
+        # Parsed expressions, conditions and values. Small sub-phrases such as
+        # names and literals recur throughout a program and the parsers are
+        # recursive, so the same input is often parsed many times.
+        self._expression_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._condition_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._value_cache: "OrderedDict[Tuple[str, Optional[Tuple[str, ...]]], str]" = OrderedDict()
+        # Parameter names per parameter phrase and parsed arguments per
+        # argument phrase, kept as tuples so callers always get a fresh list.
+        self._parameter_cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._argument_cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        # Route literal, route parameters and endpoint name stem per API path.
+        self._route_cache: "OrderedDict[str, Tuple[str, Tuple[str, ...], str]]" = OrderedDict()
 
         self.last_mapping: Dict[int, SourceLine] = {}
         self.last_source_lines: List[str] = []
 
-    def transpile(self, plain_text: str, with_mapping: bool = False) -> Union[str, Tuple[str, Dict[int, SourceLine]]]:
-        """Convert natural English to Python code."""
+    def transpile(
+        self,
+        plain_text: str,
+        with_mapping: bool = False,
+        auto_imports: bool = True,
+    ) -> Union[str, Tuple[str, Dict[int, SourceLine]]]:
+        """Convert natural English to Python code.
+
+        With ``auto_imports=False`` the import header and the Flask app
+        scaffolding are left out, and the source is not scanned for the
+        libraries and features they would need.
+        """
         if not plain_text.strip():
             raise ValueError("Input is empty.")
 
@@ -316,27 +1074,41 @@ class EnhancedTranspiler:
             raise ValueError("Input is empty.")
 
         indent_unit = self._infer_indent_unit(lines)
-        features = self._detect_features(lines)
-
-        all_code = '\n'.join(line.content for line in lines)
-        detected_libraries = self._detect_libraries(all_code, features)
-
-        imports = self._generate_imports(detected_libraries, features)
+        if auto_imports:
+            features = self._detect_features(lines)
+            detected_libraries = self._detect_libraries(lines, features)
+            imports = self._generate_imports(detected_libraries, features)
+        else:
+            features = {}
+            imports = []
+
+        # Output is streamed into one buffer rather than kept as a list of
+        # line strings; each line is preceded by a newline unless it is the
+        # first. mapping holds, per emitted line, the index of its source
+        # line in ``lines`` or -1 for generated lines.
+        buffer = io.StringIO()
+        write = buffer.write
+        mapping = array('i')
+
+        def emit_generated(text: str) -> None:
+            if mapping:
+                write('\n')
+            write(text)
+            mapping.append(-1)
 
-        python_lines: List[str] = []
-        mapping: List[Optional[SourceLine]] = []
         if imports:
-            python_lines.extend(imports)
-            python_lines.append('')
-            mapping.extend([None] * (len(imports) + 1))
+            for statement in imports:
+                emit_generated(statement)
+            emit_generated('')
 
         if features.get('flask_app'):
-            python_lines.append('app = Flask(__name__, root_path=os.getcwd())')
-            python_lines.append('')
-            mapping.extend([None, None])
+            emit_generated('app = Flask(__name__, root_path=os.getcwd())')
+            emit_generated('')
 
         stack: List[Block] = []
-        endpoint_names: Set[str] = set()
+        # Endpoint function names used so far, each mapped to the next
+        # numeric suffix to try when the name comes up again as a base.
+        endpoint_names: Dict[str, int] = {}
 
         i = 0
         while i < len(lines):
@@ -347,31 +1119,45 @@ class EnhancedTranspiler:
 
             result = self._transpile_line(line, lines, i, indent_unit, stack, endpoint_names)
 
-            for out in result.lines:
-                python_lines.append(' ' * (line.indent + out.indent_offset * indent_unit) + out.text)
-                mapping.append(line)
+            for offset, text in result.lines:
+                width = line.indent + offset * indent_unit
+                if mapping:
+                    write('\n')
+                write(_INDENTS[width] if width < len(_INDENTS) else ' ' * width)
+                write(text)
+                mapping.append(i)
 
             if result.opens_block:
-                block_type = result.block_type or "block"
+                block_type = result.block_type or BlockType.BLOCK
+                if block_type is BlockType.DEF:
+                    # Stored as a tuple so it can key the line cache as is.
+                    function_params = None if result.block_params is None else tuple(result.block_params)
+                else:
+                    function_params = stack[-1].function_params if stack else None
+                if block_type is BlockType.CLASS:
+                    class_name = result.block_name
+                else:
+                    class_name = stack[-1].class_name if stack else None
                 stack.append(
                     Block(
                         indent=line.indent,
                         block_type=block_type,
                         name=result.block_name,
                         params=result.block_params,
+                        function_params=function_params,
+                        class_name=class_name,
                     )
                 )
 
             i += result.consumed
 
         if features.get('flask_app') and features.get('flask_run', True):
-            python_lines.append('')
-            python_lines.append('if __name__ == "__main__":')
-            python_lines.append(' ' * indent_unit + 'app.run(debug=True, port=5000)')
-            mapping.extend([None, None, None])
+            emit_generated('')
+            emit_generated('if __name__ == "__main__":')
+            emit_generated(' ' * indent_unit + 'app.run(debug=True, port=5000)')
 
-        python_code = '\n'.join(python_lines)
-        mapping_dict = {idx + 1: src for idx, src in enumerate(mapping) if src is not None}
+        python_code = buffer.getvalue()
+        mapping_dict = {idx + 1: lines[src] for idx, src in enumerate(mapping) if src >= 0}
         self.last_mapping = mapping_dict
 
         if with_mapping:
@@ -385,684 +1171,477 @@ class EnhancedTranspiler:
         index: int,
         indent_unit: int,
         stack: List[Block],
-        endpoint_names: Set[str],
+        endpoint_names: Dict[str, int],
     ) -> TranspileResult:
         """Transpile a single line or multi-line structure."""
         text = line.content.strip()
-        current_function_params = self._current_function_params(stack)
-
-        match = self._patterns['string_length_comparison'].match(text)
-        if match:
-            left = match.group(1)
-            op_word = match.group(2)
-            right = match.group(3)
-            return_value = match.group(4)
-
-            op_map = {
-                'bigger': '>', 'greater': '>', 'longer': '>',
-                'smaller': '<', 'less': '<', 'shorter': '<',
-                'equal': '==', 'same': '=='
-            }
-            op = op_map.get(op_word.lower(), '>')
-
-            otherwise_value = None
-            consumed = 1
-            if index + 1 < len(all_lines):
-                next_line = all_lines[index + 1].content.strip()
-                otherwise_match = self._patterns['else_inline'].match(next_line)
-                if otherwise_match:
-                    otherwise_value = otherwise_match.group(1).strip()
-                    consumed = 2
-
-            lines = [
-                OutputLine(0, f"def program({left}, {right}):"),
-                OutputLine(1, f"if len({left}) {op} len({right}):"),
-                OutputLine(2, f"return {self._parse_value(return_value)}"),
-            ]
-            if otherwise_value is not None:
-                lines.append(OutputLine(1, "else:"))
-                lines.append(OutputLine(2, f"return {self._parse_value(otherwise_value)}"))
-            return TranspileResult(lines=lines, consumed=consumed)
-
-        match = self._patterns['async_api_endpoint'].match(text)
-        if match:
-            return self._render_api_endpoint(
-                match.group(1),
-                match.group(2),
-                match.group(3),
-                async_def=True,
-                all_lines=all_lines,
-                index=index,
-                current_indent=line.indent,
-                endpoint_names=endpoint_names,
-            )
-
-        match = self._patterns['async_api_endpoint_block'].match(text)
-        if match:
-            return self._render_api_endpoint(
-                match.group(1),
-                match.group(2),
-                None,
-                async_def=True,
-                all_lines=all_lines,
-                index=index,
-                current_indent=line.indent,
-                endpoint_names=endpoint_names,
-            )
-
-        match = self._patterns['api_endpoint'].match(text)
-        if match:
-            return self._render_api_endpoint(
-                match.group(1),
-                match.group(2),
-                match.group(3),
-                async_def=False,
-                all_lines=all_lines,
-                index=index,
-                current_indent=line.indent,
-                endpoint_names=endpoint_names,
-            )
-
-        match = self._patterns['api_endpoint_block'].match(text)
-        if match:
-            return self._render_api_endpoint(
-                match.group(1),
-                match.group(2),
-                None,
-                async_def=False,
-                all_lines=all_lines,
-                index=index,
-                current_indent=line.indent,
-                endpoint_names=endpoint_names,
-            )
-
-        match = self._patterns['print_numbers'].match(text)
-        if match:
-            return TranspileResult(lines=self._render_range_print(match.group(1), match.group(2)))
-
-        match = self._patterns['elif_then_do_block'].match(text) or self._patterns['elif_do_block'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            return self._render_block_header(
-                f"elif {condition}:",
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['elif_then_inline'].match(text) or self._patterns['elif_do_inline'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            return self._render_inline_block(
-                f"elif {condition}:",
-                match.group(2),
-                current_params=current_function_params,
-            )
-
-        match = self._patterns['else_do_block'].match(text)
-        if match:
-            return self._render_block_header("else:", all_lines, index, line.indent)
-
-        match = self._patterns['else_inline'].match(text)
-        if match:
-            return self._render_inline_block("else:", match.group(1), current_params=current_function_params)
-
-        match = self._patterns['if_then_do_block'].match(text) or self._patterns['if_do_block'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            return self._render_block_header(
-                f"if {condition}:",
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['if_return'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            return_value = self._parse_value(match.group(2), current_params=current_function_params)
-            return self._render_inline_block(
-                f"if {condition}:",
-                f"return {return_value}",
-                current_params=current_function_params,
-            )
-
-        match = self._patterns['if_then_inline'].match(text) or self._patterns['if_do_inline'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            return self._render_inline_block(
-                f"if {condition}:",
-                match.group(2),
-                current_params=current_function_params,
-            )
-
-        match = self._patterns['for_each'].match(text)
-        if match:
-            var = match.group(1)
-            iterable = self._parse_expression(match.group(2))
-            action = match.group(3).strip()
-            if action:
-                return self._render_inline_block(
-                    f"for {var} in {iterable}:",
-                    action,
-                    current_params=current_function_params,
-                )
-            return self._render_block_header(
-                f"for {var} in {iterable}:",
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['for_each_in'].match(text)
-        if match:
-            var = match.group(1)
-            iterable = self._parse_expression(match.group(2))
-            return self._render_block_header(
-                f"for {var} in {iterable}:",
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['repeat_times'].match(text)
-        if match:
-            count_expr = self._parse_expression(match.group(1))
-            action = match.group(2).strip()
-            header = f"for _ in range({count_expr}):"
-            if action:
-                return self._render_inline_block(header, action, current_params=current_function_params)
-            return self._render_block_header(
-                header,
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['repeat_until'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            action = match.group(2).strip()
-            header = f"while not ({condition}):"
-            if action:
-                return self._render_inline_block(header, action, current_params=current_function_params)
-            return self._render_block_header(
-                header,
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['repeat_while'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            action = match.group(2).strip()
-            header = f"while {condition}:"
-            if action:
-                return self._render_inline_block(header, action, current_params=current_function_params)
-            return self._render_block_header(
-                header,
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['wait_sleep'].match(text)
-        if match:
-            duration = self._parse_duration(match.group(1), match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"time.sleep({duration})")])
-
-        match = self._patterns['while_do'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            action = match.group(2).strip()
-            if action:
-                return self._render_inline_block(
-                    f"while {condition}:",
-                    action,
-                    current_params=current_function_params,
-                )
-            return self._render_block_header(
-                f"while {condition}:",
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['with_as'].match(text)
-        if match:
-            resource = self._parse_expression(match.group(1))
-            var = match.group(2)
-            action = match.group(3).strip()
-            if action:
-                return self._render_inline_block(
-                    f"with {resource} as {var}:",
-                    action,
-                    current_params=current_function_params,
-                )
-            return self._render_block_header(
-                f"with {resource} as {var}:",
-                all_lines,
-                index,
-                line.indent,
-            )
-
-        match = self._patterns['with_simple'].match(text)
-        if match:
-            resource = self._parse_expression(match.group(1))
-            action = match.group(2).strip()
-            if action:
-                return self._render_inline_block(
-                    f"with {resource}:",
-                    action,
-                    current_params=current_function_params,
-                )
-            return self._render_block_header(
-                f"with {resource}:",
-                all_lines,
-                index,
-                line.indent,
-            )
+        current_params = self._current_function_params(stack)
+        cache_key = (text, current_params)
+        cached = self._line_cache.get(cache_key)
+        if cached is not None:
+            self._line_cache.move_to_end(cache_key)
+            return cached
+
+        ctx = LineContext(
+            line=line,
+            text=text,
+            all_lines=all_lines,
+            index=index,
+            stack=stack,
+            endpoint_names=endpoint_names,
+            current_params=current_params,
+        )
 
-        match = self._patterns['try_block'].match(text)
-        if match:
-            return self._render_block_header("try:", all_lines, index, line.indent)
+        matched = self._match_keyword_line(text) or self._line_patterns_for(text).match(text)
+        if matched:
+            name, groups = matched
+            result = self._line_handlers[name](groups, ctx)
+            if name in _CONTEXT_FREE_LINES:
+                self._cache_line(cache_key, result)
+            return result
 
-        match = self._patterns['catch'].match(text)
-        if match:
-            exc_name = match.group(1)
-            action = match.group(2).strip() if match.group(2) else ""
-            if exc_name:
-                header = f"except Exception as {exc_name}:"
+        if self._looks_like_assignment(text):
+            parts = text.split('=', 1)
+            left = parts[0].strip()
+            right = parts[1].strip() if len(parts) > 1 else ""
+            if left and right:
+                target = self._normalize_target(left)
+                result = TranspileResult.single(f"{target} = {self._parse_expression(right)}")
+                self._cache_line(cache_key, result)
+                return result
+
+        result = None
+        if not _never_parses(text):
+            try:
+                ast.parse(text)
+            except Exception:
+                pass
             else:
-                header = "except Exception:"
-            if action:
-                return self._render_inline_block(header, action, current_params=current_function_params)
-            return self._render_block_header(header, all_lines, index, line.indent)
-
-        match = self._patterns['finally'].match(text)
-        if match:
-            action = match.group(1).strip() if match.group(1) else ""
-            if action:
-                return self._render_inline_block("finally:", action, current_params=current_function_params)
-            return self._render_block_header("finally:", all_lines, index, line.indent)
-
-        match = self._patterns['create_function'].match(text) or self._patterns['define_function'].match(text)
-        if match:
-            name = self._normalize_function_name(match.group(1))
-            params_text = match.group(2).strip()
-            action_type = match.group(3).strip().lower()
-            body_text = match.group(4).strip()
-
-            params = self._parse_parameters(params_text)
-            header = f"def {name}({', '.join(params)}):"
-            if body_text:
-                body_lines = self._render_inline_body(action_type, body_text, current_params=params)
-                return TranspileResult(lines=[OutputLine(0, header)] + body_lines)
-            return self._render_block_header(
-                header,
-                all_lines,
-                index,
-                line.indent,
-                block_type="def",
-                block_params=params,
-            )
-
-        match = self._patterns['async_function'].match(text)
-        if match:
-            name = self._normalize_function_name(match.group(1))
-            params_text = match.group(2).strip()
-            action_type = match.group(3).strip().lower()
-            body_text = match.group(4).strip()
-
-            params = self._parse_parameters(params_text)
-            header = f"async def {name}({', '.join(params)}):"
-            if body_text:
-                body_lines = self._render_inline_body(action_type, body_text, current_params=params)
-                return TranspileResult(lines=[OutputLine(0, header)] + body_lines)
-            return self._render_block_header(
-                header,
-                all_lines,
-                index,
-                line.indent,
-                block_type="def",
-                block_params=params,
-            )
-
-        match = self._patterns['generator'].match(text)
-        if match:
-            name = self._normalize_function_name(match.group(1))
-            params_text = match.group(2).strip()
-            yield_expr = match.group(3).strip()
-            params = self._parse_parameters(params_text)
-            header = f"def {name}({', '.join(params)}):"
-            if yield_expr:
-                if self._should_parse_inline_action(yield_expr):
-                    action_lines = self._parse_inline_action(yield_expr, current_params=params)
-                    if action_lines:
-                        body_lines = [OutputLine(1 + item.indent_offset, item.text) for item in action_lines]
-                        return TranspileResult(lines=[OutputLine(0, header)] + body_lines)
-                yield_line = OutputLine(1, f"yield {self._parse_expression(yield_expr)}")
-                return TranspileResult(lines=[OutputLine(0, header), yield_line])
-            return self._render_block_header(
-                header,
-                all_lines,
-                index,
-                line.indent,
-                block_type="def",
-                block_params=params,
-            )
-
-        match = self._patterns['class_inheritance'].match(text)
-        if match:
-            name = self._normalize_class_name(match.group(1))
-            parents_text = match.group(2)
-            parents = []
-            for parent in re.split(r'\s+and\s+|,\s*', parents_text):
-                parent = parent.strip()
-                if not parent:
-                    continue
-                if re.match(r'^[A-Za-z_]\w*(?:\.\w+)*$', parent):
-                    parents.append(parent)
-                else:
-                    parents.append(self._normalize_class_name(parent))
-            header = f"class {name}({', '.join(parents)}):"
-            return self._render_block_header(header, all_lines, index, line.indent, block_type="class", block_name=name)
-
-        match = self._patterns['create_class'].match(text)
-        if match:
-            name = self._normalize_class_name(match.group(1))
-            header = f"class {name}:"
-            return self._render_block_header(header, all_lines, index, line.indent, block_type="class", block_name=name)
-
-        current_class = self._current_class(stack)
+                if text.endswith(':'):
+                    return self._render_block_header(text, all_lines, index, line.indent)
+                result = TranspileResult.single(text)
+        if result is None:
+            result = TranspileResult.single(self._parse_expression(text))
+        self._cache_line(cache_key, result)
+        return result
+
+    def _cache_line(self, key: Tuple[str, Optional[Tuple[str, ...]]], result: TranspileResult) -> None:
+        self._line_cache[key] = result
+        if len(self._line_cache) > LINE_CACHE_SIZE:
+            self._line_cache.popitem(last=False)
+
+    def _line_string_length_comparison(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        left, op_word, right, return_value = g
+
+        op_map = {
+            'bigger': '>', 'greater': '>', 'longer': '>',
+            'smaller': '<', 'less': '<', 'shorter': '<',
+            'equal': '==', 'same': '=='
+        }
+        op = op_map.get(op_word.lower(), '>')
 
-        match = self._patterns['class_method'].match(text)
-        if match:
-            return self._render_class_method(
-                match.group(1),
-                match.group(2),
-                match.group(3),
-                match.group(4),
-                match.group(5),
-                current_class,
-                all_lines,
-                index,
-                line.indent,
-                is_class_method=True,
-            )
+        otherwise_value = None
+        consumed = 1
+        if ctx.index + 1 < len(ctx.all_lines):
+            next_line = ctx.all_lines[ctx.index + 1].content.strip()
+            otherwise_match = self._patterns['else_inline'].match(next_line)
+            if otherwise_match:
+                otherwise_value = otherwise_match.group(1).strip()
+                consumed = 2
 
-        match = self._patterns['static_method'].match(text)
-        if match:
-            return self._render_class_method(
-                match.group(1),
-                match.group(2),
-                match.group(3),
-                match.group(4),
-                match.group(5),
-                current_class,
-                all_lines,
-                index,
-                line.indent,
-                is_static_method=True,
-            )
+        lines = [
+            OutputLine(0, f"def program({left}, {right}):"),
+            OutputLine(1, f"if len({left}) {op} len({right}):"),
+            OutputLine(2, f"return {self._parse_value(return_value)}"),
+        ]
+        if otherwise_value is not None:
+            lines.append(OutputLine(1, "else:"))
+            lines.append(OutputLine(2, f"return {self._parse_value(otherwise_value)}"))
+        return TranspileResult(lines=lines, consumed=consumed)
+
+    def _line_api_endpoint(self, g: Tuple, ctx: "LineContext", async_def: bool = False) -> TranspileResult:
+        return self._render_api_endpoint(
+            g[0],
+            g[1],
+            g[2] if len(g) > 2 else None,
+            async_def=async_def,
+            all_lines=ctx.all_lines,
+            index=ctx.index,
+            current_indent=ctx.line.indent,
+            endpoint_names=ctx.endpoint_names,
+        )
 
-        match = self._patterns['instance_method'].match(text)
-        if match:
-            return self._render_class_method(
-                match.group(1),
-                match.group(2),
-                match.group(3),
-                match.group(4),
-                match.group(5),
-                current_class,
-                all_lines,
-                index,
-                line.indent,
-                is_instance_method=True,
-            )
+    def _line_async_api_endpoint(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._line_api_endpoint(g, ctx, async_def=True)
 
-        match = self._patterns['property'].match(text)
-        if match:
-            prop_name = match.group(1)
-            class_name = match.group(2)
-            return_expr = match.group(3).strip()
-            return self._render_property(
-                prop_name,
-                class_name,
-                return_expr,
-                current_class,
-                all_lines,
-                index,
-                line.indent,
-            )
+    def _line_print_numbers(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return TranspileResult(lines=self._render_range_print(g[0], g[1]))
 
-        match = self._patterns['set_named'].match(text)
-        if match:
-            var = self._normalize_target(match.group(1))
-            value = self._parse_expression(match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"{var} = {value}")])
+    def _line_elif_block(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        condition = self._parse_condition(g[0])
+        return self._render_block_header(f"elif {condition}:", ctx.all_lines, ctx.index, ctx.line.indent)
 
-        match = self._patterns['let'].match(text) or self._patterns['set'].match(text)
-        if match:
-            var = self._normalize_target(match.group(1))
-            value = self._parse_expression(match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"{var} = {value}")])
+    def _line_elif_inline(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        condition = self._parse_condition(g[0])
+        return self._render_inline_block(f"elif {condition}:", g[1], current_params=ctx.current_params)
 
-        match = self._patterns['increase'].match(text)
-        if match:
-            target = self._normalize_target(match.group(1))
-            amount = self._parse_expression(match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"{target} += {amount}")])
+    def _line_else_do_block(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._render_block_header("else:", ctx.all_lines, ctx.index, ctx.line.indent)
 
-        match = self._patterns['decrease'].match(text)
-        if match:
-            target = self._normalize_target(match.group(1))
-            amount = self._parse_expression(match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"{target} -= {amount}")])
+    def _line_else_inline(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._render_inline_block("else:", g[0], current_params=ctx.current_params)
 
-        match = self._patterns['create_variable_set'].match(text)
-        if match:
-            var = self._normalize_target(match.group(1))
-            value_text = match.group(2)
-            kind = self._collection_kind_from_text(text)
-            if kind == "list":
-                value = self._parse_collection_initializer(value_text, "list")
-            elif kind == "dictionary":
-                value = self._parse_collection_initializer(value_text, "dictionary")
-            else:
-                value = self._parse_expression(value_text)
-            return TranspileResult(lines=[OutputLine(0, f"{var} = {value}")])
+    def _line_if_block(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        condition = self._parse_condition(g[0])
+        return self._render_block_header(f"if {condition}:", ctx.all_lines, ctx.index, ctx.line.indent)
 
-        match = self._patterns['create_variable'].match(text)
-        if match:
-            var = self._normalize_target(match.group(1))
-            value_text = match.group(2)
-            kind = self._collection_kind_from_text(text)
-            if kind == "list":
-                value = self._parse_collection_initializer(value_text, "list")
-            elif kind == "dictionary":
-                value = self._parse_collection_initializer(value_text, "dictionary")
-            else:
-                value = self._parse_expression(value_text) if value_text else "None"
-            return TranspileResult(lines=[OutputLine(0, f"{var} = {value}")])
+    def _line_if_return(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        condition = self._parse_condition(g[0])
+        return_value = self._parse_value(g[1], current_params=ctx.current_params)
+        return self._render_inline_block(
+            f"if {condition}:",
+            f"return {return_value}",
+            current_params=ctx.current_params,
+        )
 
-        match = self._patterns['append_to_list'].match(text)
-        if match:
-            item = self._parse_expression(match.group(1))
-            target = self._normalize_expression_target(match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"{target}.append({item})")])
+    def _line_if_inline(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        condition = self._parse_condition(g[0])
+        return self._render_inline_block(f"if {condition}:", g[1], current_params=ctx.current_params)
 
-        match = self._patterns['prepend_to_list'].match(text)
-        if match:
-            item = self._parse_expression(match.group(1))
-            target = self._normalize_expression_target(match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"{target}.insert(0, {item})")])
+    def _line_for_each(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        var, iterable_text, action = g
+        iterable = self._parse_expression(iterable_text)
+        return self._render_header_with_action(f"for {var} in {iterable}:", action, ctx)
 
-        match = self._patterns['remove_from_list'].match(text)
-        if match:
-            item = self._parse_expression(match.group(1))
-            target = self._normalize_expression_target(match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"{target}.remove({item})")])
+    def _line_for_each_in(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        var, iterable_text = g
+        iterable = self._parse_expression(iterable_text)
+        return self._render_block_header(f"for {var} in {iterable}:", ctx.all_lines, ctx.index, ctx.line.indent)
 
-        match = self._patterns['pop_from_list'].match(text)
-        if match:
-            target = self._normalize_expression_target(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"{target}.pop()")])
+    def _line_repeat_times(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        count_expr = self._parse_expression(g[0])
+        return self._render_header_with_action(f"for _ in range({count_expr}):", g[1], ctx)
 
-        match = self._patterns['clear_list'].match(text)
-        if match:
-            target = self._normalize_expression_target(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"{target}.clear()")])
+    def _line_repeat_until(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        condition = self._parse_condition(g[0])
+        return self._render_header_with_action(f"while not ({condition}):", g[1], ctx)
 
-        match = self._patterns['sort_list'].match(text)
-        if match:
-            target = self._normalize_expression_target(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"{target}.sort()")])
+    def _line_while(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        condition = self._parse_condition(g[0])
+        return self._render_header_with_action(f"while {condition}:", g[1], ctx)
 
-        match = self._patterns['reverse_list'].match(text)
-        if match:
-            target = self._normalize_expression_target(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"{target}.reverse()")])
+    def _line_wait_sleep(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        duration = self._parse_duration(g[0], g[1])
+        return TranspileResult.single(f"time.sleep({duration})")
 
-        match = self._patterns['print_numbers'].match(text)
-        if match:
-            return TranspileResult(lines=self._render_range_print(match.group(1), match.group(2)))
+    def _line_with_as(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        resource_text, var, action = g
+        resource = self._parse_expression(resource_text)
+        return self._render_header_with_action(f"with {resource} as {var}:", action, ctx)
 
-        match = self._patterns['say_message'].match(text)
-        if match:
-            message = self._parse_say_value(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"print({message})")])
+    def _line_with_simple(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        resource = self._parse_expression(g[0])
+        return self._render_header_with_action(f"with {resource}:", g[1], ctx)
 
-        match = self._patterns['log_message'].match(text)
-        if match:
-            level = match.group(1).lower()
-            message = self._parse_expression(match.group(2))
-            return TranspileResult(lines=[OutputLine(0, f"logging.{level}({message})")])
+    def _line_try_block(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._render_block_header("try:", ctx.all_lines, ctx.index, ctx.line.indent)
 
-        match = self._patterns['print'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"print({expr})")])
+    def _line_catch(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        exc_name, action = g
+        if exc_name:
+            header = f"except Exception as {exc_name}:"
+        else:
+            header = "except Exception:"
+        return self._render_header_with_action(header, action or "", ctx)
 
-        match = self._patterns['return'].match(text)
-        if match:
-            value = self._parse_value(match.group(1), current_params=current_function_params)
-            return TranspileResult(lines=[OutputLine(0, f"return {value}")])
+    def _line_finally(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._render_header_with_action("finally:", g[0] or "", ctx)
 
-        match = self._patterns['await'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"await {expr}")])
+    def _line_function(self, g: Tuple, ctx: "LineContext", def_prefix: str = "def") -> TranspileResult:
+        name = self._normalize_function_name(g[0])
+        params_text = g[1].strip()
+        action_type = g[2].strip().lower()
+        body_text = g[3].strip()
 
-        match = self._patterns['raise'].match(text) or self._patterns['throw'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"raise {expr}")])
+        params = self._parse_parameters(params_text)
+        header = f"{def_prefix} {name}({', '.join(params)}):"
+        if body_text:
+            body_lines = self._render_inline_body(action_type, body_text, current_params=params)
+            return TranspileResult(lines=[OutputLine(0, header)] + body_lines)
+        return self._render_block_header(
+            header,
+            ctx.all_lines,
+            ctx.index,
+            ctx.line.indent,
+            block_type=BlockType.DEF,
+            block_params=params,
+        )
 
-        match = self._patterns['exit'].match(text)
-        if match:
-            code_text = match.group(1)
-            if code_text:
-                code_expr = self._parse_expression(code_text)
-                return TranspileResult(lines=[OutputLine(0, f"sys.exit({code_expr})")])
-            return TranspileResult(lines=[OutputLine(0, "sys.exit(0)")])
+    def _line_async_function(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._line_function(g, ctx, def_prefix="async def")
 
-        match = self._patterns['yield'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"yield {expr}")])
+    def _line_generator(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        name = self._normalize_function_name(g[0])
+        params_text = g[1].strip()
+        yield_expr = g[2].strip()
+        params = self._parse_parameters(params_text)
+        header = f"def {name}({', '.join(params)}):"
+        if yield_expr:
+            if self._should_parse_inline_action(yield_expr):
+                action_lines = self._parse_inline_action(yield_expr, current_params=params)
+                if action_lines:
+                    return TranspileResult(lines=self._wrap_block(header, action_lines))
+            yield_line = OutputLine(1, f"yield {self._parse_expression(yield_expr)}")
+            return TranspileResult(lines=[OutputLine(0, header), yield_line])
+        return self._render_block_header(
+            header,
+            ctx.all_lines,
+            ctx.index,
+            ctx.line.indent,
+            block_type=BlockType.DEF,
+            block_params=params,
+        )
 
-        match = self._patterns['call_function'].match(text)
-        if match:
-            func_name = self._normalize_expression_target(match.group(1))
-            args_text = match.group(2) if match.group(2) else ""
-            args = self._parse_function_arguments(args_text) if args_text else []
-            args_str = ', '.join(args) if args else ''
-            return TranspileResult(lines=[OutputLine(0, f"{func_name}({args_str})")])
+    def _line_class_inheritance(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        name = self._normalize_class_name(g[0])
+        parents_text = g[1]
+        parents = []
+        for parent in _PARENT_SEPARATOR.split(parents_text):
+            parent = parent.strip()
+            if not parent:
+                continue
+            if _DOTTED_NAME.match(parent):
+                parents.append(parent)
+            else:
+                parents.append(self._normalize_class_name(parent))
+        header = f"class {name}({', '.join(parents)}):"
+        return self._render_block_header(
+            header, ctx.all_lines, ctx.index, ctx.line.indent, block_type=BlockType.CLASS, block_name=name
+        )
 
-        match = self._patterns['call_with'].match(text)
-        if match:
-            func_name = self._normalize_expression_target(match.group(1))
-            args = self._parse_function_arguments(match.group(2))
-            args_str = ', '.join(args) if args else ''
-            return TranspileResult(lines=[OutputLine(0, f"{func_name}({args_str})")])
+    def _line_create_class(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        name = self._normalize_class_name(g[0])
+        header = f"class {name}:"
+        return self._render_block_header(
+            header, ctx.all_lines, ctx.index, ctx.line.indent, block_type=BlockType.CLASS, block_name=name
+        )
 
-        match = self._patterns['decorator'].match(text)
-        if match:
-            target = match.group(1)
-            decorator = self._parse_expression(match.group(2)).lstrip('@')
-            return TranspileResult(lines=[OutputLine(0, f"{target} = {decorator}({target})")])
+    def _line_method(self, g: Tuple, ctx: "LineContext", **kind: bool) -> TranspileResult:
+        return self._render_class_method(
+            g[0],
+            g[1],
+            g[2],
+            g[3],
+            g[4],
+            self._current_class(ctx.stack),
+            ctx.all_lines,
+            ctx.index,
+            ctx.line.indent,
+            **kind,
+        )
 
-        match = self._patterns['list_comprehension'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            var = match.group(2)
-            iterable = self._parse_expression(match.group(3))
-            condition = match.group(4)
-            if condition:
-                cond = self._parse_condition(condition)
-                return TranspileResult(lines=[OutputLine(0, f"[{expr} for {var} in {iterable} if {cond}]")])
-            return TranspileResult(lines=[OutputLine(0, f"[{expr} for {var} in {iterable}]")])
-
-        match = self._patterns['lambda'].match(text)
-        if match:
-            params_text = match.group(1).strip()
-            return_expr = match.group(2).strip()
-            params = self._parse_parameters(params_text)
-            expr = self._parse_expression(return_expr)
-            return TranspileResult(lines=[OutputLine(0, f"lambda {', '.join(params)}: {expr}")])
+    def _line_class_method(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._line_method(g, ctx, is_class_method=True)
+
+    def _line_static_method(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._line_method(g, ctx, is_static_method=True)
+
+    def _line_instance_method(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return self._line_method(g, ctx, is_instance_method=True)
+
+    def _line_property(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        prop_name, class_name, return_expr = g
+        return self._render_property(
+            prop_name,
+            class_name,
+            return_expr.strip(),
+            self._current_class(ctx.stack),
+            ctx.all_lines,
+            ctx.index,
+            ctx.line.indent,
+        )
 
-        match = self._patterns['connect_db'].match(text)
-        if match:
-            db_url = self._parse_expression(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"db_connection = connect({db_url})")])
+    def _line_assign(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        var = self._normalize_target(g[0])
+        value = self._parse_expression(g[1])
+        return TranspileResult.single(f"{var} = {value}")
+
+    def _line_increase(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        target = self._normalize_target(g[0])
+        amount = self._parse_expression(g[1])
+        return TranspileResult.single(f"{target} += {amount}")
+
+    def _line_decrease(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        target = self._normalize_target(g[0])
+        amount = self._parse_expression(g[1])
+        return TranspileResult.single(f"{target} -= {amount}")
+
+    def _line_create_variable_set(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        var = self._normalize_target(g[0])
+        value_text = g[1]
+        kind = self._collection_kind_from_text(ctx.text)
+        if kind == "list":
+            value = self._parse_collection_initializer(value_text, "list")
+        elif kind == "dictionary":
+            value = self._parse_collection_initializer(value_text, "dictionary")
+        else:
+            value = self._parse_expression(value_text)
+        return TranspileResult.single(f"{var} = {value}")
+
+    def _line_create_variable(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        var = self._normalize_target(g[0])
+        value_text = g[1]
+        kind = self._collection_kind_from_text(ctx.text)
+        if kind == "list":
+            value = self._parse_collection_initializer(value_text, "list")
+        elif kind == "dictionary":
+            value = self._parse_collection_initializer(value_text, "dictionary")
+        else:
+            value = self._parse_expression(value_text) if value_text else "None"
+        return TranspileResult.single(f"{var} = {value}")
+
+    def _line_append_to_list(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        item = self._parse_expression(g[0])
+        target = self._normalize_expression_target(g[1])
+        return TranspileResult.single(f"{target}.append({item})")
+
+    def _line_prepend_to_list(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        item = self._parse_expression(g[0])
+        target = self._normalize_expression_target(g[1])
+        return TranspileResult.single(f"{target}.insert(0, {item})")
+
+    def _line_remove_from_list(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        item = self._parse_expression(g[0])
+        target = self._normalize_expression_target(g[1])
+        return TranspileResult.single(f"{target}.remove({item})")
+
+    def _line_pop_from_list(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        target = self._normalize_expression_target(g[0])
+        return TranspileResult.single(f"{target}.pop()")
+
+    def _line_clear_list(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        target = self._normalize_expression_target(g[0])
+        return TranspileResult.single(f"{target}.clear()")
+
+    def _line_sort_list(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        target = self._normalize_expression_target(g[0])
+        return TranspileResult.single(f"{target}.sort()")
+
+    def _line_reverse_list(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        target = self._normalize_expression_target(g[0])
+        return TranspileResult.single(f"{target}.reverse()")
+
+    def _line_say_message(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        message = self._parse_say_value(g[0])
+        return TranspileResult.single(f"print({message})")
+
+    def _line_log_message(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        level = g[0].lower()
+        message = self._parse_expression(g[1])
+        return TranspileResult.single(f"logging.{level}({message})")
+
+    def _line_print(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        expr = self._parse_expression(g[0])
+        return TranspileResult.single(f"print({expr})")
+
+    def _line_return(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        value = self._parse_value(g[0], current_params=ctx.current_params)
+        return TranspileResult.single(f"return {value}")
+
+    def _line_await(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        expr = self._parse_expression(g[0])
+        return TranspileResult.single(f"await {expr}")
+
+    def _line_raise(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        expr = self._parse_expression(g[0])
+        return TranspileResult.single(f"raise {expr}")
+
+    def _line_exit(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        code_text = g[0]
+        if code_text:
+            code_expr = self._parse_expression(code_text)
+            return TranspileResult.single(f"sys.exit({code_expr})")
+        return TranspileResult.single("sys.exit(0)")
+
+    def _line_yield(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        expr = self._parse_expression(g[0])
+        return TranspileResult.single(f"yield {expr}")
+
+    def _line_call_function(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return TranspileResult.single(self._render_call(*g))
+
+    def _line_call_with(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        return TranspileResult.single(self._render_call(*g))
+
+    def _line_decorator(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        target = g[0]
+        decorator = self._parse_expression(g[1]).lstrip('@')
+        return TranspileResult.single(f"{target} = {decorator}({target})")
+
+    def _line_list_comprehension(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        expr = self._parse_expression(g[0])
+        var = g[1]
+        iterable = self._parse_expression(g[2])
+        condition = g[3]
+        if condition:
+            cond = self._parse_condition(condition)
+            return TranspileResult.single(f"[{expr} for {var} in {iterable} if {cond}]")
+        return TranspileResult.single(f"[{expr} for {var} in {iterable}]")
+
+    def _line_lambda(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        params_text = g[0].strip()
+        return_expr = g[1].strip()
+        params = self._parse_parameters(params_text)
+        expr = self._parse_expression(return_expr)
+        return TranspileResult.single(f"lambda {', '.join(params)}: {expr}")
 
-        match = self._patterns['query_db'].match(text)
-        if match:
-            query = self._parse_expression(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"result = db_connection.execute({query})")])
+    def _line_connect_db(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        db_url = self._parse_expression(g[0])
+        return TranspileResult.single(f"db_connection = connect({db_url})")
 
-        match = self._patterns['insert_db'].match(text)
-        if match:
-            query = self._parse_expression(match.group(1))
-            return TranspileResult(lines=[OutputLine(0, f"db_connection.execute({query})")])
+    def _line_query_db(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        query = self._parse_expression(g[0])
+        return TranspileResult.single(f"result = db_connection.execute({query})")
 
-        if self._looks_like_assignment(text):
-            parts = text.split('=', 1)
-            left = parts[0].strip()
-            right = parts[1].strip() if len(parts) > 1 else ""
-            if left and right:
-                target = self._normalize_target(left)
-                return TranspileResult(lines=[OutputLine(0, f"{target} = {self._parse_expression(right)}")])
-
-        try:
-            ast.parse(text)
-            if text.endswith(':'):
-                return self._render_block_header(text, all_lines, index, line.indent)
-            return TranspileResult(lines=[OutputLine(0, text)])
-        except Exception:
-            pass
+    def _line_insert_db(self, g: Tuple, ctx: "LineContext") -> TranspileResult:
+        query = self._parse_expression(g[0])
+        return TranspileResult.single(f"db_connection.execute({query})")
 
-        return TranspileResult(lines=[OutputLine(0, self._parse_expression(text))])
+    def _render_header_with_action(self, header: str, action: str, ctx: "LineContext") -> TranspileResult:
+        """Render a block header with its inline action, or open a block when there is none."""
+        action = action.strip()
+        if action:
+            return self._render_inline_block(header, action, current_params=ctx.current_params)
+        return self._render_block_header(header, ctx.all_lines, ctx.index, ctx.line.indent)
 
     def _tokenize_lines(self, plain_text: str) -> List[SourceLine]:
         """Tokenize text into non-empty, non-comment lines preserving indentation."""
         lines: List[SourceLine] = []
         for idx, raw in enumerate(plain_text.splitlines(), 1):
-            if not raw.strip():
-                continue
             stripped = raw.lstrip()
-            if stripped.startswith('#') or stripped.startswith('//'):
+            if not stripped or stripped.startswith(('#', '//')):
                 continue
-            indent = self._count_indent(raw)
-            lines.append(SourceLine(content=stripped, indent=indent, line_no=idx))
+            prefix_len = len(raw) - len(stripped)
+            if raw.count(' ', 0, prefix_len) == prefix_len:
+                indent = prefix_len
+            else:
+                indent = self._count_indent(raw)
+            lines.append(SourceLine(stripped, indent, idx))
         return lines
 
     def _count_indent(self, raw_line: str) -> int:
         """Count indentation (spaces) with tabs expanded to 4 spaces."""
-        expanded = raw_line.expandtabs(4)
-        return len(expanded) - len(expanded.lstrip(' '))
+        # Same result as measuring raw_line.expandtabs(4), without expanding
+        # the whole line: a tab advances to the next multiple of 4.
+        width = 0
+        for ch in raw_line:
+            if ch == ' ':
+                width += 1
+            elif ch == '\t':
+                width += 4 - width % 4
+            else:
+                break
+        return width
 
     def _infer_indent_unit(self, lines: List[SourceLine]) -> int:
         """Infer indentation width from the source."""
@@ -1079,27 +1658,49 @@ class EnhancedTranspiler:
         features = {"flask_app": False, "flask_run": True}
         for line in lines:
             text = line.content
-            if (self._patterns['api_endpoint'].match(text)
-                    or self._patterns['api_endpoint_block'].match(text)
-                    or self._patterns['async_api_endpoint'].match(text)
-                    or self._patterns['async_api_endpoint_block'].match(text)):
+            if _API_PATTERNS.match(text):
                 features["flask_app"] = True
             if "app.run" in text or "__name__" in text:
                 features["flask_run"] = False
         return features
 
     def _current_class(self, stack: List[Block]) -> Optional[str]:
-        for block in reversed(stack):
-            if block.block_type == "class":
-                return block.name
-        return None
+        return stack[-1].class_name if stack else None
 
-    def _current_function_params(self, stack: List[Block]) -> Optional[List[str]]:
-        for block in reversed(stack):
-            if block.block_type == "def":
-                return block.params
+    def _match_keyword_line(self, text: str) -> Optional[Tuple[str, Tuple[Optional[str], ...]]]:
+        """Match bare block keywords and single-argument statements without regex."""
+        lowered = text.lower()
+        name = _KEYWORD_LINES.get(lowered)
+        if name is not None:
+            return name, (None,) if name == 'finally' else ()
+        parts = text.split(None, 1)
+        if len(parts) == 2:
+            name = _KEYWORD_STATEMENTS.get(parts[0].lower())
+            if name is not None:
+                return name, (parts[1],)
+            if parts[0].lower() in _PRINT_WORDS and not _WHITESPACE.search(parts[1]):
+                return 'print', (parts[1],)
+            tokens = text.split()
+            if (len(tokens) == 4
+                    and tokens[0].lower() in _ASSIGN_WORDS
+                    and tokens[2].lower() in _ASSIGN_SEPARATORS):
+                return 'set_named', (tokens[1], tokens[3])
         return None
 
+    def _line_patterns_for(self, text: str) -> LinePatternSet:
+        """Return the line patterns that can match a line starting like ``text``."""
+        word = _LEADING_WORD.match(text).group()
+        if not word.isascii():
+            # Case-insensitive matching folds some non-ASCII letters onto
+            # ASCII keywords, so only the full pattern list is exact here.
+            names = _LINE_ALL
+        else:
+            names = _LINE_WORDS.get(word.lower(), _LINE_ANY_WORD)
+        return _pattern_set(names)
+
+    def _current_function_params(self, stack: List[Block]) -> Optional[Tuple[str, ...]]:
+        return stack[-1].function_params if stack else None
+
     def _should_autopass(self, all_lines: List[SourceLine], index: int, current_indent: int) -> bool:
         if index + 1 >= len(all_lines):
             return True
@@ -1111,18 +1712,13 @@ class EnhancedTranspiler:
         if '==' in text or '!=' in text or '>=' in text or '<=' in text or ':=' in text:
             return False
         left, _, right = text.partition('=')
-        if not left.strip() or not right.strip():
-            return False
-        if not self._is_assignable_expr(left.strip()):
+        left = left.strip()
+        if not left or not right.strip():
             return False
-        return True
+        return self._is_assignable_expr(left)
 
     def _is_assignable_expr(self, expr: str) -> bool:
-        try:
-            node = ast.parse(expr, mode='eval').body
-        except Exception:
-            return False
-        return isinstance(node, (ast.Name, ast.Attribute, ast.Subscript))
+        return _expr_node_type(expr) in (ast.Name, ast.Attribute, ast.Subscript)
 
     def _normalize_target(self, text: str, default: str = "value") -> str:
         cleaned = text.strip()
@@ -1140,50 +1736,55 @@ class EnhancedTranspiler:
             return cleaned
         return self._sanitize_identifier(cleaned, default=default)
 
-    def _sanitize_identifier(self, text: str, default: str = "value") -> str:
+    # The name helpers below are pure functions of their arguments and see the
+    # same few inputs over and over, so their results are memoized.
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _sanitize_identifier(text: str, default: str = "value") -> str:
         cleaned = text.strip()
         if not cleaned:
             return default
-        cleaned = re.sub(r'^(?:the|a|an|my|your|our|their)\s+', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'[^\w]+', '_', cleaned).strip('_')
+        cleaned = _NON_WORD.sub('_', _ARTICLE.sub('', cleaned)).strip('_')
         if not cleaned:
             cleaned = default
-        if re.match(r'^\d', cleaned):
+        if cleaned[0].isdecimal():
             cleaned = f"{default}_{cleaned}"
         cleaned = cleaned.lower()
         if keyword.iskeyword(cleaned):
             cleaned = f"{cleaned}_"
-        return cleaned
+        # Different spellings ("the count", "Count") sanitize to the same
+        # name; intern it so they all share one string.
+        return sys.intern(cleaned)
 
     def _normalize_param_name(self, text: str) -> str:
         cleaned = text.strip()
         if not cleaned:
             return ""
-        named_match = re.search(r'(?:named|called)\s+(.+)$', cleaned, re.IGNORECASE)
+        named_match = _NAMED_SUFFIX.search(cleaned)
         if named_match:
             cleaned = named_match.group(1)
-        cleaned = re.sub(r'^(?:the|a|an|my|your|our|their)\s+', '', cleaned, flags=re.IGNORECASE)
-        type_match = re.match(
-            r'^(?:list|array|set|tuple|dictionary|dict|map|collection|sequence)\s+of\s+(.+)$',
-            cleaned,
-            re.IGNORECASE,
-        )
+        cleaned = _ARTICLE.sub('', cleaned)
+        type_match = _COLLECTION_OF.match(cleaned)
         if type_match:
             cleaned = type_match.group(1)
-        cleaned = re.sub(r'^(?:the|a|an)\s+', '', cleaned, flags=re.IGNORECASE)
+        cleaned = _SHORT_ARTICLE.sub('', cleaned)
         return self._sanitize_identifier(cleaned, default="value")
 
-    def _normalize_function_name(self, text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_function_name(text: str) -> str:
         cleaned = text.strip()
-        if re.match(r'^[A-Za-z_]\w*$', cleaned):
+        if _IDENTIFIER.match(cleaned):
             return cleaned
-        return self._sanitize_identifier(cleaned, default="function")
+        return EnhancedTranspiler._sanitize_identifier(cleaned, default="function")
 
-    def _normalize_class_name(self, text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_class_name(text: str) -> str:
         cleaned = text.strip()
-        if re.match(r'^[A-Za-z_]\w*$', cleaned):
+        if _IDENTIFIER.match(cleaned):
             return cleaned
-        identifier = self._sanitize_identifier(cleaned, default="class")
+        identifier = EnhancedTranspiler._sanitize_identifier(cleaned, default="class")
         parts = [part.capitalize() for part in identifier.split('_') if part]
         return ''.join(parts) or "ClassName"
 
@@ -1191,59 +1792,56 @@ class EnhancedTranspiler:
         if not text:
             return []
         items: List[str] = []
-        buffer: List[str] = []
-        in_quote: Optional[str] = None
-        i = 0
-        lower = text.lower()
-
-        while i < len(text):
-            ch = text[i]
-            if ch in ('"', "'"):
-                if in_quote == ch:
-                    in_quote = None
-                elif in_quote is None:
-                    in_quote = ch
-                buffer.append(ch)
-                i += 1
+        start = 0
+        for match in _ITEM_SEPARATOR.finditer(text):
+            if match.lastindex is None:
                 continue
-
-            if in_quote is None:
-                if ch == ',':
-                    item = ''.join(buffer).strip()
-                    if item:
-                        items.append(item)
-                    buffer = []
-                    i += 1
-                    continue
-
-                if ch.isspace():
-                    j = i
-                    while j < len(text) and text[j].isspace():
-                        j += 1
-                    if lower.startswith('and', j) and (j + 3 == len(text) or text[j + 3].isspace()):
-                        k = j + 3
-                        while k < len(text) and text[k].isspace():
-                            k += 1
-                        item = ''.join(buffer).strip()
-                        if item:
-                            items.append(item)
-                        buffer = []
-                        i = k
-                        continue
-
-            buffer.append(ch)
-            i += 1
-
-        item = ''.join(buffer).strip()
+            item = text[start:match.start()].strip()
+            if item:
+                items.append(item)
+            start = match.end()
+        item = text[start:].strip()
         if item:
             items.append(item)
         return items
 
+    @staticmethod
+    def _split_plus(text: str) -> List[str]:
+        """Split ``text`` on ``+`` signs outside quoted strings, stripping each part."""
+        if '"' not in text and "'" not in text:
+            return [part.strip() for part in text.split('+')]
+        parts: List[str] = []
+        start = index = 0
+        while True:
+            plus = text.find('+', index)
+            if plus < 0:
+                break
+            double = text.find('"', index, plus)
+            single = text.find("'", index, plus)
+            if double < 0 and single < 0:
+                parts.append(text[start:plus].strip())
+                start = index = plus + 1
+                continue
+            # Skip the first quoted string before the sign. A quote preceded by
+            # an odd run of backslashes is escaped and stays inside the string;
+            # a quote with no partner, such as an apostrophe, is an ordinary
+            # character.
+            opening = double if single < 0 or 0 <= double < single else single
+            closing = text.find(text[opening], opening + 1)
+            while closing > 0 and text[opening + 1:closing].endswith('\\'):
+                backslashes = closing - len(text[:closing].rstrip('\\'))
+                if backslashes % 2 == 0:
+                    break
+                closing = text.find(text[opening], closing + 1)
+            index = opening + 1 if closing < 0 else closing + 1
+        parts.append(text[start:].strip())
+        return parts
+
     def _collection_kind_from_text(self, text: str) -> str:
         lowered = text.lower()
-        if re.search(r'\blist\b', lowered):
+        if _LIST_WORD.search(lowered):
             return "list"
-        if re.search(r'\b(dictionary|dict|map)\b', lowered):
+        if _DICTIONARY_WORD.search(lowered):
             return "dictionary"
         return "variable"
 
@@ -1251,36 +1849,34 @@ class EnhancedTranspiler:
         cleaned = text.strip()
         if not cleaned:
             return "\"\""
-        value_match = re.match(r'^(?:value|result)\s+of\s+(.+)$', cleaned, re.IGNORECASE)
+        value_match = _VALUE_OF.match(cleaned)
         if value_match:
             return self._parse_expression(value_match.group(1))
-        if (cleaned.startswith('"') and cleaned.endswith('"')) or (cleaned.startswith("'") and cleaned.endswith("'")):
+        if cleaned[:1] in ('"', "'") and cleaned.endswith(cleaned[0]):
             return cleaned
-        if re.match(r'^-?\d+(\.\d+)?$', cleaned) or cleaned.lower() in ('true', 'false', 'none', 'null'):
+        if _NUMBER_LITERAL.match(cleaned) or cleaned.lower() in ('true', 'false', 'none', 'null'):
             return self._parse_expression(cleaned)
         if self._is_valid_python_expr(cleaned):
-            if re.match(r'^[A-Za-z_]\w*$', cleaned):
+            if _IDENTIFIER.match(cleaned):
                 return self._quote_string(cleaned)
             return self._parse_expression(cleaned)
         return self._quote_string(cleaned)
 
     def _looks_like_call_args(self, text: str) -> bool:
-        lower = text.strip().lower()
-        if lower.startswith((
-            'is ', 'are ', 'was ', 'were ', 'has ', 'have ',
-            'times ', 'plus ', 'minus ', 'divided ', 'over ', 'mod ', 'modulo ',
-            'between ', 'greater ', 'less ', 'equals ', 'equal ', 'contains ',
-            'starts ', 'ends ', 'and ', 'or ', 'not '
-        )):
-            return False
-        return True
+        return not text.strip().lower().startswith(_NOT_CALL_PREFIXES)
+
+    def _render_call(self, func_text: str, args_text: Optional[str]) -> str:
+        """Render a "call F with A, B" phrase as a Python call."""
+        func_name = self._normalize_expression_target(func_text)
+        args = self._parse_function_arguments(args_text) if args_text else []
+        return f"{func_name}({', '.join(args)})"
 
     def _maybe_parse_call_without_parens(self, text: str) -> Optional[str]:
         match = self._patterns['dot_call'].match(text)
         if not match:
             return None
-        func_name = match.group(1)
-        args_text = match.group(2).strip()
+        func_name, args_text = match.groups()
+        args_text = args_text.strip()
         if not args_text or not self._looks_like_call_args(args_text):
             return None
         args = self._parse_function_arguments(args_text)
@@ -1290,18 +1886,7 @@ class EnhancedTranspiler:
     def _parse_duration(self, value_text: str, unit_text: Optional[str]) -> str:
         value_expr = self._parse_expression(value_text)
         unit = unit_text.lower() if unit_text else "seconds"
-        multipliers = {
-            "ms": "0.001",
-            "millisecond": "0.001",
-            "milliseconds": "0.001",
-            "second": "1",
-            "seconds": "1",
-            "minute": "60",
-            "minutes": "60",
-            "hour": "3600",
-            "hours": "3600",
-        }
-        multiplier = multipliers.get(unit, "1")
+        multiplier = _DURATION_MULTIPLIERS.get(unit, "1")
         if multiplier == "1":
             return value_expr
         return f"({value_expr}) * {multiplier}"
@@ -1315,29 +1900,20 @@ class EnhancedTranspiler:
         if cleaned.startswith("[") or cleaned.startswith("{") or cleaned.startswith("("):
             return cleaned
         if collection_type == "list":
-            cleaned = re.sub(
-                r'^(?:with\s+)?(?:items|values|elements|entries)?\s*',
-                '',
-                cleaned,
-                flags=re.IGNORECASE,
-            )
+            cleaned = cleaned[_LIST_ITEMS_PREFIX.match(cleaned).end():]
             items = self._split_items(cleaned)
             parsed_items = [self._parse_expression(item) for item in items]
             return f"[{', '.join(parsed_items)}]" if parsed_items else "[]"
         if collection_type == "dictionary":
-            cleaned = re.sub(
-                r'^(?:with\s+)?(?:items|values|entries|pairs)?\s*',
-                '',
-                cleaned,
-                flags=re.IGNORECASE,
-            )
+            cleaned = cleaned[_DICT_ITEMS_PREFIX.match(cleaned).end():]
             pairs = self._split_items(cleaned)
             entries = []
             for pair in pairs:
-                kv_match = re.match(r'^(.+?)\s*(?:=|:|to|->)\s*(.+)$', pair)
+                kv_match = _KEY_VALUE.match(pair)
                 if kv_match:
-                    key = self._parse_value(kv_match.group(1).strip())
-                    value = self._parse_expression(kv_match.group(2).strip())
+                    key, value = kv_match.groups()
+                    key = self._parse_value(key.strip())
+                    value = self._parse_expression(value.strip())
                     entries.append(f"{key}: {value}")
                 else:
                     key = self._parse_value(pair)
@@ -1346,44 +1922,7 @@ class EnhancedTranspiler:
         return self._parse_expression(cleaned)
 
     def _should_parse_inline_action(self, text: str) -> bool:
-        return (
-            self._patterns['for_each'].match(text)
-            or self._patterns['while_do'].match(text)
-            or self._patterns['repeat_times'].match(text)
-            or self._patterns['repeat_until'].match(text)
-            or self._patterns['repeat_while'].match(text)
-            or self._patterns['wait_sleep'].match(text)
-            or self._patterns['if_return'].match(text)
-            or self._patterns['if_then_inline'].match(text)
-            or self._patterns['if_do_inline'].match(text)
-            or self._patterns['yield'].match(text)
-            or self._patterns['print_numbers'].match(text)
-            or self._patterns['print'].match(text)
-            or self._patterns['say_message'].match(text)
-            or self._patterns['log_message'].match(text)
-            or self._patterns['return'].match(text)
-            or self._patterns['set_named'].match(text)
-            or self._patterns['let'].match(text)
-            or self._patterns['set'].match(text)
-            or self._patterns['create_variable_set'].match(text)
-            or self._patterns['create_variable'].match(text)
-            or self._patterns['increase'].match(text)
-            or self._patterns['decrease'].match(text)
-            or self._patterns['append_to_list'].match(text)
-            or self._patterns['prepend_to_list'].match(text)
-            or self._patterns['remove_from_list'].match(text)
-            or self._patterns['pop_from_list'].match(text)
-            or self._patterns['clear_list'].match(text)
-            or self._patterns['sort_list'].match(text)
-            or self._patterns['reverse_list'].match(text)
-            or self._patterns['call_function'].match(text)
-            or self._patterns['call_with'].match(text)
-            or self._patterns['dot_call'].match(text)
-            or self._patterns['await'].match(text)
-            or self._patterns['raise'].match(text)
-            or self._patterns['throw'].match(text)
-            or self._patterns['exit'].match(text)
-        )
+        return _pattern_set(_INLINE_ACTION_NAMES).match(text) is not None
 
     def _render_block_header(
         self,
@@ -1391,7 +1930,7 @@ class EnhancedTranspiler:
         all_lines: List[SourceLine],
         index: int,
         current_indent: int,
-        block_type: Optional[str] = None,
+        block_type: Optional[BlockType] = None,
         block_name: Optional[str] = None,
         block_params: Optional[List[str]] = None,
     ) -> TranspileResult:
@@ -1403,7 +1942,7 @@ class EnhancedTranspiler:
             lines=lines,
             opens_block=True,
             block_type=block_type,
-            block_name=block_name,
+            block_name=sys.intern(block_name) if block_name else block_name,
             block_params=block_params,
         )
 
@@ -1411,27 +1950,32 @@ class EnhancedTranspiler:
         self,
         header: str,
         action_text: str,
-        current_params: Optional[List[str]] = None,
+        current_params: Optional[Sequence[str]] = None,
     ) -> TranspileResult:
         action_lines = self._parse_inline_action(action_text, current_params=current_params)
-        if not action_lines:
-            action_lines = [OutputLine(0, "pass")]
-        lines = [OutputLine(0, header)]
-        lines.extend([OutputLine(1 + item.indent_offset, item.text) for item in action_lines])
-        return TranspileResult(lines=lines)
+        return TranspileResult(lines=self._wrap_block(header, action_lines))
 
     def _render_inline_body(
         self,
         action_type: str,
         body_text: str,
-        current_params: Optional[List[str]] = None,
+        current_params: Optional[Sequence[str]] = None,
     ) -> List[OutputLine]:
         if action_type == "returns":
             return [OutputLine(1, f"return {self._parse_value(body_text, current_params=current_params)}")]
         action_lines = self._parse_inline_action(body_text, current_params=current_params)
-        if not action_lines:
-            action_lines = [OutputLine(0, "pass")]
-        return [OutputLine(1 + item.indent_offset, item.text) for item in action_lines]
+        return self._indent_block(action_lines)
+
+    @staticmethod
+    def _indent_block(nested: Sequence[OutputLine]) -> List[OutputLine]:
+        """Shift ``nested`` one level deeper, or return a ``pass`` body if it is empty."""
+        return [OutputLine(1 + offset, text) for offset, text in nested or _PASS_BODY]
+
+    def _wrap_block(self, header: str, nested: Sequence[OutputLine]) -> List[OutputLine]:
+        """Return ``header`` followed by ``nested`` as its indented body."""
+        lines = [OutputLine(0, header)]
+        lines.extend(self._indent_block(nested))
+        return lines
 
     def _render_range_print(self, start_text: str, end_text: str) -> List[OutputLine]:
         start_expr = self._parse_expression(start_text)
@@ -1445,7 +1989,11 @@ class EnhancedTranspiler:
         ]
 
     def _increment_if_number(self, value: str) -> Optional[str]:
-        if re.match(r'^-?\d+$', value):
+        # str.isdecimal accepts exactly the characters \d does. ``value``
+        # comes from _parse_expression, which strips it, so there is no
+        # trailing newline for ``$`` to have allowed.
+        digits = value[1:] if value.startswith('-') else value
+        if digits.isdecimal():
             return str(int(value) + 1)
         return None
 
@@ -1458,11 +2006,10 @@ class EnhancedTranspiler:
         all_lines: List[SourceLine],
         index: int,
         current_indent: int,
-        endpoint_names: Set[str],
+        endpoint_names: Dict[str, int],
     ) -> TranspileResult:
-        route = self._normalize_route(path_text)
+        route, params, _ = self._route_info(path_text)
         method = method_text.upper()
-        params = self._extract_route_params(route)
         func_name = self._make_endpoint_name(method, path_text, endpoint_names)
 
         decorator = f"@app.route({route}, methods=[\"{method}\"])"
@@ -1479,29 +2026,44 @@ class EnhancedTranspiler:
             lines.append(OutputLine(1, "return \"\""))
             return TranspileResult(lines=lines)
 
-        return TranspileResult(lines=lines, opens_block=True, block_type="def")
+        return TranspileResult(lines=lines, opens_block=True, block_type=BlockType.DEF)
 
     def _normalize_route(self, path_text: str) -> str:
         path = path_text.strip()
-        if (path.startswith('"') and path.endswith('"')) or (path.startswith("'") and path.endswith("'")):
+        if path[:1] in ('"', "'") and path.endswith(path[0]):
             return path
         return f"\"{path}\""
 
     def _extract_route_params(self, route_literal: str) -> List[str]:
         route = route_literal.strip('"\'')
-        return re.findall(r"<(?:[^:<>]+:)?([^<>]+)>", route)
-
-    def _make_endpoint_name(self, method: str, path_text: str, used_names: Set[str]) -> str:
-        cleaned = re.sub(r"[^\w]+", "_", path_text).strip('_')
-        if not cleaned:
-            cleaned = "root"
-        base = f"{method.lower()}_{cleaned}"
-        name = base
-        counter = 2
-        while name in used_names:
+        return _ROUTE_PARAM.findall(route)
+
+    def _route_info(self, path_text: str) -> Tuple[str, Tuple[str, ...], str]:
+        """Return the route literal, its parameters and the endpoint name stem for a path."""
+        cache = self._route_cache
+        info = cache.get(path_text)
+        if info is None:
+            route = self._normalize_route(path_text)
+            cleaned = _NON_WORD.sub("_", path_text).strip('_') or "root"
+            info = (route, tuple(self._extract_route_params(route)), cleaned)
+            self._cache_phrase(cache, path_text, info)
+        return info
+
+    def _make_endpoint_name(self, method: str, path_text: str, used_names: Dict[str, int]) -> str:
+        base = f"{method.lower()}_{self._route_info(path_text)[2]}"
+        counter = used_names.get(base)
+        if counter is None:
+            name = base
+        else:
+            # Suffixes below ``counter`` are all taken already, so the probe
+            # resumes where the previous collision on this base stopped.
             name = f"{base}_{counter}"
-            counter += 1
-        used_names.add(name)
+            while name in used_names:
+                counter += 1
+                name = f"{base}_{counter}"
+            used_names[base] = counter + 1
+        name = sys.intern(name)
+        used_names[name] = 2
         return name
 
     def _render_class_method(
@@ -1520,7 +2082,6 @@ class EnhancedTranspiler:
         is_instance_method: bool = False,
     ) -> TranspileResult:
         params = self._parse_parameters(params_text)
-        user_params = list(params)
         action_type = action_type.strip().lower()
         body_text = body_text.strip()
 
@@ -1530,20 +2091,17 @@ class EnhancedTranspiler:
             lines: List[OutputLine] = []
             if is_class_method:
                 lines.append(OutputLine(0, "@classmethod"))
-                params = ["cls"] + params
             elif is_static_method:
                 lines.append(OutputLine(0, "@staticmethod"))
-            else:
-                params = ["self"] + params
 
-            header = f"def {method_name}({', '.join(params)}):"
+            header = f"def {method_name}({self._method_params(params, is_class_method, is_static_method)}):"
             lines.append(OutputLine(0, header))
             if body_text:
                 lines.extend(
                     self._render_inline_body(
                         action_type,
                         body_text,
-                        current_params=user_params,
+                        current_params=params,
                     )
                 )
                 return TranspileResult(lines=lines)
@@ -1553,8 +2111,8 @@ class EnhancedTranspiler:
             return TranspileResult(
                 lines=lines,
                 opens_block=True,
-                block_type="def",
-                block_params=user_params,
+                block_type=BlockType.DEF,
+                block_params=params,
             )
 
         target_class = class_name or current_class
@@ -1563,13 +2121,13 @@ class EnhancedTranspiler:
             return TranspileResult(lines=[OutputLine(0, header), OutputLine(1, "pass")])
 
         func_name = f"_{target_class}_{method_name}"
-        lines = [OutputLine(0, f"def {func_name}({', '.join(self._prefix_method_params(params, is_class_method, is_static_method))}):")]
+        lines = [OutputLine(0, f"def {func_name}({self._method_params(params, is_class_method, is_static_method)}):")]
         if body_text:
             lines.extend(
                 self._render_inline_body(
                     action_type,
                     body_text,
-                    current_params=user_params,
+                    current_params=params,
                 )
             )
         else:
@@ -1584,11 +2142,14 @@ class EnhancedTranspiler:
 
         return TranspileResult(lines=lines)
 
-    def _prefix_method_params(self, params: List[str], is_class_method: bool, is_static_method: bool) -> List[str]:
+    @staticmethod
+    def _method_params(params: List[str], is_class_method: bool, is_static_method: bool) -> str:
+        """Return the parameter list text of a method, including ``self`` or ``cls``."""
+        joined = ', '.join(params)
         if is_static_method:
-            return params
+            return joined
         prefix = "cls" if is_class_method else "self"
-        return [prefix] + params
+        return f"{prefix}, {joined}" if params else prefix
 
     def _render_property(
         self,
@@ -1627,251 +2188,24 @@ class EnhancedTranspiler:
         ]
         return TranspileResult(lines=lines)
 
-    def _parse_inline_action(self, action_text: str, current_params: Optional[List[str]] = None) -> List[OutputLine]:
+    def _parse_inline_action(self, action_text: str, current_params: Optional[Sequence[str]] = None) -> List[OutputLine]:
         """Parse a single inline statement into output lines."""
         text = action_text.strip()
         if not text:
             return []
 
-        match = self._patterns['print_numbers'].match(text)
-        if match:
-            return self._render_range_print(match.group(1), match.group(2))
-
-        match = self._patterns['yield'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            return [OutputLine(0, f"yield {expr}")]
-
-        match = self._patterns['for_each'].match(text)
-        if match:
-            var = match.group(1)
-            iterable = self._parse_expression(match.group(2))
-            action = match.group(3).strip()
-            if action:
-                nested = self._parse_inline_action(action, current_params=current_params)
-            else:
-                nested = [OutputLine(0, "pass")]
-            lines = [OutputLine(0, f"for {var} in {iterable}:")]
-            lines.extend([OutputLine(1 + item.indent_offset, item.text) for item in nested])
-            return lines
-
-        match = self._patterns['repeat_times'].match(text)
-        if match:
-            count_expr = self._parse_expression(match.group(1))
-            action = match.group(2).strip()
-            if action:
-                nested = self._parse_inline_action(action, current_params=current_params)
-            else:
-                nested = [OutputLine(0, "pass")]
-            lines = [OutputLine(0, f"for _ in range({count_expr}):")]
-            lines.extend([OutputLine(1 + item.indent_offset, item.text) for item in nested])
-            return lines
-
-        match = self._patterns['repeat_until'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            action = match.group(2).strip()
-            if action:
-                nested = self._parse_inline_action(action, current_params=current_params)
-            else:
-                nested = [OutputLine(0, "pass")]
-            lines = [OutputLine(0, f"while not ({condition}):")]
-            lines.extend([OutputLine(1 + item.indent_offset, item.text) for item in nested])
-            return lines
-
-        match = self._patterns['repeat_while'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            action = match.group(2).strip()
-            if action:
-                nested = self._parse_inline_action(action, current_params=current_params)
-            else:
-                nested = [OutputLine(0, "pass")]
-            lines = [OutputLine(0, f"while {condition}:")]
-            lines.extend([OutputLine(1 + item.indent_offset, item.text) for item in nested])
-            return lines
-
-        match = self._patterns['wait_sleep'].match(text)
-        if match:
-            duration = self._parse_duration(match.group(1), match.group(2))
-            return [OutputLine(0, f"time.sleep({duration})")]
-
-        match = self._patterns['while_do'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            action = match.group(2).strip()
-            if action:
-                nested = self._parse_inline_action(action, current_params=current_params)
-            else:
-                nested = [OutputLine(0, "pass")]
-            lines = [OutputLine(0, f"while {condition}:")]
-            lines.extend([OutputLine(1 + item.indent_offset, item.text) for item in nested])
+        word = _LEADING_WORD.match(text).group()
+        lines = self._dispatch_inline(_INLINE_ACTIONS_BEFORE_CALL, word, text, current_params)
+        if lines is not None:
             return lines
 
-        match = self._patterns['if_return'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            value = self._parse_value(match.group(2), current_params=current_params)
-            return [
-                OutputLine(0, f"if {condition}:"),
-                OutputLine(1, f"return {value}"),
-            ]
-
-        match = self._patterns['if_then_inline'].match(text) or self._patterns['if_do_inline'].match(text)
-        if match:
-            condition = self._parse_condition(match.group(1))
-            nested = self._parse_inline_action(match.group(2), current_params=current_params)
-            if not nested:
-                nested = [OutputLine(0, "pass")]
-            lines = [OutputLine(0, f"if {condition}:")]
-            lines.extend([OutputLine(1 + item.indent_offset, item.text) for item in nested])
-            return lines
-
-        match = self._patterns['say_message'].match(text)
-        if match:
-            message = self._parse_say_value(match.group(1))
-            return [OutputLine(0, f"print({message})")]
-
-        match = self._patterns['log_message'].match(text)
-        if match:
-            level = match.group(1).lower()
-            message = self._parse_expression(match.group(2))
-            return [OutputLine(0, f"logging.{level}({message})")]
-
         call_expr = self._maybe_parse_call_without_parens(text)
         if call_expr:
             return [OutputLine(0, call_expr)]
 
-        match = self._patterns['print'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            return [OutputLine(0, f"print({expr})")]
-
-        match = self._patterns['return'].match(text)
-        if match:
-            value = self._parse_value(match.group(1), current_params=current_params)
-            return [OutputLine(0, f"return {value}")]
-
-        match = self._patterns['set_named'].match(text)
-        if match:
-            var = self._normalize_target(match.group(1))
-            value = self._parse_expression(match.group(2))
-            return [OutputLine(0, f"{var} = {value}")]
-
-        match = self._patterns['let'].match(text) or self._patterns['set'].match(text)
-        if match:
-            var = self._normalize_target(match.group(1))
-            value = self._parse_expression(match.group(2))
-            return [OutputLine(0, f"{var} = {value}")]
-
-        match = self._patterns['increase'].match(text)
-        if match:
-            target = self._normalize_target(match.group(1))
-            amount = self._parse_expression(match.group(2))
-            return [OutputLine(0, f"{target} += {amount}")]
-
-        match = self._patterns['decrease'].match(text)
-        if match:
-            target = self._normalize_target(match.group(1))
-            amount = self._parse_expression(match.group(2))
-            return [OutputLine(0, f"{target} -= {amount}")]
-
-        match = self._patterns['create_variable_set'].match(text)
-        if match:
-            var = self._normalize_target(match.group(1))
-            value_text = match.group(2)
-            kind = self._collection_kind_from_text(text)
-            if kind == "list":
-                value = self._parse_collection_initializer(value_text, "list")
-            elif kind == "dictionary":
-                value = self._parse_collection_initializer(value_text, "dictionary")
-            else:
-                value = self._parse_expression(value_text)
-            return [OutputLine(0, f"{var} = {value}")]
-
-        match = self._patterns['create_variable'].match(text)
-        if match:
-            var = self._normalize_target(match.group(1))
-            value_text = match.group(2)
-            kind = self._collection_kind_from_text(text)
-            if kind == "list":
-                value = self._parse_collection_initializer(value_text, "list")
-            elif kind == "dictionary":
-                value = self._parse_collection_initializer(value_text, "dictionary")
-            else:
-                value = self._parse_expression(value_text) if value_text else "None"
-            return [OutputLine(0, f"{var} = {value}")]
-
-        match = self._patterns['append_to_list'].match(text)
-        if match:
-            item = self._parse_expression(match.group(1))
-            target = self._normalize_expression_target(match.group(2))
-            return [OutputLine(0, f"{target}.append({item})")]
-
-        match = self._patterns['prepend_to_list'].match(text)
-        if match:
-            item = self._parse_expression(match.group(1))
-            target = self._normalize_expression_target(match.group(2))
-            return [OutputLine(0, f"{target}.insert(0, {item})")]
-
-        match = self._patterns['remove_from_list'].match(text)
-        if match:
-            item = self._parse_expression(match.group(1))
-            target = self._normalize_expression_target(match.group(2))
-            return [OutputLine(0, f"{target}.remove({item})")]
-
-        match = self._patterns['pop_from_list'].match(text)
-        if match:
-            target = self._normalize_expression_target(match.group(1))
-            return [OutputLine(0, f"{target}.pop()")]
-
-        match = self._patterns['clear_list'].match(text)
-        if match:
-            target = self._normalize_expression_target(match.group(1))
-            return [OutputLine(0, f"{target}.clear()")]
-
-        match = self._patterns['sort_list'].match(text)
-        if match:
-            target = self._normalize_expression_target(match.group(1))
-            return [OutputLine(0, f"{target}.sort()")]
-
-        match = self._patterns['reverse_list'].match(text)
-        if match:
-            target = self._normalize_expression_target(match.group(1))
-            return [OutputLine(0, f"{target}.reverse()")]
-
-        match = self._patterns['await'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            return [OutputLine(0, f"await {expr}")]
-
-        match = self._patterns['raise'].match(text) or self._patterns['throw'].match(text)
-        if match:
-            expr = self._parse_expression(match.group(1))
-            return [OutputLine(0, f"raise {expr}")]
-
-        match = self._patterns['exit'].match(text)
-        if match:
-            code_text = match.group(1)
-            if code_text:
-                code_expr = self._parse_expression(code_text)
-                return [OutputLine(0, f"sys.exit({code_expr})")]
-            return [OutputLine(0, "sys.exit(0)")]
-
-        match = self._patterns['call_function'].match(text)
-        if match:
-            func_name = self._normalize_expression_target(match.group(1))
-            args_text = match.group(2) if match.group(2) else ""
-            args = self._parse_function_arguments(args_text) if args_text else []
-            args_str = ', '.join(args) if args else ''
-            return [OutputLine(0, f"{func_name}({args_str})")]
-
-        match = self._patterns['call_with'].match(text)
-        if match:
-            func_name = self._normalize_expression_target(match.group(1))
-            args = self._parse_function_arguments(match.group(2))
-            args_str = ', '.join(args) if args else ''
-            return [OutputLine(0, f"{func_name}({args_str})")]
+        lines = self._dispatch_inline(_INLINE_ACTIONS_AFTER_CALL, word, text, current_params)
+        if lines is not None:
+            return lines
 
         if self._looks_like_assignment(text):
             left, right = text.split('=', 1)
@@ -1881,47 +2215,256 @@ class EnhancedTranspiler:
 
         return [OutputLine(0, self._parse_expression(text))]
 
+    def _dispatch_inline(
+        self,
+        actions: Tuple[Tuple[str, str], ...],
+        word: str,
+        text: str,
+        current_params: Optional[Sequence[str]],
+    ) -> Optional[List[OutputLine]]:
+        """Render ``text`` with the first inline action in ``actions`` that matches it."""
+        names = _inline_candidates(actions, word)
+        if not names:
+            return None
+        matched = _pattern_set(names).match(text)
+        if not matched:
+            return None
+        name, groups = matched
+        return self._inline_handlers[name](groups, text, current_params)
+
+    def _inline_print_numbers(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        return self._render_range_print(*g)
+
+    def _inline_yield(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        expr = self._parse_expression(g[0])
+        return [OutputLine(0, f"yield {expr}")]
+
+    def _inline_for_each(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        var, iterable, action = g
+        iterable = self._parse_expression(iterable)
+        nested = self._parse_inline_action(action, current_params=current_params)
+        return self._wrap_block(f"for {var} in {iterable}:", nested)
+
+    def _inline_repeat_times(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        count_text, action = g
+        count_expr = self._parse_expression(count_text)
+        nested = self._parse_inline_action(action, current_params=current_params)
+        return self._wrap_block(f"for _ in range({count_expr}):", nested)
+
+    def _inline_repeat_until(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        condition, action = g
+        condition = self._parse_condition(condition)
+        nested = self._parse_inline_action(action, current_params=current_params)
+        return self._wrap_block(f"while not ({condition}):", nested)
+
+    def _inline_while(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        condition, action = g
+        condition = self._parse_condition(condition)
+        nested = self._parse_inline_action(action, current_params=current_params)
+        return self._wrap_block(f"while {condition}:", nested)
+
+    def _inline_wait_sleep(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        duration = self._parse_duration(*g)
+        return [OutputLine(0, f"time.sleep({duration})")]
+
+    def _inline_if_return(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        condition, value = g
+        condition = self._parse_condition(condition)
+        value = self._parse_value(value, current_params=current_params)
+        return [
+            OutputLine(0, f"if {condition}:"),
+            OutputLine(1, f"return {value}"),
+        ]
+
+    def _inline_if(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        condition, action = g
+        condition = self._parse_condition(condition)
+        nested = self._parse_inline_action(action, current_params=current_params)
+        return self._wrap_block(f"if {condition}:", nested)
+
+    def _inline_say_message(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        message = self._parse_say_value(g[0])
+        return [OutputLine(0, f"print({message})")]
+
+    def _inline_log_message(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        level, message = g
+        level = level.lower()
+        message = self._parse_expression(message)
+        return [OutputLine(0, f"logging.{level}({message})")]
+
+    def _inline_print(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        expr = self._parse_expression(g[0])
+        return [OutputLine(0, f"print({expr})")]
+
+    def _inline_return(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        value = self._parse_value(g[0], current_params=current_params)
+        return [OutputLine(0, f"return {value}")]
+
+    def _inline_set(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        var, value = g
+        var = self._normalize_target(var)
+        value = self._parse_expression(value)
+        return [OutputLine(0, f"{var} = {value}")]
+
+    def _inline_increase(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        target, amount = g
+        target = self._normalize_target(target)
+        amount = self._parse_expression(amount)
+        return [OutputLine(0, f"{target} += {amount}")]
+
+    def _inline_decrease(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        target, amount = g
+        target = self._normalize_target(target)
+        amount = self._parse_expression(amount)
+        return [OutputLine(0, f"{target} -= {amount}")]
+
+    def _inline_create_variable_set(
+        self, g: Tuple, text: str, current_params: Optional[Sequence[str]]
+    ) -> List[OutputLine]:
+        var, value_text = g
+        var = self._normalize_target(var)
+        kind = self._collection_kind_from_text(text)
+        if kind == "list":
+            value = self._parse_collection_initializer(value_text, "list")
+        elif kind == "dictionary":
+            value = self._parse_collection_initializer(value_text, "dictionary")
+        else:
+            value = self._parse_expression(value_text)
+        return [OutputLine(0, f"{var} = {value}")]
+
+    def _inline_create_variable(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        var, value_text = g
+        var = self._normalize_target(var)
+        kind = self._collection_kind_from_text(text)
+        if kind == "list":
+            value = self._parse_collection_initializer(value_text, "list")
+        elif kind == "dictionary":
+            value = self._parse_collection_initializer(value_text, "dictionary")
+        else:
+            value = self._parse_expression(value_text) if value_text else "None"
+        return [OutputLine(0, f"{var} = {value}")]
+
+    def _inline_append_to_list(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        item, target = g
+        item = self._parse_expression(item)
+        target = self._normalize_expression_target(target)
+        return [OutputLine(0, f"{target}.append({item})")]
+
+    def _inline_prepend_to_list(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        item, target = g
+        item = self._parse_expression(item)
+        target = self._normalize_expression_target(target)
+        return [OutputLine(0, f"{target}.insert(0, {item})")]
+
+    def _inline_remove_from_list(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        item, target = g
+        item = self._parse_expression(item)
+        target = self._normalize_expression_target(target)
+        return [OutputLine(0, f"{target}.remove({item})")]
+
+    def _inline_pop_from_list(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        target = self._normalize_expression_target(g[0])
+        return [OutputLine(0, f"{target}.pop()")]
+
+    def _inline_clear_list(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        target = self._normalize_expression_target(g[0])
+        return [OutputLine(0, f"{target}.clear()")]
+
+    def _inline_sort_list(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        target = self._normalize_expression_target(g[0])
+        return [OutputLine(0, f"{target}.sort()")]
+
+    def _inline_reverse_list(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        target = self._normalize_expression_target(g[0])
+        return [OutputLine(0, f"{target}.reverse()")]
+
+    def _inline_await(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        expr = self._parse_expression(g[0])
+        return [OutputLine(0, f"await {expr}")]
+
+    def _inline_raise(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        expr = self._parse_expression(g[0])
+        return [OutputLine(0, f"raise {expr}")]
+
+    def _inline_exit(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        code_text = g[0]
+        if code_text:
+            code_expr = self._parse_expression(code_text)
+            return [OutputLine(0, f"sys.exit({code_expr})")]
+        return [OutputLine(0, "sys.exit(0)")]
+
+    def _inline_call(self, g: Tuple, text: str, current_params: Optional[Sequence[str]]) -> List[OutputLine]:
+        return [OutputLine(0, self._render_call(*g))]
+
     def _parse_parameters(self, params_text: str) -> List[str]:
         """Parse function parameters from natural English."""
         normalized = params_text.strip()
+        cache = self._parameter_cache
+        params = cache.get(normalized)
+        if params is None:
+            params = tuple(self._parse_parameter_names(normalized))
+            self._cache_phrase(cache, normalized, params)
+        else:
+            cache.move_to_end(normalized)
+        return list(params)
+
+    def _parse_parameter_names(self, normalized: str) -> List[str]:
         if normalized.lower() in ('nothing', 'none', 'no parameters', 'no arguments'):
             return []
 
-        number_match = re.match(r'^(?:the\s+)?(\w+)\s+numbers?$', normalized, re.IGNORECASE)
+        number_match = _NUMBERED_PARAMS.match(normalized)
         if number_match:
             count_text = number_match.group(1)
             count = self._word_to_number(count_text)
             return [chr(ord('a') + i) for i in range(count)]
 
+        if ',' not in normalized and 'and' not in normalized:
+            # A single parameter: nothing for the separator split to do.
+            name = self._normalize_param_name(normalized)
+            return [sys.intern(name)] if name else []
+
         params = []
-        for part in re.split(r'\s+and\s+|,', normalized):
+        for part in _PARAM_SEPARATOR.split(normalized):
             part = part.strip()
             if not part:
                 continue
             name = self._normalize_param_name(part)
             if name:
-                params.append(name)
+                # Interned so the line cache keys built from parameter lists
+                # compare by identity.
+                params.append(sys.intern(name))
         return params
 
     def _parse_function_arguments(self, args_text: str) -> List[str]:
         """Parse function call arguments from natural English."""
         normalized = args_text.strip()
+        cache = self._argument_cache
+        args = cache.get(normalized)
+        if args is None:
+            args = tuple(self._parse_argument_list(normalized))
+            self._cache_phrase(cache, normalized, args)
+        else:
+            cache.move_to_end(normalized)
+        return list(args)
+
+    def _parse_argument_list(self, normalized: str) -> List[str]:
         if not normalized or normalized.lower() in ('nothing', 'none', 'no arguments'):
             return []
 
         args = self._split_items(normalized)
         parsed_args = []
         for arg in args:
-            if (arg.startswith('"') and arg.endswith('"')) or (arg.startswith("'") and arg.endswith("'")):
+            if arg[:1] in ('"', "'") and arg.endswith(arg[0]):
                 parsed_args.append(arg)
                 continue
-            kw_match = re.match(r'^(.+?)\s+(?:as|equals|=|to)\s+(.+)$', arg, re.IGNORECASE)
+            kw_match = _KEYWORD_ARGUMENT.match(arg)
             if kw_match:
-                key = self._normalize_param_name(kw_match.group(1))
-                value = self._parse_expression(kw_match.group(2))
+                key, value = kw_match.groups()
+                key = self._normalize_param_name(key)
+                value = self._parse_expression(value)
                 parsed_args.append(f"{key}={value}")
                 continue
-            elif re.match(r'^-?\d+(\.\d+)?$', arg):
+            elif _NUMBER_LITERAL.match(arg):
                 parsed_args.append(arg)
             else:
                 parsed_args.append(self._parse_expression(arg))
@@ -1930,6 +2473,16 @@ class EnhancedTranspiler:
 
     def _parse_expression(self, expr: str) -> str:
         """Parse a natural English expression to Python."""
+        cache = self._expression_cache
+        parsed = cache.get(expr)
+        if parsed is not None:
+            cache.move_to_end(expr)
+            return parsed
+        parsed = self._parse_expression_text(expr)
+        self._cache_phrase(cache, expr, parsed)
+        return parsed
+
+    def _parse_expression_text(self, expr: str) -> str:
         expr = expr.strip()
         if not expr:
             return expr
@@ -1941,53 +2494,56 @@ class EnhancedTranspiler:
             return 'False'
         if lower in ('none', 'null'):
             return 'None'
-        if lower in ('one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten'):
-            return str(self._word_to_number(lower))
+        if lower in _NUMBER_WORDS:
+            return str(_NUMBER_WORDS[lower])
         if lower.startswith('not '):
             return f"not {self._parse_expression(expr[4:])}"
+        if _SIMPLE_VALUE.fullmatch(expr):
+            # Bare names and numbers come out unchanged; none of the phrase
+            # patterns below can match a single token without spaces.
+            return expr
+        if expr[:1] in ('"', "'") and expr.endswith(expr[0]) and len(expr.split(None, 1)) == 1:
+            # The same holds for a quoted string with no whitespace in it,
+            # which the quoted-string check further down returns as is.
+            return expr
+
+        if expr.isascii():
+            word = _LEADING_WORD.match(lower).group()
+            leads = _EXPRESSION_LEAD_NAMES.get(word, frozenset())
+            connectors = _EXPRESSION_CONNECTOR_WORDS.intersection(lower.split())
+            keywords = leads.union(*(_EXPRESSION_CONNECTOR_NAMES[w] for w in connectors))
+        else:
+            # Case-insensitive matching folds some non-ASCII letters onto
+            # ASCII keywords, so every keyword pattern stays possible.
+            keywords = _EXPRESSION_KEYWORD_ALL
 
-        match = re.match(r'^(?:call|run|execute)\s+(.+?)(?:\s+with\s+(.+))?$', expr, re.IGNORECASE)
+        match = 'call' in keywords and _EXPRESSION_PATTERNS['call'].match(expr)
         if match:
-            func_name = self._normalize_expression_target(match.group(1))
-            args_text = match.group(2) if match.group(2) else ""
-            args = self._parse_function_arguments(args_text) if args_text else []
-            args_str = ', '.join(args) if args else ''
-            return f"{func_name}({args_str})"
+            return self._render_call(*match.groups())
 
-        match = re.match(r'^(?:value|result)\s+of\s+(.+)$', expr, re.IGNORECASE)
+        match = 'value_of' in keywords and _EXPRESSION_PATTERNS['value_of'].match(expr)
         if match:
             return self._parse_expression(match.group(1))
 
-        match = re.match(r'^(?:ask|prompt|input)\s+(.+)$', expr, re.IGNORECASE)
+        match = 'ask' in keywords and _EXPRESSION_PATTERNS['ask'].match(expr)
         if match:
             prompt = self._parse_value(match.group(1))
             return f"input({prompt})"
 
-        match = re.match(r'^(.+?)\s+(?:as|to)\s+(string|text)\s*$', expr, re.IGNORECASE)
-        if match:
-            return f"str({self._parse_expression(match.group(1))})"
-
-        match = re.match(r'^(.+?)\s+(?:as|to)\s+(integer|int|whole\s+number)\s*$', expr, re.IGNORECASE)
-        if match:
-            return f"int({self._parse_expression(match.group(1))})"
-
-        match = re.match(r'^(.+?)\s+(?:as|to)\s+(float|decimal|number)\s*$', expr, re.IGNORECASE)
+        match = 'as_type' in keywords and _EXPRESSION_PATTERNS['as_type'].match(expr)
         if match:
-            return f"float({self._parse_expression(match.group(1))})"
-
-        match = re.match(r'^(.+?)\s+(?:as|to)\s+(boolean|bool)\s*$', expr, re.IGNORECASE)
-        if match:
-            return f"bool({self._parse_expression(match.group(1))})"
+            convert = _TYPE_COERCE[match.lastindex - 2]
+            return f"{convert}({self._parse_expression(match.group(1))})"
 
         call_expr = self._maybe_parse_call_without_parens(expr)
         if call_expr:
             return call_expr
 
-        match = re.match(r'^(?:length|len|size|count|number)\s+of\s+(.+)$', expr, re.IGNORECASE)
+        match = 'length_of' in keywords and _EXPRESSION_PATTERNS['length_of'].match(expr)
         if match:
             return f"len({self._parse_expression(match.group(1))})"
 
-        match = re.match(r'^(?:sum|total)\s+of\s+(.+)$', expr, re.IGNORECASE)
+        match = 'sum_of' in keywords and _EXPRESSION_PATTERNS['sum_of'].match(expr)
         if match:
             items = self._split_items(match.group(1))
             if len(items) == 1:
@@ -1996,7 +2552,7 @@ class EnhancedTranspiler:
             parsed_items = [self._parse_expression(item) for item in items]
             return f"sum([{', '.join(parsed_items)}])"
 
-        match = re.match(r'^(?:average|mean)\s+of\s+(.+)$', expr, re.IGNORECASE)
+        match = 'average_of' in keywords and _EXPRESSION_PATTERNS['average_of'].match(expr)
         if match:
             items = self._split_items(match.group(1))
             if len(items) == 1:
@@ -2005,7 +2561,7 @@ class EnhancedTranspiler:
             parsed_items = [self._parse_expression(item) for item in items]
             return f"(sum([{', '.join(parsed_items)}]) / {len(parsed_items)})"
 
-        match = re.match(r'^(?:min|minimum)\s+of\s+(.+)$', expr, re.IGNORECASE)
+        match = 'min_of' in keywords and _EXPRESSION_PATTERNS['min_of'].match(expr)
         if match:
             items = self._split_items(match.group(1))
             if len(items) == 1:
@@ -2013,7 +2569,7 @@ class EnhancedTranspiler:
             parsed_items = [self._parse_expression(item) for item in items]
             return f"min([{', '.join(parsed_items)}])"
 
-        match = re.match(r'^(?:max|maximum)\s+of\s+(.+)$', expr, re.IGNORECASE)
+        match = 'max_of' in keywords and _EXPRESSION_PATTERNS['max_of'].match(expr)
         if match:
             items = self._split_items(match.group(1))
             if len(items) == 1:
@@ -2021,115 +2577,137 @@ class EnhancedTranspiler:
             parsed_items = [self._parse_expression(item) for item in items]
             return f"max([{', '.join(parsed_items)}])"
 
-        match = re.match(r'^(?:uppercase|upper\s+case)\s+(?:of\s+)?(.+)$', expr, re.IGNORECASE)
+        match = 'uppercase' in keywords and _EXPRESSION_PATTERNS['uppercase'].match(expr)
         if match:
             return f"{self._parse_expression(match.group(1))}.upper()"
 
-        match = re.match(r'^(?:lowercase|lower\s+case)\s+(?:of\s+)?(.+)$', expr, re.IGNORECASE)
+        match = 'lowercase' in keywords and _EXPRESSION_PATTERNS['lowercase'].match(expr)
         if match:
             return f"{self._parse_expression(match.group(1))}.lower()"
 
-        match = re.match(r'^(?:title\s+case)\s+(?:of\s+)?(.+)$', expr, re.IGNORECASE)
+        match = 'title_case' in keywords and _EXPRESSION_PATTERNS['title_case'].match(expr)
         if match:
             return f"{self._parse_expression(match.group(1))}.title()"
 
-        match = re.match(r'^(?:trim|strip)\s+(?:of\s+)?(.+)$', expr, re.IGNORECASE)
+        match = 'trim' in keywords and _EXPRESSION_PATTERNS['trim'].match(expr)
         if match:
             return f"{self._parse_expression(match.group(1))}.strip()"
 
-        match = re.match(r'^(.+?)\s+does\s+not\s+contain\s+(.+)$', expr, re.IGNORECASE)
+        match = 'not_contains' in keywords and _EXPRESSION_PATTERNS['not_contains'].match(expr)
         if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
+            left, right = match.groups()
+            left = self._parse_expression(left)
+            right = self._parse_expression(right)
             return f"{right} not in {left}"
 
-        match = re.match(r'^(.+?)\s+contains\s+(.+)$', expr, re.IGNORECASE)
+        match = 'contains' in keywords and _EXPRESSION_PATTERNS['contains'].match(expr)
         if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
+            left, right = match.groups()
+            left = self._parse_expression(left)
+            right = self._parse_expression(right)
             return f"{right} in {left}"
 
-        match = re.match(r'^(.+?)\s+is\s+not\s+empty$', expr, re.IGNORECASE)
+        match = 'not_empty' in keywords and _EXPRESSION_PATTERNS['not_empty'].match(expr)
         if match:
             return f"len({self._parse_expression(match.group(1))}) != 0"
 
-        match = re.match(r'^(.+?)\s+is\s+empty$', expr, re.IGNORECASE)
+        match = 'empty' in keywords and _EXPRESSION_PATTERNS['empty'].match(expr)
         if match:
             return f"len({self._parse_expression(match.group(1))}) == 0"
 
-        match = re.match(r'^(.+?)\s+ends\s+with\s+(.+)$', expr, re.IGNORECASE)
+        match = 'ends_with' in keywords and _EXPRESSION_PATTERNS['ends_with'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))}.endswith({self._parse_value(match.group(2))})"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)}.endswith({self._parse_value(right)})"
 
-        match = re.match(r'^(.+?)\s+starts\s+with\s+(.+)$', expr, re.IGNORECASE)
+        match = 'starts_with' in keywords and _EXPRESSION_PATTERNS['starts_with'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))}.startswith({self._parse_value(match.group(2))})"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)}.startswith({self._parse_value(right)})"
 
-        match = re.match(r'^(?:minus|negative)\s+(.+)$', expr, re.IGNORECASE)
+        match = 'negative' in keywords and _EXPRESSION_PATTERNS['negative'].match(expr)
         if match:
             return f"-{self._parse_expression(match.group(1))}"
 
-        match = re.match(r'^subtract\s+(.+?)\s+from\s+(.+)$', expr, re.IGNORECASE)
+        match = 'subtract_from' in keywords and _EXPRESSION_PATTERNS['subtract_from'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(2))} - {self._parse_expression(match.group(1))}"
+            amount, target = match.groups()
+            return f"{self._parse_expression(target)} - {self._parse_expression(amount)}"
 
-        match = re.match(r'^add\s+(.+?)\s+to\s+(.+)$', expr, re.IGNORECASE)
+        match = 'add_to' in keywords and _EXPRESSION_PATTERNS['add_to'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(2))} + {self._parse_expression(match.group(1))}"
+            amount, target = match.groups()
+            return f"{self._parse_expression(target)} + {self._parse_expression(amount)}"
 
-        match = re.match(r'^add\s+(.+?)\s+and\s+(.+)$', expr, re.IGNORECASE)
+        match = 'add_and' in keywords and _EXPRESSION_PATTERNS['add_and'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))} + {self._parse_expression(match.group(2))}"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)} + {self._parse_expression(right)}"
 
-        match = re.match(r'^(.+?)\s+plus\s+(.+)$', expr, re.IGNORECASE)
+        match = 'plus' in keywords and _EXPRESSION_PATTERNS['plus'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))} + {self._parse_expression(match.group(2))}"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)} + {self._parse_expression(right)}"
 
-        match = re.match(r'^(.+?)\s+minus\s+(.+)$', expr, re.IGNORECASE)
+        match = 'minus' in keywords and _EXPRESSION_PATTERNS['minus'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))} - {self._parse_expression(match.group(2))}"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)} - {self._parse_expression(right)}"
 
-        match = re.match(r'^(.+?)\s+(?:times|multiplied\s+by|multiply\s+by)\s+(.+)$', expr, re.IGNORECASE)
+        match = 'times' in keywords and _EXPRESSION_PATTERNS['times'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))} * {self._parse_expression(match.group(2))}"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)} * {self._parse_expression(right)}"
 
-        match = re.match(r'^(.+?)\s+(?:divided\s+by|over)\s+(.+)$', expr, re.IGNORECASE)
+        match = 'divided_by' in keywords and _EXPRESSION_PATTERNS['divided_by'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))} / {self._parse_expression(match.group(2))}"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)} / {self._parse_expression(right)}"
 
-        match = re.match(r'^(.+?)\s+(?:mod|modulo)\s+(.+)$', expr, re.IGNORECASE)
+        match = 'mod' in keywords and _EXPRESSION_PATTERNS['mod'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))} % {self._parse_expression(match.group(2))}"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)} % {self._parse_expression(right)}"
 
-        match = re.match(r'^(.+?)\s+(?:to\s+the\s+power\s+of|power\s+of|powered\s+by)\s+(.+)$', expr, re.IGNORECASE)
+        match = 'power' in keywords and _EXPRESSION_PATTERNS['power'].match(expr)
         if match:
-            return f"{self._parse_expression(match.group(1))} ** {self._parse_expression(match.group(2))}"
+            left, right = match.groups()
+            return f"{self._parse_expression(left)} ** {self._parse_expression(right)}"
 
-        if (expr.startswith('"') and expr.endswith('"')) or (expr.startswith("'") and expr.endswith("'")):
+        if expr[:1] in ('"', "'") and expr.endswith(expr[0]):
             return expr
 
         if '+' in expr:
-            parts = [p.strip() for p in expr.split('+')]
-            parsed_parts = [self._parse_expression(p) for p in parts]
-            return ' + '.join(parsed_parts)
+            parts = self._split_plus(expr)
+            if len(parts) > 1:
+                parsed_parts = [self._parse_expression(p) for p in parts]
+                return ' + '.join(parsed_parts)
 
-        match = re.match(r'^(\w+)\s*\(([^)]*)\)$', expr)
+        match = _EXPRESSION_PATTERNS['call_literal'].match(expr)
         if match:
             return expr
 
-        if re.match(r'^-?\d+(\.\d+)?$', expr):
+        if _NUMBER_LITERAL.match(expr):
             return expr
 
         if not self._is_valid_python_expr(expr):
-            if re.match(r'^[A-Za-z_]\w*$', expr):
+            if _IDENTIFIER.match(expr):
                 return expr
-            if re.search(r'\s', expr) or re.search(r'[^\w]', expr):
-                return self._quote_string(expr)
             return self._quote_string(expr)
         return expr
 
     def _parse_condition(self, condition: str) -> str:
         """Parse a natural English condition to Python."""
+        cache = self._condition_cache
+        parsed = cache.get(condition)
+        if parsed is not None:
+            cache.move_to_end(condition)
+            return parsed
+        parsed = self._parse_condition_text(condition)
+        self._cache_phrase(cache, condition, parsed)
+        return parsed
+
+    def _parse_condition_text(self, condition: str) -> str:
         condition = condition.strip()
         if not condition:
             return condition
@@ -2137,166 +2715,94 @@ class EnhancedTranspiler:
         if condition.lower().startswith('not '):
             return f"not ({self._parse_condition(condition[4:])})"
 
-        match = re.match(r'^(.+?)\s+is\s+not\s+empty$', condition, re.IGNORECASE)
-        if match:
-            return f"len({self._parse_expression(match.group(1))}) != 0"
-
-        match = re.match(r'^(.+?)\s+is\s+empty$', condition, re.IGNORECASE)
-        if match:
-            return f"len({self._parse_expression(match.group(1))}) == 0"
-
-        match = re.match(r'^(.+?)\s+(?:does\s+not|doesn\'t)\s+contain\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{right} not in {left}"
-
-        match = re.match(r'^(.+?)\s+contains\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{right} in {left}"
-
-        match = re.match(r'^(.+?)\s+is\s+not\s+in\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{left} not in {right}"
-
-        match = re.match(r'^(.+?)\s+is\s+in\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{left} in {right}"
-
-        match = re.match(r'^(.+?)\s+has\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{right} in {left}"
-
-        if re.search(r'\s+or\s+', condition, re.IGNORECASE):
-            parts = re.split(r'\s+or\s+', condition, flags=re.IGNORECASE)
+        if condition.isascii():
+            words = frozenset(condition.lower().split())
+        else:
+            # Case-insensitive matching folds some non-ASCII letters onto
+            # ASCII keywords, so the word check below would not be exact.
+            words = None
+
+        parsed = self._match_condition(_CONDITION_CHECKS, condition, words)
+        if parsed is not None:
+            return parsed
+
+        # The connectives are whole words, so the token set rules them out
+        # cheaply; one split both finds and applies the "or" separators.
+        parts = (words is None or 'or' in words) and _OR_SEPARATOR.split(condition)
+        if parts and len(parts) > 1:
             parsed = [self._parse_condition(part) for part in parts]
             return ' or '.join(f"({part})" for part in parsed)
 
-        if re.search(r'\s+and\s+', condition, re.IGNORECASE):
-            protected = re.sub(
-                r'(\bbetween\b[^\n]+?)\s+and\s+',
-                r'\1 __between_and__ ',
-                condition,
-                flags=re.IGNORECASE,
-            )
-            parts = re.split(r'\s+and\s+', protected, flags=re.IGNORECASE)
+        if (words is None or 'and' in words) and _AND_SEPARATOR.search(condition):
+            protected = _BETWEEN_AND.sub(r'\1 __between_and__ ', condition)
+            parts = _AND_SEPARATOR.split(protected)
             if len(parts) > 1:
                 restored = [part.replace('__between_and__', 'and') for part in parts]
                 parsed = [self._parse_condition(part) for part in restored]
                 return ' and '.join(f"({part})" for part in parsed)
 
-        match = re.match(r'^(.+?)\s+is\s+between\s+(.+?)\s+and\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            value = self._parse_expression(match.group(1))
-            low = self._parse_expression(match.group(2))
-            high = self._parse_expression(match.group(3))
-            return f"{low} <= {value} <= {high}"
-
-        match = re.match(
-            r'^(.+?)\s+is\s+(?:greater|bigger|larger)\s+than\s+or\s+equal\s+to\s+(.+)$',
-            condition,
-            re.IGNORECASE,
-        )
-        if match:
-            return f"{self._parse_expression(match.group(1))} >= {self._parse_expression(match.group(2))}"
-
-        match = re.match(r'^(.+?)\s+is\s+at\s+least\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            return f"{self._parse_expression(match.group(1))} >= {self._parse_expression(match.group(2))}"
-
-        match = re.match(r'^(.+?)\s+is\s+no\s+less\s+than\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            return f"{self._parse_expression(match.group(1))} >= {self._parse_expression(match.group(2))}"
-
-        match = re.match(
-            r'^(.+?)\s+is\s+(?:less|smaller)\s+than\s+or\s+equal\s+to\s+(.+)$',
-            condition,
-            re.IGNORECASE,
-        )
-        if match:
-            return f"{self._parse_expression(match.group(1))} <= {self._parse_expression(match.group(2))}"
-
-        match = re.match(r'^(.+?)\s+is\s+at\s+most\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            return f"{self._parse_expression(match.group(1))} <= {self._parse_expression(match.group(2))}"
-
-        match = re.match(r'^(.+?)\s+is\s+no\s+more\s+than\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            return f"{self._parse_expression(match.group(1))} <= {self._parse_expression(match.group(2))}"
-
-        match = re.match(r'^(.+?)\s+is\s+not\s+equal\s+to\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{left} != {right}"
-
-        match = re.match(r'^(.+?)\s+does\s+not\s+equal\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{left} != {right}"
-
-        match = re.match(r'^(.+?)\s+is\s+equal\s+to\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{left} == {right}"
-
-        match = re.match(r'^(.+?)\s+equals\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{left} == {right}"
-
-        match = re.match(r'^(.+?)\s+is\s+the\s+same\s+as\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{left} == {right}"
-
-        match = re.match(r'^(.+?)\s+ends\s+with\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            return f"{self._parse_expression(match.group(1))}.endswith({self._parse_value(match.group(2))})"
-
-        match = re.match(r'^(.+?)\s+starts\s+with\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            return f"{self._parse_expression(match.group(1))}.startswith({self._parse_value(match.group(2))})"
-
-        match = re.match(r'^(.+?)\s+is\s+(greater|bigger|larger)\s+than\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            return f"{self._parse_expression(match.group(1))} > {self._parse_expression(match.group(3))}"
-
-        match = re.match(r'^(.+?)\s+is\s+(less|smaller)\s+than\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            return f"{self._parse_expression(match.group(1))} < {self._parse_expression(match.group(3))}"
-
-        match = re.match(r'^(.+?)\s+is\s+not\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            return f"{left} != {right}"
-
-        match = re.match(r'^(.+?)\s+is\s+(.+)$', condition, re.IGNORECASE)
-        if match:
-            left = self._parse_expression(match.group(1))
-            right = self._parse_expression(match.group(2))
-            if right.lower() in ['true', 'false', 'none', 'null']:
-                return f"{left} == {self._parse_expression(right)}"
-            if right.lower() == 'empty':
-                return f"len({left}) == 0"
-            return f"{left} == {right}"
+        parsed = self._match_condition(_CONDITION_COMPARISONS, condition, words)
+        if parsed is not None:
+            return parsed
 
         return condition
 
-    def _infer_param_aggregate(self, value: str, params: Optional[List[str]]) -> Optional[str]:
+    def _match_condition(
+        self,
+        names: Tuple[str, ...],
+        condition: str,
+        words: Optional[FrozenSet[str]],
+    ) -> Optional[str]:
+        """Render ``condition`` with the first pattern in ``names`` that matches it."""
+        for name in names:
+            if words is not None and not _CONDITION_WORDS[name] <= words:
+                continue
+            match = _CONDITION_PATTERNS[name].match(condition)
+            if match:
+                return self._render_condition(name, match.groups())
+        return None
+
+    def _render_condition(self, name: str, groups: Tuple[Optional[str], ...]) -> str:
+        """Render a condition matched by the _CONDITION_PATTERNS entry ``name``."""
+        template = _CONDITION_FORMATS.get(name)
+        if template is not None:
+            left, right = groups
+            return template.format(left=self._parse_expression(left), right=self._parse_expression(right))
+
+        if name == 'not_empty':
+            return f"len({self._parse_expression(groups[0])}) != 0"
+        if name == 'empty':
+            return f"len({self._parse_expression(groups[0])}) == 0"
+        if name == 'between':
+            value, low, high = groups
+            value = self._parse_expression(value)
+            low = self._parse_expression(low)
+            high = self._parse_expression(high)
+            return f"{low} <= {value} <= {high}"
+        if name == 'ends_with':
+            left, right = groups
+            return f"{self._parse_expression(left)}.endswith({self._parse_value(right)})"
+        if name == 'starts_with':
+            left, right = groups
+            return f"{self._parse_expression(left)}.startswith({self._parse_value(right)})"
+        if name == 'greater':
+            left, _, right = groups
+            return f"{self._parse_expression(left)} > {self._parse_expression(right)}"
+        if name == 'less':
+            left, _, right = groups
+            return f"{self._parse_expression(left)} < {self._parse_expression(right)}"
+
+        # 'is'
+        left, right = groups
+        left = self._parse_expression(left)
+        right = self._parse_expression(right)
+        if right.lower() in ['true', 'false', 'none', 'null']:
+            return f"{left} == {self._parse_expression(right)}"
+        if right.lower() == 'empty':
+            return f"len({left}) == 0"
+        return f"{left} == {right}"
+
+    def _infer_param_aggregate(self, value: str, params: Optional[Sequence[str]]) -> Optional[str]:
         """Infer simple aggregations like 'their sum' using available parameters."""
         if not params:
             return None
@@ -2306,24 +2812,33 @@ class EnhancedTranspiler:
         normalized = value.strip().lower()
         if not normalized:
             return None
-        sum_patterns = (
-            r'^(?:their|the)\s+sum\b',
-            r'^(?:their|the)\s+total\b',
-            r'^sum\s+of\s+them\b',
-            r'^sum\s+of\s+their\b',
-            r'^total\s+of\s+them\b',
-        )
-        for pattern in sum_patterns:
-            if re.match(pattern, normalized):
-                if len(cleaned_params) == 1:
-                    return cleaned_params[0]
-                if len(cleaned_params) == 2:
-                    return f"{cleaned_params[0]} + {cleaned_params[1]}"
-                return " + ".join(cleaned_params)
+        if _SUM_PHRASE.match(normalized):
+            if len(cleaned_params) == 1:
+                return cleaned_params[0]
+            if len(cleaned_params) == 2:
+                return f"{cleaned_params[0]} + {cleaned_params[1]}"
+            return " + ".join(cleaned_params)
         return None
 
-    def _parse_value(self, value: str, current_params: Optional[List[str]] = None) -> str:
+    def _parse_value(self, value: str, current_params: Optional[Sequence[str]] = None) -> str:
         """Parse a value from natural English."""
+        key = (value, None if current_params is None else tuple(current_params))
+        cache = self._value_cache
+        parsed = cache.get(key)
+        if parsed is not None:
+            cache.move_to_end(key)
+            return parsed
+        parsed = self._parse_value_text(value, current_params)
+        self._cache_phrase(cache, key, parsed)
+        return parsed
+
+    @staticmethod
+    def _cache_phrase(cache: "OrderedDict", key, parsed) -> None:
+        cache[key] = parsed
+        if len(cache) > PHRASE_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _parse_value_text(self, value: str, current_params: Optional[Sequence[str]]) -> str:
         value = value.strip()
 
         lower = value.lower()
@@ -2334,10 +2849,10 @@ class EnhancedTranspiler:
         if lower in ('none', 'null'):
             return 'None'
 
-        if re.match(r'^-?\d+(\.\d+)?$', value):
+        if _NUMBER_LITERAL.match(value):
             return value
 
-        if (value.startswith('"') and value.endswith('"')) or (value.startswith("'") and value.endswith("'")):
+        if value[:1] in ('"', "'") and value.endswith(value[0]):
             return value
 
         inferred = self._infer_param_aggregate(value, current_params)
@@ -2354,26 +2869,37 @@ class EnhancedTranspiler:
         return f"\"{escaped}\""
 
     def _is_valid_python_expr(self, expr: str) -> bool:
-        try:
-            ast.parse(expr, mode='eval')
-            return True
-        except Exception:
-            return False
+        return _expr_node_type(expr) is not None
 
     def _word_to_number(self, word: str) -> int:
         """Convert word to number."""
-        numbers = {
-            'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-            'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
-        }
-        return numbers.get(word.lower(), 2)
+        return _NUMBER_WORDS.get(word.lower(), 2)
 
-    def _detect_libraries(self, code: str, features: Optional[Dict[str, bool]] = None) -> Set[str]:
+    def _detect_libraries(self, lines: List[SourceLine], features: Optional[Dict[str, bool]] = None) -> Set[str]:
         """Detect which libraries are being used."""
         detected = set()
-        for lib, patterns in self._library_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, code, re.IGNORECASE):
+        ascii_only = all(line.content.isascii() for line in lines)
+        if ascii_only:
+            # Case-insensitive matches on ASCII text are unchanged by
+            # lowercasing, so a single lowercased copy of the source serves
+            # both the literal prefilter and the searches themselves.
+            code = '\n'.join([line.content.lower() for line in lines])
+        else:
+            code = '\n'.join([line.content for line in lines])
+        for lib, checks in self._library_regexes.items():
+            for literal, regex in checks:
+                if not (ascii_only and literal):
+                    if regex.search(code):
+                        detected.add(lib)
+                        break
+                    continue
+                # Case-insensitive searches scan the whole source slowly, and
+                # every match starts with the pattern's literal, so only try
+                # the pattern where str.find locates that literal.
+                pos = code.find(literal)
+                while pos >= 0 and not regex.match(code, pos):
+                    pos = code.find(literal, pos + 1)
+                if pos >= 0:
                     detected.add(lib)
                     break
         if features and features.get("flask_app"):
@@ -2384,84 +2910,23 @@ class EnhancedTranspiler:
     def _generate_imports(self, libraries: Set[str], features: Optional[Dict[str, bool]] = None) -> List[str]:
         """Generate import statements with proper formatting for enterprise libraries."""
         imports: List[str] = []
-        stdlib = {
-            'json', 'os', 'sys', 'datetime', 'time', 'csv', 're', 'logging', 'pathlib',
-            'collections', 'itertools', 'functools', 'asyncio', 'threading', 'multiprocessing',
-            'sqlite3', 'urllib', 'http', 'email', 'hashlib', 'base64', 'uuid', 'random',
-            'math', 'statistics', 'unittest', 'configparser', 'enum', 'dataclasses', 'typing'
-        }
-
-        special_imports = {
-            'datetime': "from datetime import datetime, timedelta",
-            'typing': "from typing import List, Dict, Optional, Union, Any, Tuple, Callable",
-            'pathlib': "from pathlib import Path",
-            'collections': "from collections import defaultdict, Counter, deque",
-            'itertools': "from itertools import chain, combinations, permutations",
-            'functools': "from functools import wraps, lru_cache",
-            'asyncio': "import asyncio",
-            'unittest': "import unittest",
-            'enum': "from enum import Enum",
-            'dataclasses': "from dataclasses import dataclass, field",
-        }
-
-        web_frameworks = {
-            'flask': "from flask import Flask, request, jsonify, render_template, send_file, send_from_directory",
-            'django': "from django.http import HttpResponse, JsonResponse",
-            'fastapi': "from fastapi import FastAPI, HTTPException",
-            'tornado': "import tornado.web",
-            'aiohttp': "import aiohttp",
-        }
-
-        databases = {
-            'sqlalchemy': "from sqlalchemy import create_engine, Column, Integer, String, ForeignKey\n"
-                          "from sqlalchemy.ext.declarative import declarative_base\n"
-                          "from sqlalchemy.orm import sessionmaker",
-            'psycopg2': "import psycopg2",
-            'pymongo': "from pymongo import MongoClient",
-            'redis': "import redis",
-            'pymysql': "import pymysql",
-        }
-
-        data_science = {
-            'pandas': "import pandas as pd",
-            'numpy': "import numpy as np",
-            'matplotlib': "import matplotlib.pyplot as plt",
-            'seaborn': "import seaborn as sns",
-        }
-
-        http_clients = {
-            'requests': "import requests",
-            'httpx': "import httpx",
-        }
-
-        testing = {
-            'pytest': "import pytest",
-            'mock': "from unittest.mock import Mock, patch",
-        }
-
-        config = {
-            'yaml': "import yaml",
-            'toml': "import toml",
-            'dotenv': "from dotenv import load_dotenv",
-        }
-
-        all_special = {
-            **special_imports,
-            **web_frameworks,
-            **databases,
-            **data_science,
-            **http_clients,
-            **testing,
-            **config,
-        }
-
         for lib in sorted(libraries):
-            if lib in all_special:
-                import_lines = all_special[lib].split('\n')
-                imports.extend(import_lines)
-            elif lib in stdlib:
+            if lib in _LIBRARY_IMPORT_LINES:
+                imports.extend(_LIBRARY_IMPORT_LINES[lib])
+            elif lib in _STDLIB_MODULES:
                 imports.append(f"import {lib}")
             else:
                 imports.append(f"import {lib}")
 
         return imports
+
+
+_default_transpiler: Optional[EnhancedTranspiler] = None
+
+
+def default_transpiler() -> EnhancedTranspiler:
+    """Return the process-wide EnhancedTranspiler, creating it on first use."""
+    global _default_transpiler
+    if _default_transpiler is None:
+        _default_transpiler = EnhancedTranspiler()
+    return _default_transpiler
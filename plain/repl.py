@@ -1,11 +1,15 @@
 """Interactive REPL for Plain language."""
 
 import sys
-from typing import Optional
-from .enhanced_transpiler import EnhancedTranspiler
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from .enhanced_transpiler import SourceLine, default_transpiler
 from .runtime import Runtime
 
 
+TRANSPILE_CACHE_SIZE = 128
+
+
 class REPL:
     """Interactive REPL for testing plain text statements."""
     
@@ -13,13 +17,15 @@ class REPL:
         """Initialize the REPL.
         
         Args:
-            transpiler: Transpiler instance (creates enhanced one if not provided)
+            transpiler: Transpiler instance (shares the default enhanced one if not provided)
             verbose: Whether to show generated Python code
         """
-        self.transpiler = transpiler or EnhancedTranspiler()
+        self.transpiler = transpiler or default_transpiler()
         self.runtime = Runtime()
         self.verbose = verbose
         self.history = []
+        # plain text -> (python_code, mapping, source_lines), most recent last.
+        self._transpile_cache: "OrderedDict[str, Tuple[str, Dict[int, SourceLine], Optional[List[str]]]]" = OrderedDict()
     
     def _print_banner(self):
         """Print REPL welcome banner."""
@@ -67,10 +73,23 @@ class REPL:
         
         return False
     
+    def _transpile(self, plain_text: str) -> Tuple[str, Dict[int, SourceLine], Optional[List[str]]]:
+        """Transpile plain text, reusing the result when the same input is entered again."""
+        cached = self._transpile_cache.get(plain_text)
+        if cached is not None:
+            self._transpile_cache.move_to_end(plain_text)
+            return cached
+        python_code, mapping = self.transpiler.transpile(plain_text, with_mapping=True)
+        result = (python_code, mapping, getattr(self.transpiler, "last_source_lines", None))
+        self._transpile_cache[plain_text] = result
+        if len(self._transpile_cache) > TRANSPILE_CACHE_SIZE:
+            self._transpile_cache.popitem(last=False)
+        return result
+
     def _execute_plain_text(self, plain_text: str):
         """Execute plain text by transpiling and running it."""
         try:
-            python_code, mapping = self.transpiler.transpile(plain_text, with_mapping=True)
+            python_code, mapping, source_lines = self._transpile(plain_text)
             
             if self.verbose:
                 print("\nGenerated Python code:")
@@ -82,7 +101,7 @@ class REPL:
                 python_code,
                 filename="<repl>",
                 line_mapping=mapping,
-                source_lines=getattr(self.transpiler, "last_source_lines", None),
+                source_lines=source_lines,
             )
             
             if stdout:
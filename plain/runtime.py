@@ -4,9 +4,56 @@ import sys
 import io
 import builtins
 import threading
-import traceback
 from contextlib import redirect_stdout, redirect_stderr
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from types import CodeType
+from typing import Dict, List, Optional, Tuple, Union
+
+
+@lru_cache(maxsize=256)
+def _compile_exec(code: str, filename: str) -> CodeType:
+    """Compile ``code`` for exec, reusing the code object for repeated snippets."""
+    return compile(code, filename, "exec")
+
+
+def _build_safe_builtins() -> Dict[str, object]:
+    """Create a restricted set of builtins for safe execution."""
+    allowed = [
+        "abs",
+        "all",
+        "any",
+        "bool",
+        "dict",
+        "enumerate",
+        "float",
+        "int",
+        "len",
+        "list",
+        "max",
+        "min",
+        "print",
+        "range",
+        "round",
+        "str",
+        "sum",
+        "zip",
+        "sorted",
+        "set",
+        "tuple",
+        "Exception",
+        "__build_class__",
+    ]
+    safe: Dict[str, object] = {name: getattr(builtins, name) for name in allowed if hasattr(builtins, name)}
+
+    def _blocked_import(*_args, **_kwargs):
+        raise ImportError("Imports are disabled in safe mode")
+
+    safe["__import__"] = _blocked_import
+    return safe
+
+
+# Built once at import; every Runtime starts from a copy of it.
+_SAFE_BUILTINS = _build_safe_builtins()
 
 
 class Runtime:
@@ -14,44 +61,10 @@ class Runtime:
     
     def __init__(self):
         self._reset_namespace()
-        self._safe_builtins = self._build_safe_builtins()
+        # Copied so code run in safe mode cannot alter another runtime's builtins.
+        self._safe_builtins = dict(_SAFE_BUILTINS)
         self.last_error: Optional[str] = None
 
-    def _build_safe_builtins(self) -> Dict[str, object]:
-        """Create a restricted set of builtins for safe execution."""
-        allowed = [
-            "abs",
-            "all",
-            "any",
-            "bool",
-            "dict",
-            "enumerate",
-            "float",
-            "int",
-            "len",
-            "list",
-            "max",
-            "min",
-            "print",
-            "range",
-            "round",
-            "str",
-            "sum",
-            "zip",
-            "sorted",
-            "set",
-            "tuple",
-            "Exception",
-            "__build_class__",
-        ]
-        safe: Dict[str, object] = {name: getattr(builtins, name) for name in allowed if hasattr(builtins, name)}
-
-        def _blocked_import(*_args, **_kwargs):
-            raise ImportError("Imports are disabled in safe mode")
-
-        safe["__import__"] = _blocked_import
-        return safe
-
     def _get_exec_globals(self, safe_mode: bool) -> Dict[str, object]:
         """Return the globals mapping to use for execution."""
         if not safe_mode:
@@ -67,16 +80,19 @@ class Runtime:
         line_mapping: Optional[Dict[int, object]],
         source_lines: Optional[List[str]],
     ) -> str:
-        frames = traceback.extract_tb(exception.__traceback__) if exception.__traceback__ else []
-        target_frame = None
-        for frame in reversed(frames):
-            if frame.filename == filename:
-                target_frame = frame
-                break
-        if target_frame is None and frames:
-            target_frame = frames[-1]
-
-        py_line = target_frame.lineno if target_frame else None
+        # Only a line number is needed, so walk the traceback links directly
+        # rather than have traceback.extract_tb summarise every frame.
+        target_tb = last_tb = None
+        tb = exception.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == filename:
+                target_tb = tb
+            last_tb = tb
+            tb = tb.tb_next
+        if target_tb is None:
+            target_tb = last_tb
+
+        py_line = target_tb.tb_lineno if target_tb else None
         source_line = None
         if line_mapping and py_line in line_mapping:
             source_line = line_mapping.get(py_line)
@@ -108,7 +124,7 @@ class Runtime:
     
     def execute(
         self,
-        code: str,
+        code: Union[str, CodeType],
         capture_output: bool = True,
         filename: Optional[str] = None,
         line_mapping: Optional[Dict[int, object]] = None,
@@ -116,7 +132,7 @@ class Runtime:
         timeout: Optional[float] = None,
         safe_mode: bool = False,
     ) -> Tuple[Optional[str], Optional[str], Optional[Exception]]:
-        """Execute Python code and capture output."""
+        """Execute Python code (source or a precompiled code object) and capture output."""
         self.last_error = None
         stdout_capture = io.StringIO()
         stderr_capture = io.StringIO()
@@ -124,11 +140,14 @@ class Runtime:
         exec_filename = filename or "<string>"
         exception: Optional[Exception] = None
 
-        try:
-            code_obj = compile(code, exec_filename, "exec")
-        except Exception as exc:
-            code_obj = None
-            exception = exc
+        if isinstance(code, CodeType):
+            code_obj: Optional[CodeType] = code
+        else:
+            try:
+                code_obj = _compile_exec(code, exec_filename)
+            except Exception as exc:
+                code_obj = None
+                exception = exc
 
         def runner():
             nonlocal exception
@@ -183,7 +202,7 @@ class Runtime:
 
     def execute_file(
         self,
-        code: str,
+        code: Union[str, CodeType],
         filename: Optional[str] = None,
         line_mapping: Optional[Dict[int, object]] = None,
         source_lines: Optional[List[str]] = None,
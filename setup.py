@@ -1,43 +1,6 @@
-from setuptools import setup, find_packages
-
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
-
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
-
-setup(
-    name="plain-lang",
-    version="0.1.0",
-    author="Plain Language Team",
-    description="A natural language programming language that transpiles to Python",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    url="https://github.com/OLaachkar/plain-lang",
-    packages=find_packages(),
-    classifiers=[
-        "Development Status :: 3 - Alpha",
-        "Intended Audience :: Developers",
-        "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-        "Programming Language :: Python :: 3.12",
-        "Programming Language :: Python :: 3.13",
-        "Programming Language :: Python :: 3.14",
-    ],
-    python_requires=">=3.8",
-    install_requires=requirements,
-    entry_points={
-        "console_scripts": [
-            "plain=plain.cli:main",
-        ],
-    },
-    include_package_data=True,
-    zip_safe=False,
-)
-
-
+# Project metadata lives in pyproject.toml. This shim only keeps the
+# "python setup.py ..." commands used by the installer scripts working.
+from setuptools import setup
 
+if __name__ == "__main__":
+    setup()